@@ -18,6 +18,81 @@ class Settings(BaseSettings):
     # Job Scraping Configuration
     SCRAPING_INTERVAL_HOURS: int = 1
     JOB_RELEVANCE_THRESHOLD: float = 0.7
+    SCRAPING_MAX_WORKERS: int = 8
+    SCRAPING_PER_SOURCE_CONCURRENCY: int = 2
+    SCRAPING_SEARCH_TERMS: list = [
+        "software developer",
+        "software engineer",
+        "python developer",
+        "java developer",
+        "full stack developer",
+        "data scientist",
+        "devops engineer",
+        "cloud engineer"
+    ]
+    # Terms finding fewer than this many postings no other term found (on
+    # average) back off exponentially, up to the max interval
+    SCRAPING_TERM_MIN_UNIQUE_YIELD: float = 1.0
+    SCRAPING_TERM_MAX_INTERVAL_CYCLES: int = 8
+    SCRAPING_TERM_STATS_ALPHA: float = 0.3
+    SCRAPER_MAX_CONNECTIONS: int = 20
+    SCRAPER_MAX_CONNECTIONS_PER_HOST: int = 4
+    SCRAPER_REQUEST_TIMEOUT: float = 10.0
+    SCRAPER_MAX_RETRIES: int = 3
+    SCRAPER_HTML_PARSER: Optional[str] = None  # selectolax, lxml or html.parser; fastest installed if unset
+    SCRAPER_HTTP_CACHE_PATH: Optional[str] = "./http_cache.db"  # conditional GETs + description cache; unset disables
+    SCRAPER_HTTP_CACHE_MAX_AGE_DAYS: float = 7
+    SCRAPER_DESCRIPTION_CACHE_TTL_HOURS: float = 24
+    SCRAPER_MAX_PAGES: int = 10  # listing pages per (source, term) per run
+    INGEST_BATCH_SIZE: int = 100
+    DEDUP_CHUNK_SIZE: int = 1000
+    RESCORE_BATCH_SIZE: int = 1000
+    
+    # Near-duplicate detection (MinHash/LSH)
+    NEAR_DUPLICATE_NUM_PERM: int = 128
+    NEAR_DUPLICATE_BANDS: int = 32
+    
+    # Outbound request rate limits (requests/second per host)
+    SCRAPER_RATE_LIMIT_PER_SECOND: float = 1.0
+    SCRAPER_RATE_LIMIT_BURST: int = 3
+    SCRAPER_RATE_LIMIT_MIN_FACTOR: float = 0.1
+    SCRAPER_HOST_RATE_LIMITS: dict = {}
+    
+    # LLM analysis cache
+    ANALYSIS_CACHE_ENABLED: bool = True
+    ANALYSIS_CACHE_TTL_DAYS: int = 30
+    ANALYSIS_CACHE_MAX_ENTRIES: int = 50000
+    
+    # Concurrent LLM analysis
+    ANALYSIS_MAX_IN_FLIGHT: int = 8
+    ANALYSIS_TOKENS_PER_MINUTE: int = 90000
+    ANALYSIS_MAX_RETRIES: int = 3
+    ANALYSIS_REQUEST_TIMEOUT: float = 30.0
+    ANALYSIS_PACK_SIZE: int = 4
+    ANALYSIS_PACK_MAX_CHARS: int = 1500
+    
+    # Tiered analysis: only jobs whose local keyword score falls inside
+    # [MIN, MAX] are sent to the LLM; a sample of the rest is audited
+    ANALYSIS_TIERED: bool = True
+    ANALYSIS_UNCERTAIN_MIN_SCORE: float = 0.1
+    ANALYSIS_UNCERTAIN_MAX_SCORE: float = 0.9
+    ANALYSIS_AUDIT_SAMPLE_RATE: float = 0.05
+    ANALYSIS_DISAGREEMENT_THRESHOLD: float = 0.3
+    
+    # Job search: FTS5/tsvector index, BM25 blended with relevance_score
+    SEARCH_FULL_TEXT: bool = True
+    SEARCH_TEXT_WEIGHT: float = 0.5  # share of the ranking from text match vs. relevance_score
+    SEARCH_SNIPPET_TOKENS: int = 16
+    
+    # Streaming exports: rows fetched per round trip, bytes per chunk sent
+    EXPORT_BATCH_SIZE: int = 1000
+    EXPORT_CHUNK_BYTES: int = 65536
+    EXPORT_ARROW_BATCH_ROWS: int = 10000  # Arrow record batch / Parquet row group
+    
+    # Parquet snapshots, one scrape_day=YYYY-MM-DD partition per complete
+    # UTC day, for offline analytics; empty EXPORT_SNAPSHOT_DIR disables them
+    EXPORT_SNAPSHOT_DIR: str = "./snapshots"
+    EXPORT_SNAPSHOT_BACKFILL_DAYS: int = 7
     
     # Geographic Settings
     TARGET_COUNTRIES: list = ["USA", "United States"]
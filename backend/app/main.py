@@ -1,5 +1,6 @@
-from fastapi import FastAPI, Depends, HTTPException, BackgroundTasks
+from fastapi import FastAPI, Depends, HTTPException, BackgroundTasks, Query, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from sqlalchemy.orm import Session
 from typing import List, Optional
@@ -10,12 +11,20 @@ import os
 # Import models and services
 from app.models import Job, JobAlert, get_db, create_tables
 from app.models.schemas import (
-    JobResponse, JobSearchRequest, JobStats, 
+    JobResponse, JobSummary, JobSearchRequest, JobExportRequest, JobStats, 
     JobAlertCreate, JobAlertResponse, JobCreate, JobUpdate
 )
-from app.services.job_service import job_service
+from app.services.job_service import job_service, parse_fields
+from app.services.job_export import COLUMNAR_FORMATS, job_exporter
+from app.services.job_rollups import job_rollups
 from app.services.notification_service import notification_service
 from app.utils.scheduler import job_scheduler
+from app.scrapers.rate_limiter import rate_limiter
+from app.scrapers.http_cache import http_cache
+from app.services.scrape_cursors import scrape_cursors
+from app.services.query_planner import query_planner
+from app.services.analysis_cache import analysis_cache
+from app.services.analysis_stage import analysis_stage
 from app.config import settings
 
 # Create FastAPI app
@@ -32,6 +41,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
 # Create database tables on startup
@@ -57,27 +67,52 @@ async def get_job_stats(db: Session = Depends(get_db)):
     """
     return job_service.get_job_stats(db)
 
-@app.get("/api/jobs", response_model=List[JobResponse])
+@app.get("/api/jobs", response_model=List[JobSummary], response_model_exclude_unset=True)
 async def get_jobs(
+    response: Response,
     skip: int = 0,
-    limit: int = 100,
+    limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
     db: Session = Depends(get_db)
 ):
     """
-    Get all jobs with pagination
+    Get all jobs by relevance, one page at a time.
+
+    Pass the X-Next-Cursor header of a response as cursor to get the next
+    page; the header is absent on the last page. skip is still accepted
+    but costs more the deeper the page. fields is a comma-separated list
+    of JobSummary fields to return; by default everything but the full
+    description, requirements and AI analysis, which GET /api/jobs/{id} has.
     """
-    jobs = db.query(Job).offset(skip).limit(limit).all()
+    try:
+        columns = parse_fields(fields)
+        if skip and not cursor:
+            return job_service.list_jobs_offset(db, skip, limit, columns)
+        jobs, next_cursor = job_service.list_jobs_page(db, limit, cursor, columns)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
     return jobs
 
-@app.post("/api/jobs/search", response_model=List[JobResponse])
+@app.post("/api/jobs/search", response_model=List[JobSummary], response_model_exclude_unset=True)
 async def search_jobs(
     search_params: JobSearchRequest,
+    response: Response,
+    fields: Optional[str] = None,
     db: Session = Depends(get_db)
 ):
     """
-    Search jobs with filters
+    Search jobs with filters; paged like GET /api/jobs via search_params.cursor
+    and projected with fields the same way
     """
-    jobs = job_service.search_jobs(db, search_params)
+    try:
+        jobs, next_cursor = job_service.search_jobs_page(db, search_params, parse_fields(fields))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
     return jobs
 
 @app.get("/api/jobs/{job_id}", response_model=JobResponse)
@@ -142,6 +177,48 @@ async def get_scraping_status():
     """
     return job_scheduler.get_job_status()
 
+@app.get("/api/scrape/rate-limits")
+async def get_rate_limits():
+    """
+    Get current outbound request rates per scraped host
+    """
+    return rate_limiter.get_rates()
+
+@app.get("/api/scrape/http-cache-stats")
+async def get_http_cache_stats():
+    """
+    Get conditional GET and description cache counters for the scrapers
+    """
+    return http_cache.get_stats()
+
+@app.get("/api/scrape/cursors")
+async def get_scrape_cursors():
+    """
+    Get pagination progress per (source, search query)
+    """
+    return scrape_cursors.list_cursors()
+
+@app.get("/api/scrape/term-stats")
+async def get_search_term_stats():
+    """
+    Get per-search-term yield, overlap and scheduling interval
+    """
+    return query_planner.get_stats()
+
+@app.get("/api/analysis/cache-stats")
+async def get_analysis_cache_stats():
+    """
+    Get LLM analysis cache hit/miss counters
+    """
+    return analysis_cache.get_stats()
+
+@app.get("/api/analysis/tier-stats")
+async def get_analysis_tier_stats():
+    """
+    Get how many jobs were settled by the local analyzer vs. sent to the LLM
+    """
+    return analysis_stage.get_tier_stats()
+
 # Job alert endpoints
 @app.post("/api/alerts", response_model=JobAlertResponse)
 async def create_job_alert(
@@ -186,64 +263,24 @@ async def delete_job_alert(
 
 # Export endpoints
 @app.get("/api/export/jobs")
-async def export_jobs(
-    format: str = "json",
-    db: Session = Depends(get_db)
-):
+async def export_jobs(params: JobExportRequest = Depends()):
     """
-    Export jobs in JSON or CSV format
+    Export jobs matching the search filters as JSON, NDJSON, CSV, Arrow IPC
+    stream or Parquet, streamed while it is read. columns picks the fields
+    (as fields= on GET /api/jobs); gzip=true compresses the output.
     """
-    jobs = db.query(Job).all()
+    try:
+        job_exporter.columns(params)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if params.format in COLUMNAR_FORMATS and not job_exporter.columnar_available:
+        raise HTTPException(status_code=501, detail=f"{params.format} export needs pyarrow installed")
     
-    if format.lower() == "csv":
-        import csv
-        import io
-        
-        output = io.StringIO()
-        writer = csv.writer(output)
-        
-        # Write header
-        writer.writerow([
-            'ID', 'Title', 'Company', 'Location', 'Job Type', 'Source',
-            'Posted Date', 'Salary Min', 'Salary Max', 'Is Corp to Corp',
-            'Relevance Score', 'Is Applied', 'Is Favorited', 'Source URL'
-        ])
-        
-        # Write data
-        for job in jobs:
-            writer.writerow([
-                job.id, job.title, job.company, job.location, job.job_type,
-                job.source, job.posted_date, job.salary_min, job.salary_max,
-                job.is_corp_to_corp, job.relevance_score, job.is_applied,
-                job.is_favorited, job.source_url
-            ])
-        
-        output.seek(0)
-        return {"data": output.getvalue(), "format": "csv"}
-    
-    else:
-        # JSON export
-        job_data = []
-        for job in jobs:
-            job_data.append({
-                "id": job.id,
-                "title": job.title,
-                "company": job.company,
-                "location": job.location,
-                "description": job.description,
-                "job_type": job.job_type,
-                "source": job.source,
-                "posted_date": job.posted_date.isoformat(),
-                "salary_min": job.salary_min,
-                "salary_max": job.salary_max,
-                "is_corp_to_corp": job.is_corp_to_corp,
-                "relevance_score": job.relevance_score,
-                "is_applied": job.is_applied,
-                "is_favorited": job.is_favorited,
-                "source_url": job.source_url
-            })
-        
-        return {"data": job_data, "format": "json"}
+    return StreamingResponse(
+        job_exporter.stream(params),
+        media_type=job_exporter.media_type(params),
+        headers={"Content-Disposition": f'attachment; filename="{job_exporter.filename(params)}"'}
+    )
 
 # Analytics endpoints
 @app.get("/api/analytics/trending")
@@ -253,31 +290,7 @@ async def get_trending_jobs(
     """
     Get trending job titles and companies
     """
-    from sqlalchemy import func
-    
-    # Top job titles in last 7 days
-    from datetime import timedelta
-    recent_date = datetime.utcnow() - timedelta(days=7)
-    
-    trending_titles = db.query(
-        Job.title,
-        func.count(Job.id).label('count')
-    ).filter(
-        Job.posted_date >= recent_date
-    ).group_by(Job.title).order_by(func.count(Job.id).desc()).limit(10).all()
-    
-    # Top companies
-    trending_companies = db.query(
-        Job.company,
-        func.count(Job.id).label('count')
-    ).filter(
-        Job.posted_date >= recent_date
-    ).group_by(Job.company).order_by(func.count(Job.id).desc()).limit(10).all()
-    
-    return {
-        "trending_titles": [{"title": title, "count": count} for title, count in trending_titles],
-        "trending_companies": [{"company": company, "count": count} for company, count in trending_companies]
-    }
+    return job_service.get_trending(db)
 
 @app.get("/api/analytics/salary")
 async def get_salary_analytics(
@@ -286,43 +299,21 @@ async def get_salary_analytics(
     """
     Get salary analytics
     """
-    from sqlalchemy import func
-    
-    # Average salary by job type
-    salary_by_type = db.query(
-        Job.job_type,
-        func.avg(Job.salary_min).label('avg_min'),
-        func.avg(Job.salary_max).label('avg_max')
-    ).filter(
-        Job.salary_min.isnot(None)
-    ).group_by(Job.job_type).all()
-    
-    # Salary distribution
-    salary_ranges = db.query(
-        func.count(Job.id).label('count')
-    ).filter(
-        Job.salary_min.isnot(None)
-    ).group_by(
-        func.case(
-            [(Job.salary_min < 60000, 'Under $60k'),
-             (Job.salary_min < 80000, '$60k-$80k'),
-             (Job.salary_min < 100000, '$80k-$100k'),
-             (Job.salary_min < 120000, '$100k-$120k')],
-            else_='$120k+'
-        )
-    ).all()
-    
-    return {
-        "salary_by_type": [
-            {
-                "job_type": job_type,
-                "avg_min": float(avg_min) if avg_min else None,
-                "avg_max": float(avg_max) if avg_max else None
-            }
-            for job_type, avg_min, avg_max in salary_by_type
-        ],
-        "salary_distribution": [{"range": range_name, "count": count} for count in salary_ranges]
-    }
+    return job_service.get_salary_analytics(db)
+
+@app.get("/api/analytics/rollups/check")
+async def check_rollups(db: Session = Depends(get_db)):
+    """
+    Compare the stats rollups with a recount of the jobs table (a full scan)
+    """
+    return job_rollups.check(db)
+
+@app.post("/api/analytics/rollups/rebuild")
+async def rebuild_rollups(db: Session = Depends(get_db)):
+    """
+    Recompute the stats rollups from the jobs table
+    """
+    return {"buckets": job_rollups.rebuild(db)}
 
 # Serve static files (frontend)
 if os.path.exists("frontend/build"):
@@ -1,8 +1,10 @@
-from sqlalchemy import Column, Integer, String, DateTime, Float, Boolean, Text, create_engine
+from sqlalchemy import Column, Integer, BigInteger, String, DateTime, Float, Boolean, Text, ForeignKey, Index, UniqueConstraint, create_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from datetime import datetime
+from typing import Optional
 from app.config import settings
+import hashlib
 
 Base = declarative_base()
 
@@ -20,19 +22,107 @@ class Job(Base):
     job_type = Column(String)  # contract, full-time, etc.
     source = Column(String)  # indeed, linkedin, dice, etc.
     source_url = Column(String)
-    posted_date = Column(DateTime)
-    scraped_date = Column(DateTime, default=datetime.utcnow)
+    posted_date = Column(DateTime, index=True)
+    scraped_date = Column(DateTime, default=datetime.utcnow, index=True)  # daily snapshot partitions
     is_corp_to_corp = Column(Boolean, default=False)
     relevance_score = Column(Float, default=0.0)
+    score_version = Column(Integer, nullable=True)  # JobRelevanceScorer.config_version at last scoring
+    scored_at = Column(DateTime, nullable=True)
+    score_expires_at = Column(DateTime, nullable=True, index=True)  # next recency bucket boundary
     ai_analysis = Column(Text, nullable=True)
     is_applied = Column(Boolean, default=False)
     is_favorited = Column(Boolean, default=False)
     contact_email = Column(String, nullable=True)
     contact_phone = Column(String, nullable=True)
+    fingerprint = Column(String, unique=True, index=True, nullable=True)  # MD5 of title/company/location/source_url
+    
+    # Keyset pagination order for listings and searches
+    __table_args__ = (Index('ix_jobs_rank_order', 'relevance_score', 'posted_date', 'id'),)
+    
+    @staticmethod
+    def compute_fingerprint(title: Optional[str], company: Optional[str], location: Optional[str], source_url: Optional[str]) -> str:
+        """
+        Compute the exact-duplicate fingerprint for a job
+        """
+        key = "\x1f".join(value or "" for value in (title, company, location, source_url))
+        return hashlib.md5(key.encode()).hexdigest()
     
     def __repr__(self):
         return f"<Job(title='{self.title}', company='{self.company}', location='{self.location}')>"
 
+class JobLSHBucket(Base):
+    __tablename__ = "job_lsh_buckets"
+    
+    # One row per (job, LSH band); see app/utils/near_duplicates.py
+    id = Column(Integer, primary_key=True)
+    job_id = Column(Integer, ForeignKey("jobs.id"), index=True, nullable=False)
+    bucket = Column(BigInteger, index=True, nullable=False)
+
+class AnalysisCacheEntry(Base):
+    __tablename__ = "analysis_cache"
+    
+    # sha256 of the normalized posting text plus prompt version and model
+    key = Column(String(64), primary_key=True)
+    analysis = Column(Text, nullable=False)  # JSON
+    model = Column(String)
+    prompt_version = Column(Integer)
+    created_at = Column(DateTime, default=datetime.utcnow, index=True)
+    last_used_at = Column(DateTime, default=datetime.utcnow, index=True)
+    hits = Column(Integer, default=0)
+
+class ScrapeCursor(Base):
+    __tablename__ = "scrape_cursors"
+    __table_args__ = (UniqueConstraint('source', 'query'),)
+    
+    # Pagination state for one (source, search query); see app/services/scrape_cursors.py
+    id = Column(Integer, primary_key=True)
+    source = Column(String, nullable=False)
+    query = Column(String, nullable=False)  # "keywords|location"
+    status = Column(String, default="complete")  # running, interrupted, complete
+    resume_page = Column(Integer, nullable=True)  # first page not yet fetched by an unfinished run
+    pages_fetched = Column(Integer, default=0)  # in the current/last run
+    high_water_fingerprint = Column(String, nullable=True)  # newest posting seen
+    high_water_date = Column(DateTime, nullable=True)
+    started_at = Column(DateTime, nullable=True)
+    updated_at = Column(DateTime, default=datetime.utcnow)
+    completed_at = Column(DateTime, nullable=True)
+
+class SearchTermStats(Base):
+    __tablename__ = "search_term_stats"
+    
+    # Yield/overlap history per search term; see app/services/query_planner.py
+    term = Column(String, primary_key=True)
+    runs = Column(Integer, default=0)
+    interval_cycles = Column(Integer, default=1)  # run every this many scraping cycles
+    next_due_at = Column(DateTime, nullable=True)
+    last_run_at = Column(DateTime, nullable=True)
+    last_results = Column(Integer, default=0)
+    last_unique = Column(Integer, default=0)
+    avg_results = Column(Float, default=0.0)  # exponential moving averages
+    avg_unique = Column(Float, default=0.0)
+    avg_overlap = Column(Float, default=0.0)
+
+class JobRollup(Base):
+    __tablename__ = "job_rollups"
+    __table_args__ = (
+        UniqueConstraint('period', 'dimension', 'value', 'bucket_start'),
+        Index('ix_job_rollups_lookup', 'period', 'dimension', 'bucket_start'),
+    )
+
+    # Job counters per time bucket and dimension value; see app/services/job_rollups.py
+    id = Column(Integer, primary_key=True)
+    period = Column(String, nullable=False)  # hour, day or total
+    dimension = Column(String, nullable=False)  # all, source, company, location, title, job_type, salary_bucket
+    value = Column(String, nullable=False, default="")  # "" for all and for NULL values
+    bucket_start = Column(DateTime, nullable=False)  # by posted_date; a fixed date for total
+    job_count = Column(Integer, default=0)
+    corp_to_corp_count = Column(Integer, default=0)
+    relevance_sum = Column(Float, default=0.0)
+    salary_count = Column(Integer, default=0)  # jobs with salary_min
+    salary_min_sum = Column(Float, default=0.0)
+    salary_max_count = Column(Integer, default=0)  # of those, jobs with salary_max
+    salary_max_sum = Column(Float, default=0.0)
+
 class JobAlert(Base):
     __tablename__ = "job_alerts"
     
@@ -50,6 +140,9 @@ SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 def create_tables():
     Base.metadata.create_all(bind=engine)
+    
+    from app.models.migrations import upgrade_schema
+    upgrade_schema(engine)
 
 def get_db():
     db = SessionLocal()
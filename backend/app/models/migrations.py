@@ -0,0 +1,116 @@
+"""
+Lightweight in-place schema upgrades for databases created before a
+column existed. create_all() only creates missing tables, so new columns
+and their indexes are added here.
+"""
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Engine
+from app.models import Job, JobLSHBucket, JobRollup
+from app.models.search_index import create_search_index
+
+BACKFILL_CHUNK_SIZE = 1000
+
+def upgrade_schema(engine: Engine):
+    """
+    Add missing Job columns, backfill derived values and create indexes
+    """
+    inspector = inspect(engine)
+    existing_columns = {column['name'] for column in inspector.get_columns(Job.__tablename__)}
+    existing_indexes = {index['name'] for index in inspector.get_indexes(Job.__tablename__)}
+    
+    with engine.begin() as conn:
+        for column in Job.__table__.columns:
+            if column.name not in existing_columns:
+                column_type = column.type.compile(dialect=engine.dialect)
+                conn.execute(text(f'ALTER TABLE {Job.__tablename__} ADD COLUMN {column.name} {column_type}'))
+    
+    if 'fingerprint' not in existing_columns:
+        backfill_fingerprints(engine)
+    
+    # Keyset pagination compares (relevance_score, posted_date, id); NULLs would drop out of it.
+    # Rows written since always have both, so this runs once, before the index is built.
+    if 'ix_jobs_rank_order' not in existing_indexes or not {'relevance_score', 'posted_date'} <= existing_columns:
+        with engine.begin() as conn:
+            conn.execute(text('UPDATE jobs SET relevance_score = 0.0 WHERE relevance_score IS NULL'))
+            conn.execute(text('UPDATE jobs SET posted_date = COALESCE(scraped_date, CURRENT_TIMESTAMP) WHERE posted_date IS NULL'))
+    
+    for index in Job.__table__.indexes:
+        index.create(bind=engine, checkfirst=True)
+    
+    backfill_near_duplicate_index(engine)
+    backfill_job_rollups(engine)
+    create_search_index(engine)
+
+def backfill_fingerprints(engine: Engine) -> int:
+    """
+    Fill in Job.fingerprint for existing rows.
+
+    Rows whose fingerprint collides with an earlier row are exact duplicates;
+    they keep a NULL fingerprint so the unique index can be built, and are
+    removed by the regular duplicate cleanup.
+    """
+    seen = set()
+    last_id = 0
+    filled = 0
+    
+    with engine.begin() as conn:
+        seen.update(
+            row.fingerprint for row in conn.execute(
+                text('SELECT fingerprint FROM jobs WHERE fingerprint IS NOT NULL')
+            )
+        )
+        
+        while True:
+            rows = conn.execute(
+                text(
+                    'SELECT id, title, company, location, source_url FROM jobs '
+                    'WHERE fingerprint IS NULL AND id > :last_id ORDER BY id LIMIT :limit'
+                ),
+                {'last_id': last_id, 'limit': BACKFILL_CHUNK_SIZE}
+            ).all()
+            if not rows:
+                break
+            
+            updates = []
+            for row in rows:
+                fingerprint = Job.compute_fingerprint(row.title, row.company, row.location, row.source_url)
+                if fingerprint not in seen:
+                    seen.add(fingerprint)
+                    updates.append({'id': row.id, 'fingerprint': fingerprint})
+            
+            if updates:
+                conn.execute(text('UPDATE jobs SET fingerprint = :fingerprint WHERE id = :id'), updates)
+                filled += len(updates)
+            last_id = rows[-1].id
+    
+    return filled
+
+def backfill_near_duplicate_index(engine: Engine) -> int:
+    """
+    Build the MinHash/LSH index for databases that predate it
+    """
+    from sqlalchemy.orm import sessionmaker
+    from app.utils.near_duplicates import near_duplicate_index
+    
+    db = sessionmaker(bind=engine)()
+    try:
+        if db.query(JobLSHBucket.id).first() or not db.query(Job.id).first():
+            return 0
+        return near_duplicate_index.rebuild(db)
+    finally:
+        db.close()
+
+def backfill_job_rollups(engine: Engine) -> int:
+    """
+    Count existing jobs into the stats rollups for databases that predate them
+    """
+    from sqlalchemy.orm import sessionmaker
+    from app.services.job_rollups import job_rollups
+    
+    db = sessionmaker(bind=engine)()
+    try:
+        if db.query(JobRollup.id).first() or not db.query(Job.id).first():
+            return 0
+        return job_rollups.rebuild(db)
+    finally:
+        db.close()
@@ -1,5 +1,5 @@
-from pydantic import BaseModel, EmailStr
-from typing import Optional, List
+from pydantic import BaseModel, EmailStr, Field
+from typing import Literal, Optional, List
 from datetime import datetime
 
 class JobBase(BaseModel):
@@ -32,11 +32,40 @@ class JobResponse(JobBase):
     ai_analysis: Optional[str] = None
     is_applied: bool
     is_favorited: bool
+    search_score: Optional[float] = None  # keyword searches only
+    snippet: Optional[str] = None  # matched text with <mark> highlights
     
     class Config:
         from_attributes = True
 
-class JobSearchRequest(BaseModel):
+class JobSummary(BaseModel):
+    # Listing row: everything but the long text columns, which only
+    # GET /api/jobs/{id} loads. With fields= only the requested keys are set.
+    id: int
+    title: Optional[str] = None
+    company: Optional[str] = None
+    location: Optional[str] = None
+    description_preview: Optional[str] = None  # first characters of description
+    description: Optional[str] = None
+    requirements: Optional[str] = None
+    ai_analysis: Optional[str] = None
+    salary_min: Optional[float] = None
+    salary_max: Optional[float] = None
+    job_type: Optional[str] = None
+    source: Optional[str] = None
+    source_url: Optional[str] = None
+    posted_date: Optional[datetime] = None
+    scraped_date: Optional[datetime] = None
+    contact_email: Optional[str] = None
+    contact_phone: Optional[str] = None
+    is_corp_to_corp: Optional[bool] = None
+    relevance_score: Optional[float] = None
+    is_applied: Optional[bool] = None
+    is_favorited: Optional[bool] = None
+    search_score: Optional[float] = None
+    snippet: Optional[str] = None
+
+class JobFilters(BaseModel):
     keywords: Optional[str] = None
     location: Optional[str] = None
     min_salary: Optional[float] = None
@@ -47,6 +76,16 @@ class JobSearchRequest(BaseModel):
     min_relevance_score: Optional[float] = None
     posted_within_hours: Optional[int] = 24
 
+class JobSearchRequest(JobFilters):
+    limit: int = Field(100, ge=1, le=500)
+    cursor: Optional[str] = None  # X-Next-Cursor from the previous page
+
+class JobExportRequest(JobFilters):
+    posted_within_hours: Optional[int] = None  # all jobs unless asked
+    format: Literal['json', 'ndjson', 'csv', 'arrow', 'parquet'] = 'json'
+    columns: Optional[str] = None  # comma-separated JobSummary fields
+    gzip: bool = False
+
 class JobAlertCreate(BaseModel):
     keywords: str
     location: str
@@ -0,0 +1,106 @@
+"""
+Full-text index over job title, description and requirements.
+
+On SQLite this is an external-content FTS5 table (jobs_fts) kept in sync
+with jobs by triggers, so every insert path (the ingestion pipeline, the
+ORM, raw SQL) is covered. On PostgreSQL it is a GIN index on the
+expression tsvector. Other databases fall back to tokenized LIKE filters.
+"""
+import re
+import weakref
+from typing import List
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Engine
+
+FTS_TABLE = "jobs_fts"
+
+# bm25 column weights for (title, description, requirements)
+BM25_WEIGHTS = (10.0, 1.0, 2.0)
+
+TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+# Engine -> whether its index exists, so searches do not re-inspect the schema
+_availability: "weakref.WeakKeyDictionary[Engine, bool]" = weakref.WeakKeyDictionary()
+
+SQLITE_DDL = [
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        title, description, requirements,
+        content='jobs', content_rowid='id', tokenize='porter unicode61'
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS jobs_fts_insert AFTER INSERT ON jobs BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, title, description, requirements)
+        VALUES (new.id, new.title, new.description, new.requirements);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS jobs_fts_delete AFTER DELETE ON jobs BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, description, requirements)
+        VALUES ('delete', old.id, old.title, old.description, old.requirements);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS jobs_fts_update AFTER UPDATE OF title, description, requirements ON jobs BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, description, requirements)
+        VALUES ('delete', old.id, old.title, old.description, old.requirements);
+        INSERT INTO {FTS_TABLE}(rowid, title, description, requirements)
+        VALUES (new.id, new.title, new.description, new.requirements);
+    END
+    """
+]
+
+POSTGRES_DOCUMENT = "coalesce(title, '') || ' ' || coalesce(description, '') || ' ' || coalesce(requirements, '')"
+
+POSTGRES_DDL = [
+    f"CREATE INDEX IF NOT EXISTS ix_jobs_fulltext ON jobs USING GIN (to_tsvector('english', {POSTGRES_DOCUMENT}))"
+]
+
+def tokenize(keywords: str) -> List[str]:
+    return TOKEN_PATTERN.findall((keywords or "").lower())
+
+def build_match_query(keywords: str) -> str:
+    """
+    FTS5 MATCH expression requiring every term; each term is quoted so
+    user input cannot inject FTS syntax
+    """
+    return " ".join(f'"{token}"' for token in tokenize(keywords))
+
+def create_search_index(engine: Engine) -> bool:
+    """
+    Create the index (and, on SQLite, its sync triggers), filling it from
+    existing rows when first created. Returns False if the database has
+    no full-text support.
+    """
+    dialect = engine.dialect.name
+    if dialect == 'postgresql':
+        with engine.begin() as conn:
+            for statement in POSTGRES_DDL:
+                conn.execute(text(statement))
+        _availability[engine] = True
+        return True
+
+    if dialect != 'sqlite':
+        _availability[engine] = False
+        return False
+
+    existed = inspect(engine).has_table(FTS_TABLE)
+    try:
+        with engine.begin() as conn:
+            for statement in SQLITE_DDL:
+                conn.execute(text(statement))
+            if not existed:
+                conn.execute(text(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"))
+    except Exception as e:
+        print(f"Full-text search unavailable, using LIKE filters: {str(e)}")
+        _availability[engine] = False
+        return False
+    _availability[engine] = True
+    return True
+
+def has_search_index(engine: Engine) -> bool:
+    if engine not in _availability:
+        dialect = engine.dialect.name
+        _availability[engine] = dialect == 'postgresql' or (dialect == 'sqlite' and inspect(engine).has_table(FTS_TABLE))
+    return _availability[engine]
@@ -0,0 +1,170 @@
+"""
+Backend-neutral HTML parsing for the scrapers.
+
+Pages are parsed once with the fastest available backend (selectolax's
+lexbor parser, then lxml, then BeautifulSoup's html.parser) and fields are
+pulled out with Selectors compiled up front. Text is whitespace-normalized
+straight from the parsed tree, never re-parsed.
+"""
+from typing import Dict, List, Optional, Tuple, Union
+from bs4 import BeautifulSoup
+from app.config import settings
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:  # pragma: no cover - depends on installed extras
+    LexborHTMLParser = None
+
+try:
+    from lxml import etree, html as lxml_html
+except ImportError:  # pragma: no cover - depends on installed extras
+    etree = lxml_html = None
+
+BACKENDS = ('selectolax', 'lxml', 'html.parser')
+
+def available_backends() -> List[str]:
+    available = {'selectolax': LexborHTMLParser is not None, 'lxml': lxml_html is not None, 'html.parser': True}
+    return [backend for backend in BACKENDS if available[backend]]
+
+DEFAULT_BACKEND = available_backends()[0]
+
+def normalize_whitespace(text: Optional[str]) -> str:
+    return ' '.join(text.split()) if text else ""
+
+class Selector:
+    def __init__(self, css: str):
+        """
+        A descendant selector made of "tag.class" steps, e.g.
+        "h2.jobTitle a". Each backend's compiled form is built once.
+        """
+        self.css = css
+        self.steps: List[Tuple[Optional[str], Optional[str]]] = []
+        for part in css.split():
+            tag, _, cls = part.partition('.')
+            self.steps.append((tag or None, cls or None))
+
+        self.xpath = None
+        if etree is not None:
+            path = ""
+            for tag, cls in self.steps:
+                path += f"/descendant::{tag or '*'}"
+                if cls:
+                    path += f"[contains(concat(' ', normalize-space(@class), ' '), ' {cls} ')]"
+            self.xpath = etree.XPath(path.lstrip('/'))
+
+    def __repr__(self):
+        return f"Selector({self.css!r})"
+
+class HTMLNode:
+    """
+    One element of a parsed page
+    """
+    def select(self, selector: Selector) -> List['HTMLNode']:
+        raise NotImplementedError
+
+    def select_one(self, selector: Selector) -> Optional['HTMLNode']:
+        matches = self.select(selector)
+        return matches[0] if matches else None
+
+    def raw_text(self) -> str:
+        raise NotImplementedError
+
+    def text(self) -> str:
+        return normalize_whitespace(self.raw_text())
+
+    def attr(self, name: str) -> Optional[str]:
+        raise NotImplementedError
+
+class _LexborNode(HTMLNode):
+    def __init__(self, node):
+        self.node = node
+
+    def select(self, selector: Selector) -> List[HTMLNode]:
+        # lexbor's css() can match the node itself; bs4 and lxml only search descendants
+        own_id = self.node.mem_id
+        return [_LexborNode(node) for node in self.node.css(selector.css) if node.mem_id != own_id]
+
+    def raw_text(self) -> str:
+        return self.node.text(deep=True)
+
+    def attr(self, name: str) -> Optional[str]:
+        return self.node.attributes.get(name)
+
+class _LxmlNode(HTMLNode):
+    def __init__(self, element):
+        self.element = element
+
+    def select(self, selector: Selector) -> List[HTMLNode]:
+        return [_LxmlNode(element) for element in selector.xpath(self.element)]
+
+    def raw_text(self) -> str:
+        return self.element.text_content()
+
+    def attr(self, name: str) -> Optional[str]:
+        return self.element.get(name)
+
+class _SoupNode(HTMLNode):
+    def __init__(self, tag):
+        self.tag = tag
+
+    def select(self, selector: Selector) -> List[HTMLNode]:
+        tags = [self.tag]
+        for tag_name, cls in selector.steps:
+            found = []
+            for parent in tags:
+                found.extend(parent.find_all(tag_name or True, class_=cls) if cls else parent.find_all(tag_name or True))
+            tags = found
+        return [_SoupNode(tag) for tag in tags]
+
+    def raw_text(self) -> str:
+        return self.tag.get_text()
+
+    def attr(self, name: str) -> Optional[str]:
+        return self.tag.get(name)
+
+def parse_html(content: Union[bytes, str], backend: str = None) -> HTMLNode:
+    """
+    Parse a page or fragment and return its root node
+    """
+    backend = backend or settings.SCRAPER_HTML_PARSER or DEFAULT_BACKEND
+    if backend not in available_backends():
+        raise ValueError(f"HTML parser backend not available: {backend}")
+
+    if isinstance(content, bytes):
+        content = content.decode('utf-8', errors='replace')
+    if backend == 'selectolax':
+        return _LexborNode(LexborHTMLParser(content).root)
+    if backend == 'lxml':
+        return _LxmlNode(lxml_html.document_fromstring(content) if content.strip() else lxml_html.Element('html'))
+    return _SoupNode(BeautifulSoup(content, 'html.parser'))
+
+class FieldSpec:
+    def __init__(self, item: str, text_fields: Dict[str, str], attr_fields: Dict[str, Tuple[str, str]] = None):
+        """
+        Which elements hold one item (e.g. a job card) and where its fields
+        are: text_fields maps a field to a selector whose text is taken,
+        attr_fields maps a field to (selector, attribute name).
+        """
+        self.item = Selector(item)
+        self.text_fields = {field: Selector(css) for field, css in text_fields.items()}
+        self.attr_fields = {field: (Selector(css), attribute) for field, (css, attribute) in (attr_fields or {}).items()}
+
+def extract_fields(node: HTMLNode, spec: FieldSpec) -> Dict[str, Optional[str]]:
+    """
+    Fields of one item; missing elements give None
+    """
+    fields = {}
+    for field, selector in spec.text_fields.items():
+        element = node.select_one(selector)
+        fields[field] = element.text() if element is not None else None
+    for field, (selector, attribute) in spec.attr_fields.items():
+        element = node.select_one(selector)
+        fields[field] = element.attr(attribute) if element is not None else None
+    return fields
+
+def extract_items(content: Union[bytes, str, HTMLNode], spec: FieldSpec, backend: str = None) -> List[Dict[str, Optional[str]]]:
+    """
+    Parse a page once and extract the fields of every item on it
+    """
+    root = content if isinstance(content, HTMLNode) else parse_html(content, backend)
+    return [extract_fields(item, spec) for item in root.select(spec.item)]
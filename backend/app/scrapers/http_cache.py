@@ -0,0 +1,179 @@
+"""
+On-disk cache for scraped pages.
+
+Responses that carry an ETag or Last-Modified header are kept with their
+validators so the next fetch of the same URL can be a conditional GET; a
+304 is answered from the stored body. Parsed job descriptions are kept per
+detail URL for SCRAPER_DESCRIPTION_CACHE_TTL_HOURS so fresh ones are not
+fetched at all.
+"""
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional
+from app.config import settings
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    url TEXT PRIMARY KEY,
+    etag TEXT,
+    last_modified TEXT,
+    body BLOB NOT NULL,
+    stored_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS descriptions (
+    url TEXT PRIMARY KEY,
+    description TEXT NOT NULL,
+    stored_at REAL NOT NULL
+);
+"""
+
+class HTTPCache:
+    def __init__(self, path: Optional[str] = None, description_ttl_hours: float = None, max_age_days: float = None):
+        """
+        path is the SQLite file holding the cache; None disables caching
+        """
+        self.path = path
+        self.description_ttl = (
+            settings.SCRAPER_DESCRIPTION_CACHE_TTL_HOURS if description_ttl_hours is None else description_ttl_hours
+        ) * 3600
+        self.max_age = (settings.SCRAPER_HTTP_CACHE_MAX_AGE_DAYS if max_age_days is None else max_age_days) * 86400
+        self.stats = {
+            'conditional_requests': 0,
+            'not_modified': 0,
+            'bytes_saved': 0,
+            'description_hits': 0,
+            'description_misses': 0,
+            'detail_fetches_skipped_known': 0
+        }
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.path)
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.executescript(SCHEMA)
+        return self._conn
+
+    def _record(self, counter: str, amount: int = 1):
+        with self._lock:
+            self.stats[counter] += amount
+
+    def lookup(self, url: str) -> Optional[Dict]:
+        """
+        Stored response for url, if any, as {etag, last_modified, body}
+        """
+        if not self.enabled:
+            return None
+        with self._lock:
+            row = self._connection().execute(
+                'SELECT etag, last_modified, body FROM responses WHERE url = ?', (url,)
+            ).fetchone()
+        if row is None:
+            return None
+        return {'etag': row[0], 'last_modified': row[1], 'body': row[2]}
+
+    def conditional_headers(self, entry: Optional[Dict]) -> Dict[str, str]:
+        """
+        If-None-Match / If-Modified-Since headers for a stored response
+        """
+        headers = {}
+        if entry:
+            if entry['etag']:
+                headers['If-None-Match'] = entry['etag']
+            if entry['last_modified']:
+                headers['If-Modified-Since'] = entry['last_modified']
+        if headers:
+            self._record('conditional_requests')
+        return headers
+
+    def not_modified(self, entry: Dict) -> bytes:
+        """
+        Count a 304 and return the stored body it stands for
+        """
+        self._record('not_modified')
+        self._record('bytes_saved', len(entry['body']))
+        return entry['body']
+
+    def store(self, url: str, headers, body: bytes):
+        """
+        Keep a response that can be revalidated later; others are skipped
+        """
+        if not self.enabled:
+            return
+        etag = headers.get('ETag')
+        last_modified = headers.get('Last-Modified')
+        if not etag and not last_modified:
+            return
+        with self._lock:
+            conn = self._connection()
+            conn.execute(
+                'INSERT OR REPLACE INTO responses (url, etag, last_modified, body, stored_at) VALUES (?, ?, ?, ?, ?)',
+                (url, etag, last_modified, body, time.time())
+            )
+            conn.commit()
+
+    def get_description(self, url: str) -> Optional[str]:
+        """
+        Parsed description for a detail URL if stored within the TTL
+        """
+        if not self.enabled or not url:
+            return None
+        with self._lock:
+            row = self._connection().execute(
+                'SELECT description FROM descriptions WHERE url = ? AND stored_at >= ?',
+                (url, time.time() - self.description_ttl)
+            ).fetchone()
+        self._record('description_hits' if row else 'description_misses')
+        return row[0] if row else None
+
+    def set_description(self, url: str, description: str):
+        if not self.enabled or not url or not description:
+            return
+        with self._lock:
+            conn = self._connection()
+            conn.execute(
+                'INSERT OR REPLACE INTO descriptions (url, description, stored_at) VALUES (?, ?, ?)',
+                (url, description, time.time())
+            )
+            conn.commit()
+
+    def record_known_skipped(self, count: int):
+        self._record('detail_fetches_skipped_known', count)
+
+    def prune(self) -> int:
+        """
+        Drop stored responses older than the max age and expired
+        descriptions. Returns the number of rows removed.
+        """
+        if not self.enabled:
+            return 0
+        now = time.time()
+        with self._lock:
+            conn = self._connection()
+            removed = conn.execute('DELETE FROM responses WHERE stored_at < ?', (now - self.max_age,)).rowcount
+            removed += conn.execute(
+                'DELETE FROM descriptions WHERE stored_at < ?', (now - self.description_ttl,)
+            ).rowcount
+            conn.commit()
+        return removed
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            stats = dict(self.stats)
+        stats['enabled'] = self.enabled
+        if self.enabled:
+            with self._lock:
+                conn = self._connection()
+                stats['stored_responses'] = conn.execute('SELECT COUNT(*) FROM responses').fetchone()[0]
+                stats['stored_descriptions'] = conn.execute('SELECT COUNT(*) FROM descriptions').fetchone()[0]
+        lookups = stats['description_hits'] + stats['description_misses']
+        stats['description_hit_rate'] = round(stats['description_hits'] / lookups, 4) if lookups else 0.0
+        return stats
+
+# Global cache instance
+http_cache = HTTPCache(settings.SCRAPER_HTTP_CACHE_PATH)
@@ -0,0 +1,226 @@
+import asyncio
+import threading
+from collections import deque
+from concurrent.futures import Future
+from contextlib import asynccontextmanager
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+import httpx
+from app.config import settings
+from app.scrapers.http_cache import HTTPCache, http_cache
+from app.scrapers.rate_limiter import rate_limiter, parse_retry_after
+
+RETRY_STATUS_CODES = (429, 503)
+
+def run_sync(coro):
+    """
+    Run a coroutine to completion from synchronous code.
+
+    Uses asyncio.run when no loop is running in this thread, otherwise runs
+    the coroutine on a fresh loop in a helper thread so callers inside an
+    event loop do not deadlock.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+
+    result = {}
+
+    def runner():
+        try:
+            result['value'] = asyncio.run(coro)
+        except BaseException as e:
+            result['error'] = e
+
+    thread = threading.Thread(target=runner)
+    thread.start()
+    thread.join()
+
+    if 'error' in result:
+        raise result['error']
+    return result['value']
+
+class AsyncFetcher:
+    def __init__(
+        self,
+        headers: Dict[str, str] = None,
+        max_connections: int = None,
+        max_connections_per_host: int = None,
+        timeout: float = None,
+        max_retries: int = None,
+        cache: Optional[HTTPCache] = None
+    ):
+        self.headers = headers or {}
+        self.max_connections = max_connections or settings.SCRAPER_MAX_CONNECTIONS
+        self.max_connections_per_host = max_connections_per_host or settings.SCRAPER_MAX_CONNECTIONS_PER_HOST
+        self.timeout = timeout or settings.SCRAPER_REQUEST_TIMEOUT
+        self.max_retries = settings.SCRAPER_MAX_RETRIES if max_retries is None else max_retries
+        self.cache = cache or http_cache
+        self.client: Optional[httpx.AsyncClient] = None
+
+    async def __aenter__(self):
+        self.client = httpx.AsyncClient(
+            headers=self.headers,
+            timeout=self.timeout,
+            follow_redirects=True,
+            limits=httpx.Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_connections
+            )
+        )
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.client.aclose()
+        self.client = None
+
+    async def get(self, url: str) -> bytes:
+        """
+        GET a URL over the pooled client.
+
+        Every attempt takes a token from the host's rate limiter and one of
+        its connection slots, both shared by every fetcher in the process. 429/503 responses slow the host down and are
+        retried after Retry-After (or an exponential backoff). A URL seen
+        before with an ETag/Last-Modified is revalidated with a conditional
+        GET and a 304 returns the cached body.
+        """
+        host = urlsplit(url).netloc
+        cached = self.cache.lookup(url)
+        conditional_headers = self.cache.conditional_headers(cached)
+        
+        for attempt in range(self.max_retries + 1):
+            await rate_limiter.acquire(host)
+            async with host_slots.slot(host, self.max_connections_per_host):
+                response = await self.client.get(url, headers=conditional_headers)
+            
+            if response.status_code in RETRY_STATUS_CODES and attempt < self.max_retries:
+                retry_after = parse_retry_after(response.headers.get('Retry-After'))
+                rate_limiter.penalize(host, retry_after if retry_after is not None else 2 ** attempt)
+                continue
+            
+            break
+        
+        if response.status_code == 304 and cached is not None:
+            rate_limiter.record_success(host)
+            return self.cache.not_modified(cached)
+        
+        response.raise_for_status()
+        rate_limiter.record_success(host)
+        self.cache.store(url, response.headers, response.content)
+        return response.content
+    
+    async def get_many(self, urls: List[str]) -> List[Optional[bytes]]:
+        """
+        GET several URLs concurrently. Failed or empty URLs yield None.
+        """
+        async def fetch(url: str) -> Optional[bytes]:
+            if not url:
+                return None
+            try:
+                return await self.get(url)
+            except Exception as e:
+                print(f"Error fetching {url}: {e}")
+                return None
+
+        return await asyncio.gather(*(fetch(url) for url in urls))
+
+class SharedFetches:
+    def __init__(self):
+        """
+        Results of fetches keyed by URL, shared by every scraping task in one
+        cycle. Tasks run on separate threads and event loops, so results are
+        handed over through thread-safe futures: the first task to ask for a
+        URL does the work and the others wait for its result.
+        """
+        self._results: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+
+    async def run(self, url: str, produce: Callable[[], Awaitable[Any]]) -> Any:
+        with self._lock:
+            future = self._results.get(url)
+            owner = future is None
+            if owner:
+                future = self._results[url] = Future()
+            else:
+                self.hits += 1
+
+        if not owner:
+            return await asyncio.wrap_future(future)
+
+        try:
+            result = await produce()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        future.set_result(result)
+        return result
+
+class HostConnectionSlots:
+    def __init__(self):
+        """
+        Open-request slots per host, shared by every fetcher in the process
+        so SCRAPER_MAX_CONNECTIONS_PER_HOST holds however many scraping
+        tasks hit a host at once. Fetchers run on separate threads and event
+        loops, so a freed slot is handed straight to the next waiter and
+        its future resolved on that waiter's own loop.
+        """
+        self._lock = threading.Lock()
+        self._in_use: Dict[str, int] = {}
+        self._waiters: Dict[str, Deque[Tuple[asyncio.AbstractEventLoop, asyncio.Future]]] = {}
+
+    @asynccontextmanager
+    async def slot(self, host: str, limit: int):
+        await self.acquire(host, limit)
+        try:
+            yield
+        finally:
+            self.release(host)
+
+    async def acquire(self, host: str, limit: int):
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            waiters = self._waiters.setdefault(host, deque())
+            if self._in_use.get(host, 0) < limit and not waiters:
+                self._in_use[host] = self._in_use.get(host, 0) + 1
+                return
+            waiter = loop.create_future()
+            waiters.append((loop, waiter))
+
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            with self._lock:
+                granted = False
+                if (loop, waiter) in waiters:
+                    waiters.remove((loop, waiter))
+                else:
+                    # Popped by release(): if _hand_over already ran, the slot is
+                    # ours to give back; otherwise it sees the cancelled waiter
+                    granted = waiter.done() and not waiter.cancelled()
+            if granted:
+                self.release(host)
+            raise
+
+    def release(self, host: str):
+        with self._lock:
+            waiters = self._waiters.get(host)
+            if not waiters:
+                self._in_use[host] -= 1
+                return
+            loop, waiter = waiters.popleft()
+        try:
+            loop.call_soon_threadsafe(self._hand_over, host, waiter)
+        except RuntimeError:
+            # The waiter's loop has closed
+            self.release(host)
+
+    def _hand_over(self, host: str, waiter: asyncio.Future):
+        if waiter.cancelled():
+            self.release(host)
+        else:
+            waiter.set_result(None)
+
+# Global host connection slots, shared like rate_limiter
+host_slots = HostConnectionSlots()
@@ -1,33 +1,183 @@
-import requests
-import time
+import asyncio
 import json
-from bs4 import BeautifulSoup
+import threading
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional
+from typing import TYPE_CHECKING, Callable, List, Dict, Optional
 from urllib.parse import urlencode, quote
 from app.config import settings
+from app.models import Job
+from app.scrapers.http_cache import http_cache
+from app.scrapers.http_client import AsyncFetcher, SharedFetches, run_sync
+from app.scrapers.html_parser import FieldSpec, Selector, extract_items, normalize_whitespace, parse_html
+from app.utils.keyword_matcher import get_matcher
+
+if TYPE_CHECKING:
+    from app.services.scrape_cursors import ScrapeCursorStore
+
+# Selectors are compiled once at import
+INDEED_CARD = FieldSpec(
+    item='div.job_seen_beacon',
+    text_fields={
+        'title': 'h2.jobTitle',
+        'company': 'span.companyName',
+        'location': 'div.companyLocation',
+        'posted': 'span.date'
+    },
+    attr_fields={'href': ('h2.jobTitle a', 'href')}
+)
+INDEED_DESCRIPTION = Selector('div.jobsearch-jobDescriptionText')
+INDEED_PAGE_SIZE = 50
+
+DICE_CARD = FieldSpec(
+    item='div.card-body',
+    text_fields={
+        'title': 'h5.card-title-link',
+        'company': 'div.card-company',
+        'location': 'div.card-location',
+        'description': 'div.card-description'
+    },
+    attr_fields={'href': ('h5.card-title-link a', 'href')}
+)
+DICE_PAGE_SIZE = 20
 
 class BaseScraper:
+    # Whether listing pages come newest first, so reaching a stored posting
+    # means the rest of the results are stored too
+    sorted_by_date = False
+    
     def __init__(self, name: str):
         self.name = name
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         }
-        self.session = requests.Session()
-        self.session.headers.update(self.headers)
+        self.cache = http_cache
+        # Set by JobService: returns which of the given fingerprints are already stored
+        self.known_fingerprints: Optional[Callable[[List[str]], set]] = None
+        # Set by JobService: persisted per-(source, query) pagination cursors
+        self.cursors: Optional['ScrapeCursorStore'] = None
+        # Set by ScrapingEngine for one cycle: detail fetches shared across search terms
+        self.shared_fetches: Optional[SharedFetches] = None
+        # Per-cycle counters read by ScrapingEngine: stored postings paginate()
+        # dropped, and scrapes that failed or stopped on a page error
+        self.known_skipped = 0
+        self.failures = 0
+        self._counters_lock = threading.Lock()
     
     def scrape_jobs(self, keywords: str = "", location: str = "USA") -> List[Dict]:
+        """
+        Synchronous wrapper around scrape_jobs_async
+        """
+        return run_sync(self.scrape_jobs_async(keywords, location))
+    
+    async def scrape_jobs_async(self, keywords: str = "", location: str = "USA") -> List[Dict]:
         """
         Base method to be implemented by each scraper
         """
-        raise NotImplementedError("Each scraper must implement scrape_jobs method")
+        raise NotImplementedError("Each scraper must implement scrape_jobs_async method")
+    
+    def fetcher(self) -> AsyncFetcher:
+        """
+        Create a pooled HTTP fetcher for one scraping run
+        """
+        return AsyncFetcher(headers=self.headers, cache=self.cache)
+    
+    async def paginate(
+        self,
+        fetcher: AsyncFetcher,
+        keywords: str,
+        location: str,
+        page_url: Callable[[int], str],
+        parse_page: Callable[[bytes], List[Dict]],
+        page_size: int
+    ) -> List[Dict]:
+        """
+        Fetch listing pages and return the postings not yet stored.
+
+        Stops at an empty, short or repeated page, or after SCRAPER_MAX_PAGES.
+        Sources sorted newest first also stop at the first page holding an
+        already-stored posting; if the last run for this query was
+        interrupted, reaching stored postings jumps to its resume page
+        instead (shifted by the postings that have appeared since) so the
+        pages it never got to are still covered.
+        """
+        query = self.cursors.make_query(keywords, location) if self.cursors else None
+        cursor = self.cursors.start(self.name, query) if self.cursors else None
+        resume_page = cursor['resume_page'] if cursor and cursor['status'] != 'complete' else None
+        
+        jobs = []
+        seen = set()
+        page = pages_fetched = 0
+        interrupted_page = None
+        
+        while page < settings.SCRAPER_MAX_PAGES:
+            try:
+                page_jobs = parse_page(await fetcher.get(page_url(page)))
+            except Exception as e:
+                print(f"Error fetching {self.name} page {page}: {e}")
+                self.record_failure()
+                interrupted_page = page
+                break
+            pages_fetched += 1
+            
+            for job in page_jobs:
+                job['fingerprint'] = Job.compute_fingerprint(job['title'], job['company'], job['location'], job['source_url'])
+            fresh = [job for job in page_jobs if job['fingerprint'] not in seen]
+            seen.update(job['fingerprint'] for job in page_jobs)
+            known = self._stored_fingerprints([job['fingerprint'] for job in fresh])
+            jobs.extend(job for job in fresh if job['fingerprint'] not in known)
+            
+            if self.cursors:
+                self.cursors.advance(self.name, query, page + 1, pages_fetched)
+            
+            # An empty, short or repeated page is the end of the results
+            if not fresh or len(page_jobs) < page_size:
+                break
+            
+            next_page = page + 1
+            if known and self.sorted_by_date:
+                # Everything further down is older than what is stored
+                if resume_page is None:
+                    break
+                next_page = max(next_page, resume_page + len(jobs) // page_size)
+                resume_page = None
+            page = next_page
+        
+        if self.cursors:
+            # Only a newest-first listing has a meaningful newest posting
+            newest = jobs[0] if jobs and self.sorted_by_date else None
+            self.cursors.finish(self.name, query, newest, interrupted_page)
+        
+        return jobs
+    
+    def _stored_fingerprints(self, fingerprints: List[str]) -> set:
+        """
+        Which of these fingerprints are already in the database
+        """
+        if self.known_fingerprints is None or not fingerprints:
+            return set()
+        try:
+            known = self.known_fingerprints(fingerprints)
+        except Exception as e:
+            print(f"Error looking up known jobs: {e}")
+            return set()
+        with self._counters_lock:
+            self.known_skipped += len(known)
+        self.cache.record_known_skipped(len(known))
+        return known
+    
+    def record_failure(self):
+        """
+        Count a scrape that failed; scrapers catch their own errors, so the
+        engine learns of them only through this
+        """
+        with self._counters_lock:
+            self.failures += 1
     
     def is_corp_to_corp(self, job_description: str) -> bool:
         """
         Check if job description indicates corp-to-corp opportunity
         """
-        description_lower = job_description.lower()
-        return any(keyword.lower() in description_lower for keyword in settings.CORP_TO_CORP_KEYWORDS)
+        return get_matcher({'corp_to_corp': settings.CORP_TO_CORP_KEYWORDS}).matches_any(job_description)
     
     def is_recent_job(self, posted_date: datetime, hours: int = 24) -> bool:
         """
@@ -44,12 +194,11 @@ class BaseScraper:
         """
         if not text:
             return ""
-        # Remove HTML tags
-        soup = BeautifulSoup(text, 'html.parser')
-        cleaned = soup.get_text()
-        # Remove extra whitespace
-        cleaned = ' '.join(cleaned.split())
-        return cleaned
+        # Plain text (e.g. from get_text()) needs no parse
+        if '<' not in text and '&' not in text:
+            return normalize_whitespace(text)
+        # Remove HTML tags and extra whitespace
+        return parse_html(text).text()
     
     def parse_posted_date(self, date_str: str) -> Optional[datetime]:
         """
@@ -87,89 +236,68 @@ class BaseScraper:
             return None
 
 class IndeedScraper(BaseScraper):
+    sorted_by_date = True
+    
     def __init__(self):
         super().__init__("indeed")
         self.base_url = "https://www.indeed.com"
     
-    def scrape_jobs(self, keywords: str = "software developer", location: str = "USA") -> List[Dict]:
+    async def scrape_jobs_async(self, keywords: str = "software developer", location: str = "USA") -> List[Dict]:
         """
         Scrape jobs from Indeed
         """
         jobs = []
         
-        # Build search URL
+        # Build search URLs
         params = {
             'q': f"{keywords} corp to corp",
             'l': location,
             'sort': 'date',
             'fromage': '1',  # Last 24 hours
-            'limit': 50
+            'limit': INDEED_PAGE_SIZE
         }
         
-        url = f"{self.base_url}/jobs?{urlencode(params)}"
+        def page_url(page: int) -> str:
+            return f"{self.base_url}/jobs?{urlencode({**params, 'start': page * INDEED_PAGE_SIZE})}"
         
         try:
-            response = self.session.get(url, timeout=10)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Find job cards (Indeed's structure may change)
-            job_cards = soup.find_all('div', class_='job_seen_beacon')
-            
-            for card in job_cards[:20]:  # Limit to first 20 jobs
-                try:
-                    job_data = self._extract_job_data(card)
-                    if job_data:
-                        jobs.append(job_data)
-                except Exception as e:
-                    print(f"Error extracting job data: {e}")
-                    continue
+            async with self.fetcher() as fetcher:
+                # Each page is parsed once and every card's fields pulled out (Indeed's structure may change)
+                jobs = await self.paginate(fetcher, keywords, location, page_url, self._parse_listing, INDEED_PAGE_SIZE)
                 
-                # Add delay to avoid rate limiting
-                time.sleep(1)
+                # Fetch the detail pages still needed in parallel
+                needed = self._jobs_needing_description(jobs)
+                descriptions = await asyncio.gather(*(
+                    self._shared_description(fetcher, job['source_url']) for job in needed
+                ))
+                for job, description in zip(needed, descriptions):
+                    job['description'] = description
             
         except Exception as e:
             print(f"Error scraping Indeed: {e}")
+            self.record_failure()
         
         return jobs
     
-    def _extract_job_data(self, card) -> Optional[Dict]:
+    def _extract_job_data(self, card: Dict[str, Optional[str]]) -> Optional[Dict]:
         """
-        Extract job data from Indeed job card
+        Build job data from the fields of an Indeed job card
         """
         try:
-            # Extract basic info
-            title_elem = card.find('h2', class_='jobTitle')
-            if not title_elem:
+            if card['title'] is None:
                 return None
             
-            title = self.clean_text(title_elem.get_text())
-            
-            # Company
-            company_elem = card.find('span', class_='companyName')
-            company = self.clean_text(company_elem.get_text()) if company_elem else "Unknown"
-            
-            # Location
-            location_elem = card.find('div', class_='companyLocation')
-            location = self.clean_text(location_elem.get_text()) if location_elem else "Unknown"
-            
-            # Job link
-            link_elem = title_elem.find('a')
-            job_url = f"{self.base_url}{link_elem['href']}" if link_elem else ""
-            
-            # Posted date
-            date_elem = card.find('span', class_='date')
-            posted_date = self.parse_posted_date(date_elem.get_text()) if date_elem else datetime.utcnow()
-            
-            # Get job description by following the link
-            description = self._get_job_description(job_url)
+            title = card['title']
+            company = card['company'] if card['company'] is not None else "Unknown"
+            location = card['location'] if card['location'] is not None else "Unknown"
+            job_url = f"{self.base_url}{card['href']}" if card['href'] else ""
+            posted_date = self.parse_posted_date(card['posted']) if card['posted'] is not None else datetime.utcnow()
             
             return {
                 'title': title,
                 'company': company,
                 'location': location,
-                'description': description,
+                'description': "",  # Filled in from the detail page
                 'requirements': "",
                 'source': self.name,
                 'source_url': job_url,
@@ -181,22 +309,68 @@ class IndeedScraper(BaseScraper):
             print(f"Error extracting job data from card: {e}")
             return None
     
-    def _get_job_description(self, job_url: str) -> str:
+    def _parse_listing(self, content: bytes) -> List[Dict]:
+        """
+        Job data for every card on one listing page
+        """
+        jobs = []
+        for card in extract_items(content, INDEED_CARD):
+            try:
+                job_data = self._extract_job_data(card)
+                if job_data:
+                    jobs.append(job_data)
+            except Exception as e:
+                print(f"Error extracting job data: {e}")
+                continue
+        return jobs
+    
+    def _jobs_needing_description(self, jobs: List[Dict]) -> List[Dict]:
+        """
+        Jobs whose detail page must be fetched; descriptions parsed within
+        the cache TTL are reused without a request
+        """
+        needed = []
+        for job in jobs:
+            cached = self.cache.get_description(job['source_url'])
+            if cached is not None:
+                job['description'] = cached
+            else:
+                needed.append(job)
+        return needed
+    
+    async def _shared_description(self, fetcher: AsyncFetcher, url: str) -> str:
+        """
+        Description for a detail URL, fetched once per cycle even when
+        several search terms return the same posting
+        """
+        if self.shared_fetches is None:
+            return await self._fetch_description(fetcher, url)
+        return await self.shared_fetches.run(url, lambda: self._fetch_description(fetcher, url))
+    
+    async def _fetch_description(self, fetcher: AsyncFetcher, url: str) -> str:
+        if not url:
+            return ""
+        try:
+            content = await fetcher.get(url)
+        except Exception as e:
+            print(f"Error fetching {url}: {e}")
+            return ""
+        description = self._parse_job_description(content)
+        self.cache.set_description(url, description)
+        return description
+    
+    def _parse_job_description(self, content: Optional[bytes]) -> str:
         """
-        Get full job description from job detail page
+        Get full job description from a job detail page
         """
         try:
-            if not job_url:
+            if not content:
                 return ""
             
-            response = self.session.get(job_url, timeout=10)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
-            desc_elem = soup.find('div', class_='jobsearch-jobDescriptionText')
+            desc_elem = parse_html(content).select_one(INDEED_DESCRIPTION)
             
-            if desc_elem:
-                return self.clean_text(desc_elem.get_text())
+            if desc_elem is not None:
+                return desc_elem.text()
             
         except Exception as e:
             print(f"Error getting job description: {e}")
@@ -208,13 +382,13 @@ class DiceScraper(BaseScraper):
         super().__init__("dice")
         self.base_url = "https://www.dice.com"
     
-    def scrape_jobs(self, keywords: str = "software developer", location: str = "USA") -> List[Dict]:
+    async def scrape_jobs_async(self, keywords: str = "software developer", location: str = "USA") -> List[Dict]:
         """
         Scrape jobs from Dice
         """
         jobs = []
         
-        # Build search URL
+        # Build search URLs
         params = {
             'q': f"{keywords} contract",
             'location': location,
@@ -222,64 +396,52 @@ class DiceScraper(BaseScraper):
             'radiusUnit': 'mi',
             'filters.postedDate': 'ONE',  # Last 24 hours
             'filters.employmentType': 'CONTRACTS',
-            'page': '1',
-            'pageSize': '20'
+            'pageSize': str(DICE_PAGE_SIZE)
         }
         
-        url = f"{self.base_url}/jobs?{urlencode(params)}"
+        def page_url(page: int) -> str:
+            return f"{self.base_url}/jobs?{urlencode({**params, 'page': str(page + 1)})}"
         
         try:
-            response = self.session.get(url, timeout=10)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Find job cards
-            job_cards = soup.find_all('div', class_='card-body')
-            
-            for card in job_cards:
-                try:
-                    job_data = self._extract_dice_job_data(card)
-                    if job_data:
-                        jobs.append(job_data)
-                except Exception as e:
-                    print(f"Error extracting Dice job data: {e}")
-                    continue
-                
-                time.sleep(1)
+            async with self.fetcher() as fetcher:
+                # Each page is parsed once and every card's fields pulled out. Dice
+                # ranks by relevance, so every page up to the last is walked.
+                jobs = await self.paginate(fetcher, keywords, location, page_url, self._parse_listing, DICE_PAGE_SIZE)
             
         except Exception as e:
             print(f"Error scraping Dice: {e}")
+            self.record_failure()
         
         return jobs
     
-    def _extract_dice_job_data(self, card) -> Optional[Dict]:
+    def _parse_listing(self, content: bytes) -> List[Dict]:
         """
-        Extract job data from Dice job card
+        Job data for every card on one listing page
+        """
+        jobs = []
+        for card in extract_items(content, DICE_CARD):
+            try:
+                job_data = self._extract_dice_job_data(card)
+                if job_data:
+                    jobs.append(job_data)
+            except Exception as e:
+                print(f"Error extracting Dice job data: {e}")
+                continue
+        return jobs
+    
+    def _extract_dice_job_data(self, card: Dict[str, Optional[str]]) -> Optional[Dict]:
+        """
+        Build job data from the fields of a Dice job card
         """
         try:
-            # Extract basic info
-            title_elem = card.find('h5', class_='card-title-link')
-            if not title_elem:
+            if card['title'] is None:
                 return None
             
-            title = self.clean_text(title_elem.get_text())
-            
-            # Company
-            company_elem = card.find('div', class_='card-company')
-            company = self.clean_text(company_elem.get_text()) if company_elem else "Unknown"
-            
-            # Location
-            location_elem = card.find('div', class_='card-location')
-            location = self.clean_text(location_elem.get_text()) if location_elem else "Unknown"
-            
-            # Job link
-            link_elem = title_elem.find('a')
-            job_url = f"{self.base_url}{link_elem['href']}" if link_elem else ""
-            
-            # Description
-            desc_elem = card.find('div', class_='card-description')
-            description = self.clean_text(desc_elem.get_text()) if desc_elem else ""
+            title = card['title']
+            company = card['company'] if card['company'] is not None else "Unknown"
+            location = card['location'] if card['location'] is not None else "Unknown"
+            job_url = f"{self.base_url}{card['href']}" if card['href'] else ""
+            description = card['description'] or ""
             
             return {
                 'title': title,
@@ -302,7 +464,7 @@ class LinkedInScraper(BaseScraper):
     def __init__(self):
         super().__init__("linkedin")
     
-    def scrape_jobs(self, keywords: str = "software developer", location: str = "USA") -> List[Dict]:
+    async def scrape_jobs_async(self, keywords: str = "software developer", location: str = "USA") -> List[Dict]:
         """
         Mock LinkedIn scraper - in real implementation, would use LinkedIn API
         """
@@ -314,7 +476,7 @@ class CyberSeekScraper(BaseScraper):
     def __init__(self):
         super().__init__("cyberseek")
     
-    def scrape_jobs(self, keywords: str = "software developer", location: str = "USA") -> List[Dict]:
+    async def scrape_jobs_async(self, keywords: str = "software developer", location: str = "USA") -> List[Dict]:
         """
         Mock CyberSeek scraper
         """
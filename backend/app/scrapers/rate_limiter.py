@@ -0,0 +1,120 @@
+import asyncio
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from typing import Dict, Optional
+from app.config import settings
+
+class TokenBucket:
+    def __init__(self, rate: float, capacity: float):
+        self.configured_rate = rate
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def reserve(self, now: float, tokens: float = 1.0) -> float:
+        """
+        Take tokens and return how long the caller must wait before using them.
+
+        Tokens may go negative: each caller reserves its slot in the queue, so
+        concurrent callers are spaced out at the bucket rate instead of all
+        waking at once.
+        """
+        self._refill(now)
+        self.tokens -= tokens
+        wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+        return max(wait, self.blocked_until - now)
+
+class HostRateLimiter:
+    def __init__(self):
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def _bucket(self, host: str) -> TokenBucket:
+        if host not in self._buckets:
+            hostname = host.split(':')[0]
+            rate = settings.SCRAPER_HOST_RATE_LIMITS.get(
+                host, settings.SCRAPER_HOST_RATE_LIMITS.get(hostname, settings.SCRAPER_RATE_LIMIT_PER_SECOND)
+            )
+            self._buckets[host] = TokenBucket(rate, settings.SCRAPER_RATE_LIMIT_BURST)
+        return self._buckets[host]
+
+    def reserve(self, host: str) -> float:
+        """
+        Reserve a request slot for host and return the wait in seconds
+        """
+        with self._lock:
+            return self._bucket(host).reserve(time.monotonic())
+
+    async def acquire(self, host: str):
+        """
+        Wait until a request to host is allowed
+        """
+        wait = self.reserve(host)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def penalize(self, host: str, retry_after: Optional[float] = None):
+        """
+        Back off after a 429/503: honour Retry-After and halve the host's rate
+        """
+        with self._lock:
+            bucket = self._bucket(host)
+            now = time.monotonic()
+            bucket._refill(now)
+            bucket.rate = max(bucket.configured_rate * settings.SCRAPER_RATE_LIMIT_MIN_FACTOR, bucket.rate / 2)
+            bucket.tokens = min(bucket.tokens, 0.0)
+            if retry_after:
+                bucket.blocked_until = max(bucket.blocked_until, now + retry_after)
+
+    def record_success(self, host: str):
+        """
+        Recover the host's rate additively after a successful request
+        """
+        with self._lock:
+            bucket = self._bucket(host)
+            if bucket.rate < bucket.configured_rate:
+                bucket.rate = min(bucket.configured_rate, bucket.rate + bucket.configured_rate / 10)
+
+    def get_rates(self) -> Dict[str, Dict]:
+        """
+        Current per-host rates for monitoring
+        """
+        with self._lock:
+            now = time.monotonic()
+            rates = {}
+            for host, bucket in self._buckets.items():
+                bucket._refill(now)
+                rates[host] = {
+                    'rate_per_second': round(bucket.rate, 3),
+                    'configured_rate_per_second': bucket.configured_rate,
+                    'available_tokens': round(bucket.tokens, 3),
+                    'blocked_for_seconds': round(max(0.0, bucket.blocked_until - now), 3)
+                }
+            return rates
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a Retry-After header given either in seconds or as an HTTP date
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+        return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+# Create singleton instance
+rate_limiter = HostRateLimiter()
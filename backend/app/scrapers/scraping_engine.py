@@ -0,0 +1,103 @@
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Dict, List, Tuple
+from app.scrapers.http_client import SharedFetches
+from app.scrapers.job_scrapers import BaseScraper
+from app.config import settings
+
+class ScrapingEngine:
+    def __init__(self, scrapers: Dict[str, BaseScraper], max_workers: int = None, per_source_concurrency: int = None):
+        self.scrapers = scrapers
+        self.max_workers = max_workers or settings.SCRAPING_MAX_WORKERS
+        self.per_source_concurrency = per_source_concurrency or settings.SCRAPING_PER_SOURCE_CONCURRENCY
+        self.last_run_stats: Dict = {}
+
+    def run(self, search_terms: List[str], location: str = "USA") -> Tuple[List[Dict], Dict[str, Dict]]:
+        """
+        Run every (source, keyword, location) pair on a bounded worker pool.
+
+        Each source gets its own queue of search terms and never has more than
+        per_source_concurrency tasks in flight, so a slow source cannot starve
+        the others of workers. Detail fetches are shared between terms for
+        the length of the run. Returns the scraped jobs in (term, source)
+        submission order, each tagged with its search_term, plus per-source
+        stats. Stored postings the scrapers skipped are counted in
+        last_run_stats['known_skipped'].
+        """
+        queues = {
+            name: deque((index, term) for index, term in enumerate(search_terms))
+            for name in self.scrapers
+        }
+        source_stats = {
+            name: {'jobs': 0, 'tasks': 0, 'errors': 0, 'seconds': 0.0}
+            for name in self.scrapers
+        }
+        source_started = {}
+        results: Dict[Tuple[int, int], List[Dict]] = {}
+        source_order = {name: position for position, name in enumerate(self.scrapers)}
+        shared_fetches = SharedFetches()
+        for scraper in self.scrapers.values():
+            scraper.shared_fetches = shared_fetches
+            scraper.known_skipped = 0
+            scraper.failures = 0
+
+        try:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                in_flight = {}
+
+                def submit_next(name: str):
+                    index, term = queues[name].popleft()
+                    source_started.setdefault(name, time.perf_counter())
+                    future = executor.submit(self._scrape_one, name, term, location)
+                    in_flight[future] = (name, index)
+
+                for name in self.scrapers:
+                    for _ in range(min(self.per_source_concurrency, len(queues[name]))):
+                        submit_next(name)
+
+                while in_flight:
+                    done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        name, index = in_flight.pop(future)
+                        jobs, error = future.result()
+                        stats = source_stats[name]
+                        stats['tasks'] += 1
+                        if error:
+                            stats['errors'] += 1
+                        stats['jobs'] += len(jobs)
+                        stats['seconds'] = round(time.perf_counter() - source_started[name], 3)
+                        results[(index, source_order[name])] = jobs
+
+                        if queues[name]:
+                            submit_next(name)
+        finally:
+            for scraper in self.scrapers.values():
+                scraper.shared_fetches = None
+        # Failures the scrapers caught themselves count as errors too
+        for name, scraper in self.scrapers.items():
+            source_stats[name]['errors'] += scraper.failures
+        self.last_run_stats = {
+            'shared_detail_fetches': shared_fetches.hits,
+            'known_skipped': sum(scraper.known_skipped for scraper in self.scrapers.values())
+        }
+
+        all_jobs = []
+        for key in sorted(results):
+            all_jobs.extend(results[key])
+
+        return all_jobs, source_stats
+
+    def _scrape_one(self, name: str, keywords: str, location: str) -> Tuple[List[Dict], bool]:
+        """
+        Scrape a single (source, keyword, location) pair without raising
+        """
+        try:
+            jobs = self.scrapers[name].scrape_jobs(keywords, location)
+            for job in jobs:
+                job['search_term'] = keywords
+            print(f"Scraped {len(jobs)} jobs from {name} for '{keywords}'")
+            return jobs, False
+        except Exception as e:
+            print(f"Error scraping from {name}: {e}")
+            return [], True
@@ -1,9 +1,71 @@
 import openai
-import re
 import json
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 from app.config import settings
 from datetime import datetime, timedelta
+from app.utils.keyword_matcher import get_matcher
+from app.utils.salary_parser import parse_salary
+from app.services.analysis_cache import analysis_cache
+
+# Bump PROMPT_VERSION whenever the prompt changes so cached analyses are not reused
+PROMPT_VERSION = 1
+ANALYSIS_MODEL = "gpt-3.5-turbo"
+
+TECH_KEYWORDS = [
+    "python", "java", "javascript", "react", "nodejs", "sql", "aws", "azure",
+    "docker", "kubernetes", "machine learning", "data science", "api", "rest",
+    "microservices", "cloud", "devops", "ci/cd", "agile", "scrum"
+]
+SENIOR_KEYWORDS = ["senior", "lead", "principal", "architect"]
+JUNIOR_KEYWORDS = ["junior", "entry", "graduate"]
+REMOTE_KEYWORDS = ["remote", "work from home", "wfh", "telecommute", "distributed"]
+URGENCY_KEYWORDS = ["urgent", "asap", "immediate", "quickly", "fast"]
+
+SYSTEM_PROMPT = "You are an expert job analyst specializing in corp-to-corp contract opportunities."
+MAX_TOKENS_PER_ANALYSIS = 500
+ANALYSIS_FIELDS = """
+            1. relevance_score (0-1): How relevant is this job for corp-to-corp work?
+            2. is_corp_to_corp (boolean): Does this explicitly mention corp-to-corp/contract work?
+            3. key_skills: List of main technical skills required
+            4. experience_level: junior/mid/senior/expert
+            5. remote_friendly: boolean indicating if remote work is mentioned
+            6. urgency_level: low/medium/high based on posting language
+            7. salary_indication: estimated salary range if mentioned
+            8. summary: Brief 2-sentence summary of the role
+"""
+
+def build_prompt(job_title: str, job_description: str, requirements: str = "") -> str:
+    return f"""
+            Analyze this job posting for a corp-to-corp opportunity:
+            
+            Title: {job_title}
+            Description: {job_description}
+            Requirements: {requirements}
+            
+            Please provide a JSON response with the following analysis:{ANALYSIS_FIELDS}            
+            Return only valid JSON format.
+            """
+
+def build_packed_prompt(postings: List[Dict]) -> str:
+    """
+    One prompt asking for the analysis of several postings at once
+    """
+    blocks = "".join(
+        f"""
+            Posting {number}:
+            Title: {posting.get('title')}
+            Description: {posting.get('description')}
+            Requirements: {posting.get('requirements', '')}
+            """
+        for number, posting in enumerate(postings, 1)
+    )
+    return f"""
+            Analyze each of these {len(postings)} job postings for a corp-to-corp opportunity:
+            {blocks}
+            For each posting provide the following analysis:{ANALYSIS_FIELDS}            
+            Return only valid JSON format: an object {{"analyses": [...]}} with exactly
+            one analysis per posting, in the same order as the postings.
+            """
 
 class AIAnalysisService:
     def __init__(self):
@@ -13,49 +75,45 @@ class AIAnalysisService:
         else:
             self.client = None
         
-    def analyze_job_description(self, job_title: str, job_description: str, requirements: str = "") -> Dict[str, Any]:
+    def analyze_job_description(self, job_title: str, job_description: str, requirements: str = "", use_cache: bool = True) -> Dict[str, Any]:
         """
         Analyze job description using OpenAI to extract relevant information
-        and score job relevance for corp-to-corp opportunities
+        and score job relevance for corp-to-corp opportunities.
+
+        OpenAI results are cached by posting content; pass use_cache=False
+        (or set ANALYSIS_CACHE_ENABLED=false) to always call the API.
         """
+        cache_key = None
         try:
-            prompt = f"""
-            Analyze this job posting for a corp-to-corp opportunity:
-            
-            Title: {job_title}
-            Description: {job_description}
-            Requirements: {requirements}
-            
-            Please provide a JSON response with the following analysis:
-            1. relevance_score (0-1): How relevant is this job for corp-to-corp work?
-            2. is_corp_to_corp (boolean): Does this explicitly mention corp-to-corp/contract work?
-            3. key_skills: List of main technical skills required
-            4. experience_level: junior/mid/senior/expert
-            5. remote_friendly: boolean indicating if remote work is mentioned
-            6. urgency_level: low/medium/high based on posting language
-            7. salary_indication: estimated salary range if mentioned
-            8. summary: Brief 2-sentence summary of the role
-            
-            Return only valid JSON format.
-            """
+            prompt = build_prompt(job_title, job_description, requirements)
             
             if not self.client:
                 # Fallback analysis without OpenAI
                 return self._fallback_analysis(job_title, job_description, requirements)
             
+            if use_cache and settings.ANALYSIS_CACHE_ENABLED:
+                cache_key = analysis_cache.make_key(job_title, job_description, requirements, PROMPT_VERSION, ANALYSIS_MODEL)
+                cached = analysis_cache.get(cache_key)
+                if cached is not None:
+                    return cached
+            else:
+                analysis_cache.record_bypass()
+            
             response = self.client.chat.completions.create(
-                model="gpt-3.5-turbo",
+                model=ANALYSIS_MODEL,
                 messages=[
-                    {"role": "system", "content": "You are an expert job analyst specializing in corp-to-corp contract opportunities."},
+                    {"role": "system", "content": SYSTEM_PROMPT},
                     {"role": "user", "content": prompt}
                 ],
-                max_tokens=500,
+                max_tokens=MAX_TOKENS_PER_ANALYSIS,
                 temperature=0.3
             )
             
             analysis_text = response.choices[0].message.content
             try:
                 analysis = json.loads(analysis_text)
+                if cache_key:
+                    analysis_cache.put(cache_key, analysis, ANALYSIS_MODEL, PROMPT_VERSION)
                 return analysis
             except json.JSONDecodeError:
                 return self._fallback_analysis(job_title, job_description, requirements)
@@ -68,43 +126,45 @@ class AIAnalysisService:
         """
         Fallback analysis without OpenAI API
         """
-        combined_text = f"{job_title} {job_description} {requirements}".lower()
+        combined_text = f"{job_title} {job_description} {requirements}"
+        
+        # One pass over the text for every keyword list
+        hits = get_matcher({
+            'corp_to_corp': settings.CORP_TO_CORP_KEYWORDS,
+            'tech': TECH_KEYWORDS,
+            'senior': SENIOR_KEYWORDS,
+            'junior': JUNIOR_KEYWORDS,
+            'remote': REMOTE_KEYWORDS,
+            'urgency': URGENCY_KEYWORDS
+        }).find(combined_text)
         
         # Check for corp-to-corp keywords
-        corp_keywords = [kw.lower() for kw in settings.CORP_TO_CORP_KEYWORDS]
-        is_corp_to_corp = any(keyword in combined_text for keyword in corp_keywords)
+        is_corp_to_corp = bool(hits.get('corp_to_corp'))
         
         # Basic relevance scoring
-        tech_keywords = [
-            "python", "java", "javascript", "react", "nodejs", "sql", "aws", "azure",
-            "docker", "kubernetes", "machine learning", "data science", "api", "rest",
-            "microservices", "cloud", "devops", "ci/cd", "agile", "scrum"
-        ]
-        
-        tech_score = sum(1 for keyword in tech_keywords if keyword in combined_text)
+        tech_hits = hits.get('tech', set())
+        tech_score = len(tech_hits)
         relevance_score = min(1.0, tech_score / 10.0)
         
         if is_corp_to_corp:
             relevance_score += 0.3
         
         # Extract basic skills
-        found_skills = [skill for skill in tech_keywords if skill in combined_text]
+        found_skills = [skill for skill in TECH_KEYWORDS if skill in tech_hits]
         
         # Determine experience level
-        if any(level in combined_text for level in ["senior", "lead", "principal", "architect"]):
+        if hits.get('senior'):
             experience_level = "senior"
-        elif any(level in combined_text for level in ["junior", "entry", "graduate"]):
+        elif hits.get('junior'):
             experience_level = "junior"
         else:
             experience_level = "mid"
         
         # Check for remote work
-        remote_keywords = ["remote", "work from home", "wfh", "telecommute", "distributed"]
-        remote_friendly = any(keyword in combined_text for keyword in remote_keywords)
+        remote_friendly = bool(hits.get('remote'))
         
         # Urgency detection
-        urgency_keywords = ["urgent", "asap", "immediate", "quickly", "fast"]
-        urgency_level = "high" if any(keyword in combined_text for keyword in urgency_keywords) else "medium"
+        urgency_level = "high" if hits.get('urgency') else "medium"
         
         return {
             "relevance_score": min(1.0, relevance_score),
@@ -119,38 +179,12 @@ class AIAnalysisService:
     
     def extract_salary_range(self, text: str) -> tuple:
         """
-        Extract salary range from job description text
+        Extract salary range from job description text, annualized
         """
-        # Common salary patterns
-        patterns = [
-            r'\$(\d{1,3}(?:,\d{3})*(?:\.\d{2})?)\s*-\s*\$(\d{1,3}(?:,\d{3})*(?:\.\d{2})?)',
-            r'(\d{1,3}(?:,\d{3})*)\s*-\s*(\d{1,3}(?:,\d{3})*)\s*(?:k|thousand)',
-            r'\$(\d{1,3}(?:,\d{3})*)\s*per\s*hour',
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
-            if match:
-                try:
-                    if "hour" in pattern:
-                        # Convert hourly to annual (assume 40 hours/week, 52 weeks/year)
-                        hourly_rate = float(match.group(1).replace(',', ''))
-                        annual_salary = hourly_rate * 40 * 52
-                        return (annual_salary, annual_salary)
-                    else:
-                        min_salary = float(match.group(1).replace(',', ''))
-                        max_salary = float(match.group(2).replace(',', ''))
-                        
-                        # If values are in thousands (k), multiply by 1000
-                        if 'k' in text.lower() or 'thousand' in text.lower():
-                            min_salary *= 1000
-                            max_salary *= 1000
-                        
-                        return (min_salary, max_salary)
-                except (ValueError, IndexError):
-                    continue
-        
-        return (None, None)
+        salary = parse_salary(text)
+        if salary is None:
+            return (None, None)
+        return (salary.annual_min, salary.annual_max)
 
 # Create singleton instance
 ai_service = AIAnalysisService()
\ No newline at end of file
@@ -0,0 +1,139 @@
+import hashlib
+import json
+import threading
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Optional
+from sqlalchemy.orm import Session
+from app.models import AnalysisCacheEntry, SessionLocal
+from app.config import settings
+
+# Check TTL/size limits once every this many writes
+EVICTION_INTERVAL = 100
+
+class AnalysisCache:
+    def __init__(self, session_factory: Callable[[], Session] = SessionLocal):
+        """
+        Persistent LLM analysis cache keyed by the content of a posting, so a
+        repost of the same text under another URL reuses the earlier analysis.
+        Entries expire after ANALYSIS_CACHE_TTL_DAYS and the least recently
+        used ones are dropped beyond ANALYSIS_CACHE_MAX_ENTRIES.
+        """
+        self.session_factory = session_factory
+        self.stats = {'hits': 0, 'misses': 0, 'writes': 0, 'evictions': 0, 'bypassed': 0}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def normalize(text: Optional[str]) -> str:
+        return " ".join((text or "").lower().split())
+
+    def make_key(self, title: str, description: str, requirements: str, prompt_version: int, model: str) -> str:
+        """
+        sha256 over the normalized posting text, the prompt version and the model
+        """
+        parts = [self.normalize(title), self.normalize(description), self.normalize(requirements), str(prompt_version), model]
+        return hashlib.sha256("\x1f".join(parts).encode()).hexdigest()
+
+    def _count(self, name: str, amount: int = 1):
+        with self._lock:
+            self.stats[name] += amount
+
+    def record_bypass(self):
+        self._count('bypassed')
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Return the cached analysis for key, or None on a miss or expired entry
+        """
+        db = self.session_factory()
+        try:
+            entry = db.get(AnalysisCacheEntry, key)
+            now = datetime.utcnow()
+
+            if entry is not None and entry.created_at < now - timedelta(days=settings.ANALYSIS_CACHE_TTL_DAYS):
+                db.delete(entry)
+                db.commit()
+                self._count('evictions')
+                entry = None
+
+            if entry is None:
+                self._count('misses')
+                return None
+
+            entry.hits += 1
+            entry.last_used_at = now
+            analysis = json.loads(entry.analysis)
+            db.commit()
+            self._count('hits')
+            return analysis
+        except Exception as e:
+            db.rollback()
+            print(f"Error reading analysis cache: {str(e)}")
+            self._count('misses')
+            return None
+        finally:
+            db.close()
+
+    def put(self, key: str, analysis: Dict[str, Any], model: str, prompt_version: int):
+        """
+        Store an analysis, replacing any entry with the same key
+        """
+        db = self.session_factory()
+        try:
+            now = datetime.utcnow()
+            db.merge(AnalysisCacheEntry(
+                key=key,
+                analysis=json.dumps(analysis),
+                model=model,
+                prompt_version=prompt_version,
+                created_at=now,
+                last_used_at=now,
+                hits=0
+            ))
+            db.commit()
+            self._count('writes')
+
+            if self.stats['writes'] % EVICTION_INTERVAL == 0:
+                self.evict(db)
+        except Exception as e:
+            db.rollback()
+            print(f"Error writing analysis cache: {str(e)}")
+        finally:
+            db.close()
+
+    def evict(self, db: Session = None) -> int:
+        """
+        Delete expired entries, then the least recently used ones over the size limit
+        """
+        own_session = db is None
+        db = db or self.session_factory()
+        try:
+            cutoff = datetime.utcnow() - timedelta(days=settings.ANALYSIS_CACHE_TTL_DAYS)
+            removed = db.query(AnalysisCacheEntry).filter(
+                AnalysisCacheEntry.created_at < cutoff
+            ).delete(synchronize_session=False)
+
+            excess = db.query(AnalysisCacheEntry).count() - settings.ANALYSIS_CACHE_MAX_ENTRIES
+            if excess > 0:
+                oldest = db.query(AnalysisCacheEntry.key).order_by(
+                    AnalysisCacheEntry.last_used_at
+                ).limit(excess)
+                removed += db.query(AnalysisCacheEntry).filter(
+                    AnalysisCacheEntry.key.in_(oldest)
+                ).delete(synchronize_session=False)
+
+            db.commit()
+            self._count('evictions', removed)
+            return removed
+        finally:
+            if own_session:
+                db.close()
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self.stats)
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = round(stats['hits'] / lookups, 3) if lookups else 0.0
+        return stats
+
+# Create singleton instance
+analysis_cache = AnalysisCache()
@@ -0,0 +1,252 @@
+import asyncio
+import json
+import random
+import time
+from typing import Any, Dict, List, Optional
+import openai
+from app.config import settings
+from app.scrapers.http_client import run_sync
+from app.scrapers.rate_limiter import TokenBucket
+from app.services.ai_analysis import (
+    ai_service, build_prompt, build_packed_prompt,
+    SYSTEM_PROMPT, MAX_TOKENS_PER_ANALYSIS, PROMPT_VERSION, ANALYSIS_MODEL
+)
+from app.services.analysis_cache import analysis_cache
+
+# Rough prompt size estimate used for the tokens-per-minute budget
+CHARS_PER_TOKEN = 4
+RETRY_BASE_DELAY = 1.0
+
+class AnalysisStage:
+    def __init__(
+        self,
+        api_key: str = None,
+        base_url: str = None,
+        max_in_flight: int = None,
+        tokens_per_minute: int = None,
+        max_retries: int = None,
+        timeout: float = None,
+        pack_size: int = None,
+        pack_max_chars: int = None,
+        retry_base_delay: float = RETRY_BASE_DELAY,
+        tiered: bool = None,
+        audit_sample_rate: float = None
+    ):
+        """
+        Analyze a batch of jobs with concurrent OpenAI requests.
+
+        At most max_in_flight requests run at once and their estimated
+        token use is spaced to tokens_per_minute. Short postings (under
+        pack_max_chars) are packed pack_size to a request. Failed requests
+        are retried with jittered exponential backoff; jobs that still fail
+        get the local keyword analysis.
+
+        When tiered, the local keyword analysis runs first and only jobs
+        whose local score is inside the uncertainty band go to the LLM. A
+        random audit_sample_rate of the other jobs is sent as well, to
+        measure how often the two tiers disagree.
+        """
+        self.api_key = api_key or settings.OPENAI_API_KEY
+        self.base_url = base_url
+        self.max_in_flight = max_in_flight or settings.ANALYSIS_MAX_IN_FLIGHT
+        self.tokens_per_minute = tokens_per_minute or settings.ANALYSIS_TOKENS_PER_MINUTE
+        self.max_retries = settings.ANALYSIS_MAX_RETRIES if max_retries is None else max_retries
+        self.timeout = timeout or settings.ANALYSIS_REQUEST_TIMEOUT
+        self.pack_size = pack_size or settings.ANALYSIS_PACK_SIZE
+        self.pack_max_chars = settings.ANALYSIS_PACK_MAX_CHARS if pack_max_chars is None else pack_max_chars
+        self.retry_base_delay = retry_base_delay
+        self.tiered = settings.ANALYSIS_TIERED if tiered is None else tiered
+        self.audit_sample_rate = settings.ANALYSIS_AUDIT_SAMPLE_RATE if audit_sample_rate is None else audit_sample_rate
+        self.last_run_stats: Dict[str, Any] = {}
+        self.tier_stats = {'local_only': 0, 'escalated': 0, 'audited': 0, 'audit_disagreements': 0}
+
+    def analyze(self, jobs: List[Dict]) -> List[Dict[str, Any]]:
+        """
+        Analyze jobs (dicts with title, description and requirements) and
+        return one analysis per job, in order
+        """
+        if not self.api_key:
+            return [self._fallback(job) for job in jobs]
+        return run_sync(self.analyze_async(jobs))
+
+    async def analyze_async(self, jobs: List[Dict]) -> List[Dict[str, Any]]:
+        start = time.perf_counter()
+        stats = {
+            'jobs': len(jobs), 'cache_hits': 0, 'local_only': 0, 'escalated': 0, 'audited': 0,
+            'audit_disagreements': 0, 'requests': 0, 'packed_requests': 0, 'retries': 0, 'fallbacks': 0
+        }
+        results: List[Optional[Dict]] = [None] * len(jobs)
+        cache_keys: Dict[int, str] = {}
+
+        for index, job in enumerate(jobs):
+            if not settings.ANALYSIS_CACHE_ENABLED:
+                analysis_cache.record_bypass()
+                continue
+            cache_keys[index] = analysis_cache.make_key(
+                job.get('title'), job.get('description'), job.get('requirements', ''), PROMPT_VERSION, ANALYSIS_MODEL
+            )
+            results[index] = analysis_cache.get(cache_keys[index])
+            if results[index] is not None:
+                stats['cache_hits'] += 1
+
+        pending = [index for index, result in enumerate(results) if result is None]
+        local: Dict[int, Dict] = {}
+        audited = set()
+        if self.tiered:
+            pending, local, audited = self._triage(jobs, pending, results)
+            stats['local_only'] = len(local) - len(pending)
+            stats['escalated'] = len(pending) - len(audited)
+            stats['audited'] = len(audited)
+
+        budget = TokenBucket(self.tokens_per_minute / 60, self.tokens_per_minute)
+        in_flight = asyncio.Semaphore(self.max_in_flight)
+
+        client = openai.AsyncOpenAI(api_key=self.api_key, base_url=self.base_url, max_retries=0)
+        try:
+            await asyncio.gather(*(
+                self._analyze_pack(client, in_flight, budget, jobs, pack, results, stats)
+                for pack in self._packs(jobs, pending)
+            ))
+        finally:
+            await client.close()
+
+        for index in pending:
+            if results[index] is None:
+                results[index] = local.get(index) or self._fallback(jobs[index])
+                stats['fallbacks'] += 1
+                continue
+            if index in cache_keys:
+                analysis_cache.put(cache_keys[index], results[index], ANALYSIS_MODEL, PROMPT_VERSION)
+            if index in audited and self._disagree(local[index], results[index]):
+                stats['audit_disagreements'] += 1
+
+        for key in self.tier_stats:
+            self.tier_stats[key] += stats[key]
+        stats['seconds'] = round(time.perf_counter() - start, 3)
+        self.last_run_stats = stats
+        return results
+
+    def _triage(self, jobs: List[Dict], pending: List[int], results: List[Optional[Dict]]):
+        """
+        Run the local analysis on pending jobs and pick the ones to escalate.
+
+        Jobs scored outside the uncertainty band keep their local analysis,
+        except for the audit sample, which is escalated too.
+        """
+        escalate, local, audited = [], {}, set()
+        for index in pending:
+            local[index] = self._fallback(jobs[index])
+            score = local[index].get('relevance_score', 0.0)
+            if settings.ANALYSIS_UNCERTAIN_MIN_SCORE <= score <= settings.ANALYSIS_UNCERTAIN_MAX_SCORE:
+                escalate.append(index)
+            elif random.random() < self.audit_sample_rate:
+                escalate.append(index)
+                audited.add(index)
+            else:
+                results[index] = local[index]
+        return escalate, local, audited
+
+    def _disagree(self, local: Dict, remote: Dict) -> bool:
+        try:
+            score_gap = abs(float(local.get('relevance_score', 0.0)) - float(remote.get('relevance_score', 0.0)))
+        except (TypeError, ValueError):
+            return True
+        return (
+            score_gap > settings.ANALYSIS_DISAGREEMENT_THRESHOLD
+            or bool(local.get('is_corp_to_corp')) != bool(remote.get('is_corp_to_corp'))
+        )
+
+    def get_tier_stats(self) -> Dict[str, Any]:
+        stats = dict(self.tier_stats)
+        stats['llm_calls_avoided'] = stats['local_only']
+        stats['audit_disagreement_rate'] = (
+            round(stats['audit_disagreements'] / stats['audited'], 3) if stats['audited'] else 0.0
+        )
+        return stats
+
+    def _packs(self, jobs: List[Dict], indices: List[int]) -> List[List[int]]:
+        """
+        Group short postings pack_size to a request; long ones go alone
+        """
+        packs, short = [], []
+        for index in indices:
+            job = jobs[index]
+            size = len(job.get('description') or "") + len(job.get('requirements') or "")
+            if self.pack_size > 1 and size <= self.pack_max_chars:
+                short.append(index)
+            else:
+                packs.append([index])
+        packs.extend(short[i:i + self.pack_size] for i in range(0, len(short), self.pack_size))
+        return packs
+
+    async def _analyze_pack(self, client, in_flight, budget, jobs, pack, results, stats):
+        postings = [jobs[index] for index in pack]
+        try:
+            if len(pack) == 1:
+                job = postings[0]
+                prompt = build_prompt(job.get('title'), job.get('description'), job.get('requirements', ''))
+                analyses = [await self._complete(client, in_flight, budget, prompt, 1, stats)]
+            else:
+                prompt = build_packed_prompt(postings)
+                response = await self._complete(client, in_flight, budget, prompt, len(pack), stats)
+                analyses = response.get('analyses')
+                stats['packed_requests'] += 1
+                if not isinstance(analyses, list) or len(analyses) != len(pack):
+                    raise ValueError(f"expected {len(pack)} analyses in packed response")
+        except Exception as e:
+            if len(pack) == 1:
+                print(f"Error in AI analysis: {str(e)}")
+                return
+            # Retry the postings one by one rather than losing the whole pack
+            await asyncio.gather(*(
+                self._analyze_pack(client, in_flight, budget, jobs, [index], results, stats)
+                for index in pack
+            ))
+            return
+
+        for index, analysis in zip(pack, analyses):
+            if isinstance(analysis, dict):
+                results[index] = analysis
+
+    async def _complete(self, client, in_flight, budget, prompt: str, postings: int, stats: Dict) -> Dict:
+        """
+        One chat completion parsed as JSON, within the token budget and
+        in-flight limit, retried with jitter
+        """
+        max_tokens = MAX_TOKENS_PER_ANALYSIS * postings
+        estimated_tokens = (len(SYSTEM_PROMPT) + len(prompt)) // CHARS_PER_TOKEN + max_tokens
+
+        for attempt in range(self.max_retries + 1):
+            wait = budget.reserve(time.monotonic(), estimated_tokens)
+            if wait > 0:
+                await asyncio.sleep(wait)
+
+            try:
+                async with in_flight:
+                    stats['requests'] += 1
+                    response = await asyncio.wait_for(
+                        client.chat.completions.create(
+                            model=ANALYSIS_MODEL,
+                            messages=[
+                                {"role": "system", "content": SYSTEM_PROMPT},
+                                {"role": "user", "content": prompt}
+                            ],
+                            max_tokens=max_tokens,
+                            temperature=0.3
+                        ),
+                        self.timeout
+                    )
+                return json.loads(response.choices[0].message.content)
+            except json.JSONDecodeError:
+                raise
+            except Exception:
+                if attempt == self.max_retries:
+                    raise
+                stats['retries'] += 1
+                await asyncio.sleep(random.uniform(0, self.retry_base_delay * 2 ** attempt))
+
+    def _fallback(self, job: Dict) -> Dict[str, Any]:
+        return ai_service._fallback_analysis(job.get('title'), job.get('description'), job.get('requirements', ''))
+
+# Create singleton instance
+analysis_stage = AnalysisStage()
@@ -0,0 +1,92 @@
+from typing import List, Dict
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+from app.models import Job
+from app.utils.near_duplicates import near_duplicate_index
+from app.services.job_rollups import job_rollups
+from app.config import settings
+
+ID_LOOKUP_CHUNK_SIZE = 500
+
+class JobIngestionPipeline:
+    def __init__(self, db: Session, batch_size: int = None):
+        self.db = db
+        self.batch_size = batch_size or settings.INGEST_BATCH_SIZE
+        self.pending: List[Dict] = []
+        self.stats = {
+            'new_jobs': 0,
+            'corp_to_corp_jobs': 0,
+            'failed_jobs': 0,
+            'batches': 0
+        }
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.flush()
+    
+    def add(self, row: Dict):
+        """
+        Queue a job row (a dict of Job column values) and flush when the
+        batch is full
+        """
+        self.pending.append(row)
+        if len(self.pending) >= self.batch_size:
+            self.flush()
+    
+    def flush(self):
+        """
+        Write all queued rows in a single transaction, falling back to
+        row-by-row inserts if the batch fails
+        """
+        if not self.pending:
+            return
+        
+        rows, self.pending = self.pending, []
+        self.stats['batches'] += 1
+        
+        try:
+            self._insert_rows(rows)
+            self.db.commit()
+            self._count_inserted(rows)
+        except Exception as e:
+            print(f"Error inserting batch of {len(rows)} jobs, retrying row by row: {e}")
+            self.db.rollback()
+            for row in rows:
+                self._insert_one(row)
+    
+    def _insert_one(self, row: Dict):
+        try:
+            self._insert_rows([row])
+            self.db.commit()
+            self._count_inserted([row])
+        except Exception as e:
+            print(f"Error inserting job '{row.get('title')}': {e}")
+            self.db.rollback()
+            self.stats['failed_jobs'] += 1
+    
+    def _insert_rows(self, rows: List[Dict]):
+        """
+        Insert rows and add them to the near-duplicate index and the stats
+        rollups in the same transaction
+        """
+        self.db.execute(insert(Job), rows)
+        
+        job_ids = {}
+        fingerprints = [row['fingerprint'] for row in rows]
+        for i in range(0, len(fingerprints), ID_LOOKUP_CHUNK_SIZE):
+            job_ids.update(
+                self.db.query(Job.fingerprint, Job.id).filter(
+                    Job.fingerprint.in_(fingerprints[i:i + ID_LOOKUP_CHUNK_SIZE])
+                ).all()
+            )
+        
+        near_duplicate_index.add_jobs(
+            self.db, [dict(row, id=job_ids[row['fingerprint']]) for row in rows]
+        )
+        job_rollups.add_jobs(self.db, rows)
+    
+    def _count_inserted(self, rows: List[Dict]):
+        self.stats['new_jobs'] += len(rows)
+        self.stats['corp_to_corp_jobs'] += sum(1 for row in rows if row.get('is_corp_to_corp'))
@@ -0,0 +1,246 @@
+import csv
+import json
+import os
+import zlib
+from datetime import date, datetime, time, timedelta
+from pathlib import Path
+from typing import Any, Callable, Iterable, Iterator, List, Optional
+from sqlalchemy.orm import Session
+from app.models import Job, SessionLocal
+from app.models.schemas import JobExportRequest, JobFilters
+from app.services.job_service import PROJECTABLE_COLUMNS, job_service, parse_fields
+from app.config import settings
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - depends on installed extras
+    pa = pq = None
+
+# Keys of a JSON/NDJSON record, and the default Arrow/Parquet columns
+JSON_FIELDS = (
+    'id', 'title', 'company', 'location', 'description', 'job_type', 'source', 'posted_date',
+    'salary_min', 'salary_max', 'is_corp_to_corp', 'relevance_score', 'is_applied', 'is_favorited', 'source_url'
+)
+
+# (field, header) of the CSV columns
+CSV_COLUMNS = (
+    ('id', 'ID'), ('title', 'Title'), ('company', 'Company'), ('location', 'Location'),
+    ('job_type', 'Job Type'), ('source', 'Source'), ('posted_date', 'Posted Date'),
+    ('salary_min', 'Salary Min'), ('salary_max', 'Salary Max'), ('is_corp_to_corp', 'Is Corp to Corp'),
+    ('relevance_score', 'Relevance Score'), ('is_applied', 'Is Applied'), ('is_favorited', 'Is Favorited'),
+    ('source_url', 'Source URL')
+)
+
+# Everything a snapshot keeps
+SNAPSHOT_FIELDS = [name for name in PROJECTABLE_COLUMNS if name != 'description_preview']
+
+COLUMNAR_FORMATS = ('arrow', 'parquet')
+
+MEDIA_TYPES = {
+    'json': 'application/json',
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv',
+    'arrow': 'application/vnd.apache.arrow.stream',
+    'parquet': 'application/vnd.apache.parquet'
+}
+
+class _Echo:
+    # csv.writer target that hands each formatted line back instead of buffering it
+    def write(self, line: str) -> str:
+        return line
+
+class _Sink:
+    # pyarrow writer target whose bytes are taken out after every batch
+    closed = False
+
+    def __init__(self):
+        self.parts = []
+
+    def write(self, data) -> int:
+        self.parts.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self) -> bytes:
+        data, self.parts = b"".join(self.parts), []
+        return data
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+def arrow_schema(fields: List[str]):
+    """
+    Arrow schema for these Job fields, typed from the table's columns
+    """
+    types = {int: pa.int64(), float: pa.float64(), bool: pa.bool_(), datetime: pa.timestamp('us'), str: pa.string()}
+    columns = Job.__table__.columns
+    return pa.schema([
+        (name, types[columns[name].type.python_type if name in columns else str]) for name in fields
+    ])
+
+class JobExporter:
+    def __init__(self, session_factory: Callable[[], Session] = SessionLocal):
+        """
+        Streams the jobs matching a set of search filters as JSON, NDJSON,
+        CSV, Arrow IPC or Parquet, and writes daily Parquet snapshots. Rows
+        are read EXPORT_BATCH_SIZE at a time on a session of the exporter's
+        own (the response outlives the request's session) and sent in chunks
+        of about EXPORT_CHUNK_BYTES, or one record batch at a time for the
+        columnar formats, so memory stays flat however many jobs are exported.
+        """
+        self.session_factory = session_factory
+
+    @property
+    def columnar_available(self) -> bool:
+        return pa is not None
+
+    def media_type(self, params: JobExportRequest) -> str:
+        return 'application/gzip' if params.gzip else MEDIA_TYPES[params.format]
+
+    def filename(self, params: JobExportRequest) -> str:
+        return f"jobs.{params.format}" + (".gz" if params.gzip else "")
+
+    def columns(self, params: JobExportRequest) -> List[str]:
+        """
+        Exported fields: params.columns, or the format's defaults. Raises
+        ValueError on an unknown field.
+        """
+        if params.columns:
+            return parse_fields(params.columns)
+        if params.format == 'csv':
+            return [name for name, _ in CSV_COLUMNS]
+        return list(JSON_FIELDS)
+
+    def stream(self, params: JobExportRequest) -> Iterator[bytes]:
+        """
+        The export as an iterator of byte chunks, gzipped if params.gzip
+        """
+        fields = self.columns(params)
+        if params.format in COLUMNAR_FORMATS:
+            chunks = self._columnar_chunks(self._rows(fields, params), fields, params.format)
+        else:
+            chunks = self._chunks(self._lines(self._rows(fields, params), fields, params.format))
+        return self._gzip(chunks) if params.gzip else chunks
+
+    def write_snapshot(self, day: date, directory: Optional[str] = None) -> Path:
+        """
+        Write every column of the jobs scraped on day (UTC) to
+        <directory>/scrape_day=<day>/jobs.parquet, a Hive-style partition
+        pyarrow.dataset and pandas can prune by date. The file is replaced
+        atomically, so readers never see a partial one.
+        """
+        start = datetime.combine(day, time.min)
+        target = Path(directory or settings.EXPORT_SNAPSHOT_DIR) / f"scrape_day={day.isoformat()}" / "jobs.parquet"
+        target.parent.mkdir(parents=True, exist_ok=True)
+        partial = target.with_name(target.name + ".tmp")
+
+        schema = arrow_schema(SNAPSHOT_FIELDS)
+        rows = self._rows(SNAPSHOT_FIELDS, criteria=(Job.scraped_date >= start, Job.scraped_date < start + timedelta(days=1)))
+        with pq.ParquetWriter(partial, schema) as writer:
+            for batch in self._record_batches(rows, schema):
+                writer.write_batch(batch)
+        os.replace(partial, target)
+        return target
+
+    def write_pending_snapshots(self, today: Optional[date] = None, directory: Optional[str] = None) -> List[Path]:
+        """
+        Snapshot each of the last EXPORT_SNAPSHOT_BACKFILL_DAYS complete days
+        that has no partition yet; today is left until it is over
+        """
+        today = today or datetime.utcnow().date()
+        root = Path(directory or settings.EXPORT_SNAPSHOT_DIR)
+        written = []
+        for age in range(settings.EXPORT_SNAPSHOT_BACKFILL_DAYS, 0, -1):
+            day = today - timedelta(days=age)
+            if not (root / f"scrape_day={day.isoformat()}" / "jobs.parquet").exists():
+                written.append(self.write_snapshot(day, str(root)))
+        return written
+
+    def _rows(self, fields: List[str], filters: Optional[JobFilters] = None, criteria: Iterable = ()) -> Iterator[tuple]:
+        db = self.session_factory()
+        try:
+            query = db.query(*(PROJECTABLE_COLUMNS[name].label(name) for name in fields)).filter(*criteria)
+            if filters is not None:
+                query, _, _ = job_service.filter_query(db, query, filters)
+            yield from query.order_by(Job.id).yield_per(settings.EXPORT_BATCH_SIZE)
+        finally:
+            db.close()
+
+    def _lines(self, rows: Iterator[tuple], fields: List[str], format: str) -> Iterator[str]:
+        if format == 'csv':
+            headers = dict(CSV_COLUMNS)
+            writer = csv.writer(_Echo())
+            yield writer.writerow([headers.get(name, name) for name in fields])
+            for row in rows:
+                yield writer.writerow(row)
+            return
+
+        records = (json.dumps(dict(zip(fields, row)), default=_json_default) for row in rows)
+        if format == 'ndjson':
+            for record in records:
+                yield record + "\n"
+            return
+
+        # The {"data": [...], "format": "json"} envelope JSON exports have always had
+        opening = '{"data": [\n'
+        separator = opening
+        for record in records:
+            yield separator + record
+            separator = ",\n"
+        yield '{"data": [], "format": "json"}' if separator == opening else '\n], "format": "json"}'
+
+    def _chunks(self, lines: Iterator[str]) -> Iterator[bytes]:
+        # Many small lines per write to the socket
+        buffer, size = [], 0
+        for line in lines:
+            buffer.append(line)
+            size += len(line)
+            if size >= settings.EXPORT_CHUNK_BYTES:
+                yield "".join(buffer).encode()
+                buffer, size = [], 0
+        if buffer:
+            yield "".join(buffer).encode()
+
+    def _record_batches(self, rows: Iterator[tuple], schema) -> Iterator:
+        batch = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= settings.EXPORT_ARROW_BATCH_ROWS:
+                yield self._record_batch(batch, schema)
+                batch = []
+        if batch:
+            yield self._record_batch(batch, schema)
+
+    def _record_batch(self, rows: List[tuple], schema):
+        columns = zip(*rows)
+        return pa.RecordBatch.from_arrays(
+            [pa.array(values, type=field.type) for values, field in zip(columns, schema)], schema=schema
+        )
+
+    def _columnar_chunks(self, rows: Iterator[tuple], fields: List[str], format: str) -> Iterator[bytes]:
+        sink = _Sink()
+        schema = arrow_schema(fields)
+        writer = pa.ipc.new_stream(sink, schema) if format == 'arrow' else pq.ParquetWriter(sink, schema)
+        for batch in self._record_batches(rows, schema):
+            writer.write_batch(batch)
+            chunk = sink.drain()
+            if chunk:
+                yield chunk
+        writer.close()
+        yield sink.drain()
+
+    def _gzip(self, chunks: Iterator[bytes]) -> Iterator[bytes]:
+        compressor = zlib.compressobj(wbits=31)  # 31: gzip header and trailer
+        for chunk in chunks:
+            compressed = compressor.compress(chunk)
+            if compressed:
+                yield compressed
+        yield compressor.flush()
+
+# Global exporter instance
+job_exporter = JobExporter()
@@ -0,0 +1,265 @@
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from sqlalchemy import desc, func, tuple_
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+from app.models import Job, JobRollup
+
+# bucket_start of the all-time rows
+TOTAL_BUCKET = datetime(1970, 1, 1)
+
+DIMENSIONS = ('source', 'company', 'location', 'title', 'job_type', 'salary_bucket')
+KEY_FIELDS = ('period', 'dimension', 'value', 'bucket_start')
+COUNTERS = ('job_count', 'corp_to_corp_count', 'relevance_sum', 'salary_count', 'salary_min_sum', 'salary_max_count', 'salary_max_sum')
+
+# What a job contributes from
+ROLLUP_COLUMNS = (
+    Job.id, Job.posted_date, Job.source, Job.company, Job.location, Job.title, Job.job_type,
+    Job.is_corp_to_corp, Job.relevance_score, Job.salary_min, Job.salary_max
+)
+
+# (upper bound of salary_min, label); anything higher is TOP_SALARY_BUCKET
+SALARY_BUCKETS = ((60000, 'Under $60k'), (80000, '$60k-$80k'), (100000, '$80k-$100k'), (120000, '$100k-$120k'))
+TOP_SALARY_BUCKET = '$120k+'
+
+CHUNK_SIZE = 500
+
+RollupKey = Tuple[str, str, str, datetime]
+
+def salary_bucket(salary_min: Optional[float]) -> Optional[str]:
+    if salary_min is None:
+        return None
+    for limit, label in SALARY_BUCKETS:
+        if salary_min < limit:
+            return label
+    return TOP_SALARY_BUCKET
+
+def _field(job: Any, name: str) -> Any:
+    return job.get(name) if isinstance(job, dict) else getattr(job, name, None)
+
+def _keys(job: Any) -> List[RollupKey]:
+    """
+    Every bucket a job is counted in: the all-time total, its posting hour,
+    and the all-time and posting-day rows of each dimension value
+    """
+    posted_date = _field(job, 'posted_date')
+    hour = posted_date.replace(minute=0, second=0, microsecond=0) if posted_date else None
+
+    keys = [('total', 'all', '', TOTAL_BUCKET)]
+    if hour:
+        keys.append(('hour', 'all', '', hour))
+    for dimension in DIMENSIONS:
+        if dimension == 'salary_bucket':
+            value = salary_bucket(_field(job, 'salary_min'))
+            if value is None:
+                continue
+        else:
+            value = _field(job, dimension) or ''
+        keys.append(('total', dimension, value, TOTAL_BUCKET))
+        if hour:
+            keys.append(('day', dimension, value, hour.replace(hour=0)))
+    return keys
+
+def _counters(job: Any, sign: int) -> List[float]:
+    salary_min, salary_max = _field(job, 'salary_min'), _field(job, 'salary_max')
+    # Salary averages are over jobs with a salary_min, as the analytics always were
+    has_max = salary_min is not None and salary_max is not None
+    return [
+        sign,
+        sign * bool(_field(job, 'is_corp_to_corp')),
+        sign * (_field(job, 'relevance_score') or 0.0),
+        sign * (salary_min is not None),
+        sign * (salary_min or 0.0),
+        sign * has_max,
+        sign * (salary_max if has_max else 0.0)
+    ]
+
+class JobRollups:
+    """
+    Job counters by hour, day and all time, per source, company, location,
+    title, job type and salary bucket, so stats and analytics read a few
+    buckets instead of scanning jobs. Ingest adds to them and deletes
+    subtract from them in the same transaction as the job rows; check()
+    compares them with a recount and rebuild() recomputes them.
+    """
+
+    def add_jobs(self, db: Session, jobs: Iterable) -> int:
+        """
+        Count newly inserted jobs (dicts of Job column values or rows)
+        """
+        deltas = self._deltas(jobs, 1)
+        self._apply(db, deltas)
+        return len(deltas)
+
+    def remove_jobs(self, db: Session, *criteria) -> int:
+        """
+        Uncount the jobs matching criteria; call before deleting them
+        """
+        deltas = self._deltas(db.query(*ROLLUP_COLUMNS).filter(*criteria).yield_per(CHUNK_SIZE), -1)
+        self._apply(db, deltas)
+
+        # Drop buckets that emptied out
+        keys = list(deltas)
+        for i in range(0, len(keys), CHUNK_SIZE):
+            db.query(JobRollup).filter(
+                tuple_(*(getattr(JobRollup, name) for name in KEY_FIELDS)).in_(keys[i:i + CHUNK_SIZE]),
+                JobRollup.job_count <= 0
+            ).delete(synchronize_session=False)
+        return len(deltas)
+
+    def update_relevance(self, db: Session, changes: Dict[int, float]):
+        """
+        Apply relevance_score changes, {job id: new score - old score}
+        """
+        deltas = defaultdict(lambda: [0.0] * len(COUNTERS))
+        job_ids = list(changes)
+        for i in range(0, len(job_ids), CHUNK_SIZE):
+            for job in db.query(*ROLLUP_COLUMNS).filter(Job.id.in_(job_ids[i:i + CHUNK_SIZE])):
+                for key in _keys(job):
+                    deltas[key][2] += changes[job.id]
+        self._apply(db, deltas)
+
+    def rebuild(self, db: Session) -> int:
+        """
+        Recount every bucket from the jobs table; returns the bucket count
+        """
+        db.query(JobRollup).delete(synchronize_session=False)
+        count = self.add_jobs(db, db.query(*ROLLUP_COLUMNS).yield_per(1000))
+        db.commit()
+        return count
+
+    def check(self, db: Session) -> Dict[str, Any]:
+        """
+        Compare the stored buckets with a recount from the jobs table
+        """
+        expected = self._deltas(db.query(*ROLLUP_COLUMNS).yield_per(1000), 1)
+        stored = {
+            tuple(getattr(row, name) for name in KEY_FIELDS): [getattr(row, name) for name in COUNTERS]
+            for row in db.query(JobRollup).yield_per(1000)
+        }
+
+        missing = [key for key in expected if key not in stored]
+        unexpected = [key for key in stored if key not in expected]
+        mismatched = [
+            key for key, counters in expected.items()
+            if key in stored and any(abs(a - (b or 0)) > 1e-6 * max(1.0, abs(a)) for a, b in zip(counters, stored[key]))
+        ]
+        return {
+            'consistent': not (missing or unexpected or mismatched),
+            'buckets': len(expected),
+            'missing': len(missing),
+            'unexpected': len(unexpected),
+            'mismatched': len(mismatched),
+            'examples': [" | ".join(map(str, key)) for key in (missing + unexpected + mismatched)[:10]]
+        }
+
+    # Reads
+
+    def totals(self, db: Session) -> Dict[str, float]:
+        row = db.query(JobRollup).filter_by(period='total', dimension='all').first()
+        return {name: (getattr(row, name) if row else 0) or 0 for name in COUNTERS}
+
+    def count_since(self, db: Session, since: datetime) -> int:
+        """
+        Jobs posted at or after since: whole hour buckets, plus the jobs in
+        the hour since falls in counted from the posted_date index
+        """
+        next_hour = since.replace(minute=0, second=0, microsecond=0) + timedelta(hours=1)
+        whole_hours = db.query(func.coalesce(func.sum(JobRollup.job_count), 0)).filter(
+            JobRollup.period == 'hour', JobRollup.dimension == 'all', JobRollup.bucket_start >= next_hour
+        ).scalar()
+        partial_hour = db.query(func.count(Job.id)).filter(Job.posted_date >= since, Job.posted_date < next_hour).scalar()
+        return int(whole_hours) + partial_hour
+
+    def top(self, db: Session, dimension: str, limit: int = 10, since: Optional[datetime] = None) -> List[Tuple[Optional[str], int]]:
+        """
+        Most common values of a dimension, all time or in the whole UTC days
+        from since's day on
+        """
+        if since is None:
+            query = db.query(JobRollup.value, JobRollup.job_count.label('count')).filter(
+                JobRollup.period == 'total', JobRollup.dimension == dimension
+            )
+        else:
+            query = db.query(JobRollup.value, func.sum(JobRollup.job_count).label('count')).filter(
+                JobRollup.period == 'day', JobRollup.dimension == dimension,
+                JobRollup.bucket_start >= since.replace(hour=0, minute=0, second=0, microsecond=0)
+            ).group_by(JobRollup.value)
+        rows = query.order_by(desc('count'), JobRollup.value).limit(limit).all()
+        return [(value or None, int(count)) for value, count in rows]
+
+    def salary_by(self, db: Session, dimension: str) -> List[Tuple[Optional[str], Optional[float], Optional[float]]]:
+        """
+        (value, average salary_min, average salary_max) over jobs with a salary_min
+        """
+        rows = db.query(JobRollup).filter(
+            JobRollup.period == 'total', JobRollup.dimension == dimension, JobRollup.salary_count > 0
+        ).order_by(JobRollup.value).all()
+        return [
+            (
+                row.value or None,
+                row.salary_min_sum / row.salary_count,
+                row.salary_max_sum / row.salary_max_count if row.salary_max_count else None
+            )
+            for row in rows
+        ]
+
+    def salary_distribution(self, db: Session) -> List[Tuple[str, int]]:
+        counts = dict(
+            db.query(JobRollup.value, JobRollup.job_count).filter(
+                JobRollup.period == 'total', JobRollup.dimension == 'salary_bucket'
+            ).all()
+        )
+        labels = [label for _, label in SALARY_BUCKETS] + [TOP_SALARY_BUCKET]
+        return [(label, counts[label]) for label in labels if counts.get(label)]
+
+    def _deltas(self, jobs: Iterable, sign: int) -> Dict[RollupKey, List[float]]:
+        deltas = defaultdict(lambda: [0] * len(COUNTERS))
+        for job in jobs:
+            counters = _counters(job, sign)
+            for key in _keys(job):
+                totals = deltas[key]
+                for i, amount in enumerate(counters):
+                    totals[i] += amount
+        return deltas
+
+    def _apply(self, db: Session, deltas: Dict[RollupKey, List[float]]):
+        """
+        Add deltas to their buckets, creating missing ones. One upsert
+        statement is executed over all buckets, so it compiles once instead
+        of once per multi-row VALUES list.
+        """
+        if not deltas:
+            return
+        insert = postgresql_insert if db.get_bind().dialect.name == 'postgresql' else sqlite_insert
+        statement = insert(JobRollup)
+        statement = statement.on_conflict_do_update(
+            index_elements=list(KEY_FIELDS),
+            set_={name: getattr(JobRollup, name) + getattr(statement.excluded, name) for name in COUNTERS}
+        )
+        rows = [dict(zip(KEY_FIELDS, key), **dict(zip(COUNTERS, counters))) for key, counters in deltas.items()]
+        for i in range(0, len(rows), CHUNK_SIZE):
+            db.execute(statement, rows[i:i + CHUNK_SIZE])
+
+# Global rollups instance
+job_rollups = JobRollups()
+
+if __name__ == '__main__':
+    import argparse
+    import json
+    from app.models import SessionLocal
+
+    parser = argparse.ArgumentParser(description="Check the job rollups against a recount of the jobs table")
+    parser.add_argument('--rebuild', action='store_true', help="rebuild them if they are inconsistent")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        result = job_rollups.check(db)
+        print(json.dumps(result, indent=2))
+        if args.rebuild and not result['consistent']:
+            print(f"Rebuilt {job_rollups.rebuild(db)} buckets")
+    finally:
+        db.close()
@@ -1,15 +1,52 @@
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Any, Tuple
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, func, desc
+from sqlalchemy import Float, Integer, or_, func, desc, literal_column, text, bindparam
 from datetime import datetime, timedelta
-from app.models import Job, JobAlert, get_db
-from app.models.schemas import JobCreate, JobSearchRequest, JobStats
+from app.models import Job, JobAlert, JobLSHBucket, get_db
+from app.models.search_index import BM25_WEIGHTS, FTS_TABLE, POSTGRES_DOCUMENT, build_match_query, has_search_index, tokenize
+from app.models.schemas import JobCreate, JobFilters, JobSearchRequest, JobStats, JobSummary
 from app.services.ai_analysis import ai_service
+from app.services.analysis_stage import analysis_stage
+from app.services.ingestion import JobIngestionPipeline
+from app.services.job_rollups import job_rollups
+from app.services.scrape_cursors import scrape_cursors
+from app.services.query_planner import query_planner
 from app.scrapers.job_scrapers import IndeedScraper, DiceScraper, LinkedInScraper, CyberSeekScraper
+from app.scrapers.scraping_engine import ScrapingEngine
+from app.utils.pagination import keyset_page
 from app.config import settings
-import hashlib
 import json
 
+FINGERPRINT_LOOKUP_CHUNK_SIZE = 500
+
+# Listing order, backed by the ix_jobs_rank_order index; id makes it unique
+RANK_KEYS = (Job.relevance_score, Job.posted_date, Job.id)
+
+DESCRIPTION_PREVIEW_CHARS = 200
+
+# Columns a listing can select with fields=, by JobSummary field name
+PROJECTABLE_COLUMNS = {
+    name: getattr(Job, name) for name in JobSummary.model_fields
+    if name not in ('description_preview', 'search_score', 'snippet')
+}
+PROJECTABLE_COLUMNS['description_preview'] = func.substr(Job.description, 1, DESCRIPTION_PREVIEW_CHARS)
+
+# What a listing selects by default: no full text columns
+SUMMARY_FIELDS = [name for name in PROJECTABLE_COLUMNS if name not in ('description', 'requirements', 'ai_analysis')]
+
+def parse_fields(fields: Optional[str]) -> List[str]:
+    """
+    Field names from a comma-separated fields= value (SUMMARY_FIELDS when
+    empty), id always first. Raises ValueError on an unknown name.
+    """
+    if not fields:
+        return list(SUMMARY_FIELDS)
+    names = [name.strip() for name in fields.split(',') if name.strip()]
+    unknown = sorted(set(names) - set(PROJECTABLE_COLUMNS))
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}; choose from {', '.join(PROJECTABLE_COLUMNS)}")
+    return ['id'] + [name for name in dict.fromkeys(names) if name != 'id']
+
 class JobService:
     def __init__(self):
         self.scrapers = {
@@ -18,11 +55,22 @@ class JobService:
             'linkedin': LinkedInScraper(),
             'cyberseek': CyberSeekScraper()
         }
+        for scraper in self.scrapers.values():
+            scraper.known_fingerprints = self._lookup_known_fingerprints
+            scraper.cursors = scrape_cursors
+        self.engine = ScrapingEngine(self.scrapers)
     
-    def scrape_and_store_jobs(self, keywords: str = "software developer", location: str = "USA") -> Dict[str, int]:
+    def scrape_and_store_jobs(self, keywords: str = "software developer", location: str = "USA") -> Dict[str, Any]:
         """
         Scrape jobs from all sources and store in database
         """
+        return self.scrape_and_store_many([keywords], location)
+    
+    def scrape_and_store_many(self, search_terms: List[str], location: str = "USA") -> Dict[str, Any]:
+        """
+        Scrape every search term from all sources concurrently and store the
+        results in the database
+        """
         results = {
             'total_scraped': 0,
             'new_jobs': 0,
@@ -33,180 +81,336 @@ class JobService:
         db = next(get_db())
         
         try:
-            all_jobs = []
+            # Scrape all (source, term) pairs at once
+            all_jobs, source_stats = self.engine.run(search_terms, location)
+            # Scrapers drop postings that are already stored; they still count as scraped duplicates
+            known_skipped = self.engine.last_run_stats.get('known_skipped', 0)
+            results['total_scraped'] = len(all_jobs) + known_skipped
+            results['duplicates_filtered'] = known_skipped
+            results['source_timings'] = {
+                name: stats['seconds'] for name, stats in source_stats.items()
+            }
             
-            # Scrape from all sources
-            for scraper_name, scraper in self.scrapers.items():
-                try:
-                    jobs = scraper.scrape_jobs(keywords, location)
-                    all_jobs.extend(jobs)
-                    results['total_scraped'] += len(jobs)
-                    print(f"Scraped {len(jobs)} jobs from {scraper_name}")
-                except Exception as e:
-                    print(f"Error scraping from {scraper_name}: {e}")
-                    continue
+            # Look up every scraped fingerprint in one set-based query
+            for job_data in all_jobs:
+                job_data['fingerprint'] = Job.compute_fingerprint(
+                    job_data['title'], job_data['company'], job_data['location'], job_data['source_url']
+                )
+            existing_fingerprints = self._find_existing_fingerprints(
+                db, [job_data['fingerprint'] for job_data in all_jobs]
+            )
             
-            # Process and store jobs
+            # Per-term yield and overlap drive which terms the planner runs next
+            term_fingerprints = {term: set() for term in search_terms}
             for job_data in all_jobs:
-                try:
-                    # Check for duplicates
-                    if self._is_duplicate_job(db, job_data):
-                        results['duplicates_filtered'] += 1
-                        continue
-                    
-                    # AI analysis
-                    ai_analysis = ai_service.analyze_job_description(
-                        job_data['title'],
-                        job_data['description'],
-                        job_data.get('requirements', '')
-                    )
-                    
-                    # Extract salary range
-                    salary_min, salary_max = ai_service.extract_salary_range(job_data['description'])
-                    
-                    # Create job record
-                    job = Job(
-                        title=job_data['title'],
-                        company=job_data['company'],
-                        location=job_data['location'],
-                        description=job_data['description'],
-                        requirements=job_data.get('requirements', ''),
-                        salary_min=salary_min,
-                        salary_max=salary_max,
-                        job_type=job_data.get('job_type', 'contract'),
-                        source=job_data['source'],
-                        source_url=job_data['source_url'],
-                        posted_date=job_data['posted_date'],
-                        is_corp_to_corp=ai_analysis.get('is_corp_to_corp', False),
-                        relevance_score=ai_analysis.get('relevance_score', 0.0),
-                        ai_analysis=json.dumps(ai_analysis),
-                        contact_email=job_data.get('contact_email'),
-                        contact_phone=job_data.get('contact_phone')
-                    )
-                    
-                    db.add(job)
-                    db.commit()
-                    
-                    results['new_jobs'] += 1
-                    if job.is_corp_to_corp:
-                        results['corp_to_corp_jobs'] += 1
-                    
-                except Exception as e:
-                    print(f"Error processing job: {e}")
-                    db.rollback()
+                if job_data.get('search_term') in term_fingerprints:
+                    term_fingerprints[job_data['search_term']].add(job_data['fingerprint'])
+            results['term_stats'] = query_planner.record(term_fingerprints)
+            results['shared_detail_fetches'] = self.engine.last_run_stats.get('shared_detail_fetches', 0)
+            
+            # Drop duplicates, including repeats within this run
+            new_jobs = []
+            seen_fingerprints = set(existing_fingerprints)
+            for job_data in all_jobs:
+                if job_data['fingerprint'] in seen_fingerprints:
+                    results['duplicates_filtered'] += 1
                     continue
+                seen_fingerprints.add(job_data['fingerprint'])
+                new_jobs.append(job_data)
+            
+            # AI analysis for all new jobs at once
+            analyses = analysis_stage.analyze(new_jobs)
+            results['analysis_seconds'] = analysis_stage.last_run_stats.get('seconds', 0.0)
+            
+            # Process and store jobs in batches
+            with JobIngestionPipeline(db) as pipeline:
+                for job_data, ai_analysis in zip(new_jobs, analyses):
+                    try:
+                        # Extract salary range
+                        salary_min, salary_max = ai_service.extract_salary_range(job_data['description'])
+                        
+                        pipeline.add(self._build_job_row(job_data, ai_analysis, salary_min, salary_max))
+                        
+                    except Exception as e:
+                        print(f"Error processing job: {e}")
+                        continue
+            
+            results['new_jobs'] = pipeline.stats['new_jobs']
+            results['corp_to_corp_jobs'] = pipeline.stats['corp_to_corp_jobs']
         
         finally:
             db.close()
         
         return results
     
-    def _is_duplicate_job(self, db: Session, job_data: Dict) -> bool:
+    def _build_job_row(self, job_data: Dict, ai_analysis: Dict, salary_min: Optional[float], salary_max: Optional[float]) -> Dict:
+        """
+        Build the Job column values for a scraped and analyzed job
+        """
+        return {
+            'title': job_data['title'],
+            'company': job_data['company'],
+            'location': job_data['location'],
+            'description': job_data['description'],
+            'requirements': job_data.get('requirements', ''),
+            'salary_min': salary_min,
+            'salary_max': salary_max,
+            'job_type': job_data.get('job_type', 'contract'),
+            'source': job_data['source'],
+            'source_url': job_data['source_url'],
+            'posted_date': job_data['posted_date'] or datetime.utcnow(),  # keyset pagination needs a value
+            'is_corp_to_corp': ai_analysis.get('is_corp_to_corp', False),
+            'relevance_score': ai_analysis.get('relevance_score') or 0.0,  # the model may reply null
+            'ai_analysis': json.dumps(ai_analysis),
+            'contact_email': job_data.get('contact_email'),
+            'contact_phone': job_data.get('contact_phone'),
+            'fingerprint': job_data['fingerprint']
+        }
+    
+    def _find_existing_fingerprints(self, db: Session, fingerprints: List[str]) -> set:
         """
-        Check if job already exists in database
+        Return the subset of fingerprints that already exist in the database
         """
-        # Create a hash of key job attributes
-        job_hash = hashlib.md5(
-            f"{job_data['title']}{job_data['company']}{job_data['location']}{job_data['source_url']}".encode()
-        ).hexdigest()
+        existing = set()
+        unique_fingerprints = list(set(fingerprints))
         
-        # Check if similar job exists
-        existing_job = db.query(Job).filter(
-            and_(
-                Job.title == job_data['title'],
-                Job.company == job_data['company'],
-                Job.location == job_data['location'],
-                Job.source_url == job_data['source_url']
+        # Chunk to stay under SQLite's bound-parameter limit
+        for i in range(0, len(unique_fingerprints), FINGERPRINT_LOOKUP_CHUNK_SIZE):
+            chunk = unique_fingerprints[i:i + FINGERPRINT_LOOKUP_CHUNK_SIZE]
+            existing.update(
+                fingerprint for (fingerprint,) in
+                db.query(Job.fingerprint).filter(Job.fingerprint.in_(chunk))
             )
-        ).first()
         
-        return existing_job is not None
+        return existing
+    
+    def _lookup_known_fingerprints(self, fingerprints: List[str]) -> set:
+        """
+        Stored subset of fingerprints, on a session of its own so scrapers
+        can call it from their worker threads
+        """
+        db = next(get_db())
+        try:
+            return self._find_existing_fingerprints(db, fingerprints)
+        finally:
+            db.close()
     
     def search_jobs(self, db: Session, search_params: JobSearchRequest) -> List[Job]:
         """
         Search jobs with various filters
         """
-        query = db.query(Job)
+        return self.search_jobs_page(db, search_params)[0]
+    
+    def list_jobs_page(self, db: Session, limit: int = 100, cursor: Optional[str] = None,
+                       fields: Optional[List[str]] = None) -> Tuple[List, Optional[str]]:
+        """
+        All jobs by relevance score, then posted date, one keyset page at a time.
+        With fields, rows are dicts of just those columns.
+        """
+        if fields is None:
+            return keyset_page(db.query(Job), RANK_KEYS, 'relevance', limit, cursor)
+        rows, next_cursor = keyset_page(self._projected_query(db, fields).add_columns(*RANK_KEYS), RANK_KEYS, 'relevance', limit, cursor)
+        return [self._projected_row(row, fields) for row in rows], next_cursor
+    
+    def list_jobs_offset(self, db: Session, skip: int, limit: int, fields: List[str]) -> List[Dict[str, Any]]:
+        """
+        Listing page by OFFSET, for clients still paging with skip
+        """
+        rows = self._projected_query(db, fields).order_by(*(desc(key) for key in RANK_KEYS)).offset(skip).limit(limit).all()
+        return [self._projected_row(row, fields) for row in rows]
+    
+    def _projected_query(self, db: Session, fields: List[str]):
+        return db.query(*(PROJECTABLE_COLUMNS[name].label(name) for name in fields))
+    
+    def _projected_row(self, row, fields: List[str]) -> Dict[str, Any]:
+        # Leading items are the projected fields; any sort keys follow
+        return dict(zip(fields, row))
+    
+    def search_jobs_page(self, db: Session, search_params: JobSearchRequest,
+                         fields: Optional[List[str]] = None) -> Tuple[List, Optional[str]]:
+        """
+        One page of search results plus the cursor for the next page (None on
+        the last). Results are Jobs, or dicts of just the given fields. Raises
+        InvalidCursor for a token from another search.
+        """
+        query = db.query(Job) if fields is None else self._projected_query(db, fields)
+        query, rank, snippets = self.filter_query(db, query, search_params)
+        
+        if rank is None:
+            # Order by relevance score and posted date
+            if fields is None:
+                return keyset_page(query, RANK_KEYS, 'relevance', search_params.limit, search_params.cursor)
+            rows, next_cursor = keyset_page(query.add_columns(*RANK_KEYS), RANK_KEYS, 'relevance', search_params.limit, search_params.cursor)
+            return [self._projected_row(row, fields) for row in rows], next_cursor
+        
+        # Text match blended with relevance score
+        text_weight = settings.SEARCH_TEXT_WEIGHT
+        search_score = text_weight * rank + (1 - text_weight) * func.coalesce(Job.relevance_score, 0.0)
+        keys = (search_score, Job.posted_date, Job.id)
+        kind = "search:" + " ".join(tokenize(search_params.keywords))
+        rows, next_cursor = keyset_page(query.add_columns(*keys), keys, kind, search_params.limit, search_params.cursor)
+        
+        # Highlighted snippets for the returned page only
+        highlighted = snippets([row[-1] for row in rows]) if rows else {}
+        
+        if fields is not None:
+            results = []
+            for row in rows:
+                result = self._projected_row(row, fields)
+                result['search_score'] = round(row[-3], 4)
+                result['snippet'] = highlighted.get(row[-1])
+                results.append(result)
+            return results, next_cursor
+        
+        jobs = []
+        for job, score, _, _ in rows:
+            job.search_score = round(score, 4)
+            job.snippet = highlighted.get(job.id)
+            jobs.append(job)
+        return jobs, next_cursor
+    
+    def filter_query(self, db: Session, query, filters: JobFilters):
+        """
+        Apply search/export filters to a Job (or Job column) query. Returns
+        (query, rank, snippets) as _apply_keyword_search does.
+        """
+        rank = snippets = None
         
         # Apply filters
-        if search_params.keywords:
-            keywords = search_params.keywords.lower()
-            query = query.filter(
-                or_(
-                    Job.title.ilike(f'%{keywords}%'),
-                    Job.description.ilike(f'%{keywords}%'),
-                    Job.requirements.ilike(f'%{keywords}%')
-                )
-            )
+        if filters.keywords:
+            query, rank, snippets = self._apply_keyword_search(db, query, filters.keywords)
         
-        if search_params.location:
-            query = query.filter(Job.location.ilike(f'%{search_params.location}%'))
+        if filters.location:
+            query = query.filter(Job.location.ilike(f'%{filters.location}%'))
         
-        if search_params.min_salary:
-            query = query.filter(Job.salary_min >= search_params.min_salary)
+        if filters.min_salary:
+            query = query.filter(Job.salary_min >= filters.min_salary)
         
-        if search_params.max_salary:
-            query = query.filter(Job.salary_max <= search_params.max_salary)
+        if filters.max_salary:
+            query = query.filter(Job.salary_max <= filters.max_salary)
         
-        if search_params.job_type:
-            query = query.filter(Job.job_type == search_params.job_type)
+        if filters.job_type:
+            query = query.filter(Job.job_type == filters.job_type)
         
-        if search_params.source:
-            query = query.filter(Job.source == search_params.source)
+        if filters.source:
+            query = query.filter(Job.source == filters.source)
         
-        if search_params.is_corp_to_corp is not None:
-            query = query.filter(Job.is_corp_to_corp == search_params.is_corp_to_corp)
+        if filters.is_corp_to_corp is not None:
+            query = query.filter(Job.is_corp_to_corp == filters.is_corp_to_corp)
         
-        if search_params.min_relevance_score:
-            query = query.filter(Job.relevance_score >= search_params.min_relevance_score)
+        if filters.min_relevance_score:
+            query = query.filter(Job.relevance_score >= filters.min_relevance_score)
         
-        if search_params.posted_within_hours:
-            cutoff_date = datetime.utcnow() - timedelta(hours=search_params.posted_within_hours)
+        if filters.posted_within_hours:
+            cutoff_date = datetime.utcnow() - timedelta(hours=filters.posted_within_hours)
             query = query.filter(Job.posted_date >= cutoff_date)
         
-        # Order by relevance score and posted date
-        query = query.order_by(desc(Job.relevance_score), desc(Job.posted_date))
-        
-        return query.limit(100).all()
+        return query, rank, snippets
     
-    def get_job_stats(self, db: Session) -> JobStats:
+    def _apply_keyword_search(self, db: Session, query, keywords: str):
         """
-        Get job statistics
+        Restrict a Job (or Job column) query to rows matching every keyword.
+
+        Uses the full-text index when there is one and returns the query with
+        a 0-1 text-match score plus a function giving {job id: highlighted
+        snippet} for a page of job ids; otherwise falls back to one LIKE
+        filter per term and returns (query, None, None).
         """
-        # Total jobs
-        total_jobs = db.query(Job).count()
-        
-        # Corp-to-corp jobs
-        corp_to_corp_jobs = db.query(Job).filter(Job.is_corp_to_corp == True).count()
-        
-        # Jobs in last 24 hours
-        last_24h = datetime.utcnow() - timedelta(hours=24)
-        jobs_last_24h = db.query(Job).filter(Job.posted_date >= last_24h).count()
+        tokens = tokenize(keywords)
+        if not tokens:
+            return query, None, None
         
-        # Average relevance score
-        avg_relevance = db.query(func.avg(Job.relevance_score)).scalar() or 0.0
-        
-        # Top companies
-        top_companies = db.query(
-            Job.company,
-            func.count(Job.id).label('job_count')
-        ).group_by(Job.company).order_by(desc('job_count')).limit(10).all()
+        bind = db.get_bind()
+        if settings.SEARCH_FULL_TEXT and has_search_index(bind):
+            if bind.dialect.name == 'sqlite':
+                match = build_match_query(keywords)
+                weights = ", ".join(str(weight) for weight in BM25_WEIGHTS)
+                matches = text(
+                    f"SELECT rowid AS job_id, bm25({FTS_TABLE}, {weights}) AS bm25 "
+                    f"FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH :match"
+                ).bindparams(match=match).columns(job_id=Integer, bm25=Float).subquery('matches')
+                query = query.join(matches, matches.c.job_id == Job.id)
+                # bm25() is negative, more negative is better; squash to 0-1
+                rank = -matches.c.bm25 / (1.0 - matches.c.bm25)
+                
+                def snippets(job_ids: List[int]) -> Dict[int, str]:
+                    rows = db.execute(
+                        text(
+                            f"SELECT rowid, snippet({FTS_TABLE}, -1, '<mark>', '</mark>', '…', :tokens) "
+                            f"FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH :match AND rowid IN :ids"
+                        ).bindparams(bindparam('ids', expanding=True)),
+                        {'match': match, 'tokens': settings.SEARCH_SNIPPET_TOKENS, 'ids': job_ids}
+                    )
+                    return dict(rows.all())
+                
+                return query, rank, snippets
+            
+            # Same expression as the GIN index so the planner can use it
+            document = func.to_tsvector('english', literal_column(POSTGRES_DOCUMENT))
+            ts_query = func.plainto_tsquery('english', " ".join(tokens))
+            query = query.filter(document.op('@@')(ts_query))
+            rank = func.ts_rank_cd(document, ts_query, 32)  # 32: rank / (rank + 1)
+            
+            def snippets(job_ids: List[int]) -> Dict[int, str]:
+                headline = func.ts_headline(
+                    'english', func.coalesce(Job.description, ''), ts_query,
+                    f"StartSel=<mark>, StopSel=</mark>, MaxWords={settings.SEARCH_SNIPPET_TOKENS}, MinWords=5"
+                )
+                return dict(db.query(Job.id, headline).filter(Job.id.in_(job_ids)).all())
+            
+            return query, rank, snippets
         
-        # Top locations
-        top_locations = db.query(
-            Job.location,
-            func.count(Job.id).label('job_count')
-        ).group_by(Job.location).order_by(desc('job_count')).limit(10).all()
+        for token in tokens:
+            query = query.filter(
+                or_(
+                    Job.title.ilike(f'%{token}%'),
+                    Job.description.ilike(f'%{token}%'),
+                    Job.requirements.ilike(f'%{token}%')
+                )
+            )
+        return query, None, None
+    
+    def get_job_stats(self, db: Session) -> JobStats:
+        """
+        Get job statistics from the rollups
+        """
+        totals = job_rollups.totals(db)
+        job_count = totals['job_count']
+        top_companies = job_rollups.top(db, 'company')
+        top_locations = job_rollups.top(db, 'location')
         
         return JobStats(
-            total_jobs=total_jobs,
-            corp_to_corp_jobs=corp_to_corp_jobs,
-            jobs_last_24h=jobs_last_24h,
-            avg_relevance_score=round(avg_relevance, 2),
+            total_jobs=job_count,
+            corp_to_corp_jobs=totals['corp_to_corp_count'],
+            jobs_last_24h=job_rollups.count_since(db, datetime.utcnow() - timedelta(hours=24)),
+            avg_relevance_score=round(totals['relevance_sum'] / job_count, 2) if job_count else 0.0,
             top_companies=[{'company': company, 'count': count} for company, count in top_companies],
             top_locations=[{'location': location, 'count': count} for location, count in top_locations]
         )
     
+    def get_trending(self, db: Session, days: int = 7) -> Dict[str, List[Dict]]:
+        """
+        Most common titles and companies among jobs posted in the last days
+        (whole UTC days), from the rollups
+        """
+        since = datetime.utcnow() - timedelta(days=days)
+        return {
+            'trending_titles': [{'title': title, 'count': count} for title, count in job_rollups.top(db, 'title', since=since)],
+            'trending_companies': [{'company': company, 'count': count} for company, count in job_rollups.top(db, 'company', since=since)]
+        }
+    
+    def get_salary_analytics(self, db: Session) -> Dict[str, List[Dict]]:
+        """
+        Average salary by job type and the salary_min distribution, from the rollups
+        """
+        return {
+            'salary_by_type': [
+                {'job_type': job_type, 'avg_min': avg_min, 'avg_max': avg_max}
+                for job_type, avg_min, avg_max in job_rollups.salary_by(db, 'job_type')
+            ],
+            'salary_distribution': [{'range': label, 'count': count} for label, count in job_rollups.salary_distribution(db)]
+        }
+    
     def update_job(self, db: Session, job_id: int, is_applied: bool = None, is_favorited: bool = None) -> Optional[Job]:
         """
         Update job status
@@ -236,6 +440,10 @@ class JobService:
         Delete jobs older than specified days
         """
         cutoff_date = datetime.utcnow() - timedelta(days=days_old)
+        db.query(JobLSHBucket).filter(
+            JobLSHBucket.job_id.in_(db.query(Job.id).filter(Job.posted_date < cutoff_date))
+        ).delete(synchronize_session=False)
+        job_rollups.remove_jobs(db, Job.posted_date < cutoff_date)
         deleted_count = db.query(Job).filter(Job.posted_date < cutoff_date).delete()
         db.commit()
         return deleted_count
@@ -5,6 +5,7 @@ from typing import List, Dict
 from sqlalchemy.orm import Session
 from app.models import Job, JobAlert, get_db
 from app.config import settings
+from app.utils.keyword_matcher import get_matcher
 from datetime import datetime, timedelta
 import json
 
@@ -208,12 +209,12 @@ This alert was sent because the job matches your keywords: {alert_keywords}
         Find jobs that match the alert criteria
         """
         matching_jobs = []
-        keywords = alert.keywords.lower().split()
+        matcher = get_matcher({'alert': alert.keywords.lower().split()})
         
         for job in jobs:
             # Check if job matches keywords
-            job_text = f"{job.title} {job.description} {job.requirements}".lower()
-            if any(keyword in job_text for keyword in keywords):
+            job_text = f"{job.title} {job.description} {job.requirements}"
+            if matcher.matches_any(job_text):
                 # Check location if specified
                 if alert.location and alert.location.lower() not in job.location.lower():
                     continue
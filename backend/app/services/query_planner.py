@@ -0,0 +1,135 @@
+import threading
+from collections import Counter
+from datetime import datetime, timedelta
+from itertools import combinations
+from typing import Any, Callable, Dict, List, Set
+from sqlalchemy.orm import Session
+from app.models import SearchTermStats, SessionLocal
+from app.config import settings
+
+# A term is due if its next run falls within this much of the cycle start,
+# so scheduler jitter does not push it back a whole cycle
+DUE_SLACK = timedelta(minutes=5)
+
+class QueryPlanner:
+    def __init__(self, session_factory: Callable[[], Session] = SessionLocal):
+        """
+        Decides which search terms to scrape each cycle.
+
+        After every cycle the fingerprints each term returned are compared:
+        a term's unique yield is the postings no other term found, its
+        overlap the share of its postings some other term also found. While a
+        term's average unique yield is below SCRAPING_TERM_MIN_UNIQUE_YIELD
+        its interval doubles after every run, up to
+        SCRAPING_TERM_MAX_INTERVAL_CYCLES; otherwise it runs every cycle.
+        """
+        self.session_factory = session_factory
+        self.last_pairwise_overlap: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def plan(self, terms: List[str], now: datetime = None) -> List[str]:
+        """
+        Terms due this cycle, in configured order; never empty if terms is not
+        """
+        now = now or datetime.utcnow()
+        db = self.session_factory()
+        try:
+            stats = {row.term: row for row in db.query(SearchTermStats).filter(SearchTermStats.term.in_(terms))}
+        except Exception as e:
+            print(f"Error loading search term stats: {str(e)}")
+            return list(terms)
+        finally:
+            db.close()
+
+        def next_due(term: str) -> datetime:
+            row = stats.get(term)
+            return row.next_due_at if row is not None and row.next_due_at else datetime.min
+
+        due = [term for term in terms if next_due(term) <= now + DUE_SLACK]
+        if not due and terms:
+            due = [min(terms, key=next_due)]
+        return due
+
+    def record(self, term_fingerprints: Dict[str, Set[str]], now: datetime = None) -> Dict[str, Dict[str, Any]]:
+        """
+        Update yield/overlap stats and next due time for the terms run this cycle
+        """
+        now = now or datetime.utcnow()
+        alpha = settings.SCRAPING_TERM_STATS_ALPHA
+        found_by = Counter(fingerprint for fingerprints in term_fingerprints.values() for fingerprint in fingerprints)
+
+        cycle = {}
+        for term, fingerprints in term_fingerprints.items():
+            unique = sum(1 for fingerprint in fingerprints if found_by[fingerprint] == 1)
+            cycle[term] = {
+                'results': len(fingerprints),
+                'unique': unique,
+                'overlap': round((len(fingerprints) - unique) / len(fingerprints), 4) if fingerprints else 0.0
+            }
+
+        with self._lock:
+            self.last_pairwise_overlap = {
+                f"{a} | {b}": round(len(term_fingerprints[a] & term_fingerprints[b]) / len(term_fingerprints[a] | term_fingerprints[b]), 4)
+                for a, b in combinations(sorted(term_fingerprints), 2)
+                if term_fingerprints[a] | term_fingerprints[b]
+            }
+
+        db = self.session_factory()
+        try:
+            for term, metrics in cycle.items():
+                row = db.get(SearchTermStats, term)
+                if row is None:
+                    row = SearchTermStats(term=term, runs=0, interval_cycles=1, avg_results=0.0, avg_unique=0.0, avg_overlap=0.0)
+                    db.add(row)
+                    weight = 1.0
+                else:
+                    weight = alpha
+
+                row.runs += 1
+                row.last_run_at = now
+                row.last_results = metrics['results']
+                row.last_unique = metrics['unique']
+                row.avg_results += weight * (metrics['results'] - row.avg_results)
+                row.avg_unique += weight * (metrics['unique'] - row.avg_unique)
+                row.avg_overlap += weight * (metrics['overlap'] - row.avg_overlap)
+
+                if row.avg_unique >= settings.SCRAPING_TERM_MIN_UNIQUE_YIELD:
+                    row.interval_cycles = 1
+                else:
+                    row.interval_cycles = min(row.interval_cycles * 2, settings.SCRAPING_TERM_MAX_INTERVAL_CYCLES)
+                row.next_due_at = now + timedelta(hours=row.interval_cycles * settings.SCRAPING_INTERVAL_HOURS)
+                metrics['interval_cycles'] = row.interval_cycles
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            print(f"Error recording search term stats: {str(e)}")
+        finally:
+            db.close()
+
+        return cycle
+
+    def get_stats(self) -> Dict[str, Any]:
+        db = self.session_factory()
+        try:
+            terms = [
+                {
+                    'term': row.term,
+                    'runs': row.runs,
+                    'interval_cycles': row.interval_cycles,
+                    'next_due_at': row.next_due_at,
+                    'last_results': row.last_results,
+                    'last_unique': row.last_unique,
+                    'avg_results': round(row.avg_results, 2),
+                    'avg_unique': round(row.avg_unique, 2),
+                    'avg_overlap': round(row.avg_overlap, 4)
+                }
+                for row in db.query(SearchTermStats).order_by(SearchTermStats.term)
+            ]
+        finally:
+            db.close()
+        with self._lock:
+            pairwise = dict(self.last_pairwise_overlap)
+        return {'terms': terms, 'last_cycle_pairwise_overlap': pairwise}
+
+# Create singleton instance
+query_planner = QueryPlanner()
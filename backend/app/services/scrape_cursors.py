@@ -0,0 +1,113 @@
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+from sqlalchemy.orm import Session
+from app.models import ScrapeCursor, SessionLocal
+
+class ScrapeCursorStore:
+    def __init__(self, session_factory: Callable[[], Session] = SessionLocal):
+        """
+        Persisted pagination state per (source, search query).
+
+        A run marks its cursor running and records every page it finishes,
+        so a run that dies or fails on a page leaves resume_page behind for
+        the next one. Finishing cleanly clears resume_page and moves the
+        high-water mark to the newest posting seen.
+        """
+        self.session_factory = session_factory
+
+    @staticmethod
+    def make_query(keywords: str, location: str) -> str:
+        return f"{keywords}|{location}"
+
+    def _get_or_create(self, db: Session, source: str, query: str) -> ScrapeCursor:
+        cursor = db.query(ScrapeCursor).filter(
+            ScrapeCursor.source == source, ScrapeCursor.query == query
+        ).first()
+        if cursor is None:
+            cursor = ScrapeCursor(source=source, query=query, pages_fetched=0)
+            db.add(cursor)
+        return cursor
+
+    def _update(self, source: str, query: str, **fields) -> Optional[Dict[str, Any]]:
+        db = self.session_factory()
+        try:
+            cursor = self._get_or_create(db, source, query)
+            for name, value in fields.items():
+                setattr(cursor, name, value)
+            cursor.updated_at = datetime.utcnow()
+            db.commit()
+            return self._as_dict(cursor)
+        except Exception as e:
+            db.rollback()
+            print(f"Error updating scrape cursor {source}/{query}: {str(e)}")
+            return None
+        finally:
+            db.close()
+
+    @staticmethod
+    def _as_dict(cursor: ScrapeCursor) -> Dict[str, Any]:
+        return {
+            'source': cursor.source,
+            'query': cursor.query,
+            'status': cursor.status,
+            'resume_page': cursor.resume_page,
+            'pages_fetched': cursor.pages_fetched,
+            'high_water_fingerprint': cursor.high_water_fingerprint,
+            'high_water_date': cursor.high_water_date,
+            'started_at': cursor.started_at,
+            'updated_at': cursor.updated_at,
+            'completed_at': cursor.completed_at
+        }
+
+    def start(self, source: str, query: str) -> Optional[Dict[str, Any]]:
+        """
+        Mark a run started and return the cursor as it was left by the last one
+        """
+        db = self.session_factory()
+        try:
+            cursor = self._get_or_create(db, source, query)
+            previous = self._as_dict(cursor)
+            cursor.status = 'running'
+            cursor.pages_fetched = 0
+            cursor.started_at = cursor.updated_at = datetime.utcnow()
+            db.commit()
+            return previous
+        except Exception as e:
+            db.rollback()
+            print(f"Error loading scrape cursor {source}/{query}: {str(e)}")
+            return None
+        finally:
+            db.close()
+
+    def advance(self, source: str, query: str, next_page: int, pages_fetched: int):
+        """
+        Record that every page before next_page has been fetched
+        """
+        self._update(source, query, resume_page=next_page, pages_fetched=pages_fetched)
+
+    def finish(self, source: str, query: str, newest: Optional[Dict] = None, interrupted_page: Optional[int] = None):
+        """
+        End a run. A run interrupted at a page keeps it as resume_page;
+        a complete one clears it and records the newest posting seen.
+        """
+        fields = {'completed_at': datetime.utcnow()}
+        if interrupted_page is not None:
+            fields.update(status='interrupted', resume_page=interrupted_page)
+        else:
+            fields.update(status='complete', resume_page=None)
+        if newest is not None:
+            fields.update(high_water_fingerprint=newest.get('fingerprint'), high_water_date=newest.get('posted_date'))
+        self._update(source, query, **fields)
+
+    def list_cursors(self) -> List[Dict[str, Any]]:
+        db = self.session_factory()
+        try:
+            return [
+                self._as_dict(cursor)
+                for cursor in db.query(ScrapeCursor).order_by(ScrapeCursor.source, ScrapeCursor.query)
+            ]
+        finally:
+            db.close()
+
+# Create singleton instance
+scrape_cursors = ScrapeCursorStore()
@@ -0,0 +1,184 @@
+from bisect import bisect_right
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence
+import numpy as np
+
+TEXT_SEPARATOR = "\x00"
+
+# Search a keyword only inside rows matched by one of its substrings when
+# fewer than this fraction of rows matched
+SPARSE_CANDIDATE_RATIO = 0.3
+
+class _Corpus:
+    """
+    Lowercased texts joined into one string so keyword scans run in C over
+    the whole batch instead of once per row
+    """
+    def __init__(self, texts: List[str]):
+        self.size = len(texts)
+        joined = TEXT_SEPARATOR.join(texts)
+        self.text = joined.lower()
+        if len(self.text) != len(joined):
+            # A few characters (e.g. U+0130) lowercase to two; fall back to
+            # per-row lowering so row offsets stay exact
+            texts = [text.lower() for text in texts]
+            self.text = TEXT_SEPARATOR.join(texts)
+        self.starts = []
+        offset = 0
+        for text in texts:
+            self.starts.append(offset)
+            offset += len(text) + 1
+        self._hits: Dict[str, List[int]] = {}
+
+    def rows_containing(self, keyword: str) -> List[int]:
+        """
+        Indices of rows containing keyword as a substring.
+
+        After a hit the search jumps to the next row, so the Python-level
+        work is bounded by the number of matching rows, not occurrences.
+        If a shorter keyword already scanned is a substring of this one and
+        matched few rows, only those rows are searched.
+        """
+        if keyword in self._hits:
+            return self._hits[keyword]
+        
+        candidates = None
+        for scanned, rows in self._hits.items():
+            if scanned in keyword and (candidates is None or len(rows) < len(candidates)):
+                candidates = rows
+        
+        if candidates is not None and len(candidates) < self.size * SPARSE_CANDIDATE_RATIO:
+            text, starts, last = self.text, self.starts, self.size - 1
+            hits = [
+                row for row in candidates
+                if text.find(keyword, starts[row], starts[row + 1] - 1 if row < last else len(text)) != -1
+            ]
+        else:
+            hits = []
+            if self.size:
+                position = self.text.find(keyword)
+                while position != -1:
+                    row = bisect_right(self.starts, position) - 1
+                    hits.append(row)
+                    if row + 1 >= self.size:
+                        break
+                    position = self.text.find(keyword, self.starts[row + 1])
+        
+        self._hits[keyword] = hits
+        return hits
+
+    def contains(self, keyword: str) -> np.ndarray:
+        """
+        Boolean mask of rows containing keyword as a substring
+        """
+        mask = np.zeros(self.size, dtype=bool)
+        mask[self.rows_containing(keyword)] = True
+        return mask
+
+    def count_keywords(self, keywords: Sequence[str]) -> np.ndarray:
+        counts = np.zeros(self.size, dtype=np.int64)
+        # Shorter keywords first so longer ones can reuse their hits
+        for keyword in sorted(keywords, key=len):
+            counts += self.contains(keyword)
+        return counts
+
+    def contains_any(self, keywords: Sequence[str]) -> np.ndarray:
+        mask = np.zeros(self.size, dtype=bool)
+        for keyword in sorted(keywords, key=len):
+            mask |= self.contains(keyword)
+        return mask
+
+class BatchRelevanceScorer:
+    def __init__(self, scorer):
+        # The JobRelevanceScorer whose skills, keywords and weights are used
+        self.scorer = scorer
+
+    def score(
+        self,
+        titles: Sequence[Optional[str]],
+        descriptions: Sequence[Optional[str]],
+        requirements: Sequence[Optional[str]],
+        locations: Sequence[Optional[str]],
+        posted_dates: Sequence[Optional[datetime]],
+        salary_min: Sequence[Optional[float]],
+        is_corp_to_corp: Sequence[Optional[bool]],
+        user_skills: List[str] = None,
+        now: datetime = None
+    ) -> Dict[str, np.ndarray]:
+        """
+        Score a batch of jobs given as columns.
+
+        Returns the five component scores and the weighted 'total', each as
+        a float64 array. Results are identical to
+        JobRelevanceScorer.score_job_relevance for the same now.
+        """
+        scorer = self.scorer
+        if user_skills is None:
+            user_skills = scorer.tech_skills[:10]
+        now = now or datetime.utcnow()
+
+        # Same text the scalar path builds, including "None" for missing fields
+        skill_corpus = _Corpus([
+            f"{title} {description} {requirement}"
+            for title, description, requirement in zip(titles, descriptions, requirements)
+        ])
+        contract_corpus = _Corpus([f"{title} {description}" for title, description in zip(titles, descriptions)])
+        location_corpus = _Corpus([location or "" for location in locations])
+
+        scores = {
+            'skill_match': self._skill_match(skill_corpus, user_skills),
+            'contract_type': self._contract_type(contract_corpus, is_corp_to_corp),
+            'location_preference': self._location(location_corpus),
+            'recency': self._recency(posted_dates, now),
+            'salary_range': self._salary(salary_min)
+        }
+
+        total = np.zeros(skill_corpus.size)
+        for key in scores:
+            total = total + scores[key] * scorer.weights[key]
+        scores['total'] = np.minimum(1.0, total)
+        return scores
+
+    def _skill_match(self, corpus: _Corpus, user_skills: List[str]) -> np.ndarray:
+        return corpus.count_keywords([skill.lower() for skill in user_skills]) / len(user_skills)
+
+    def _contract_type(self, corpus: _Corpus, is_corp_to_corp: Sequence[Optional[bool]]) -> np.ndarray:
+        mentions = corpus.count_keywords(self.scorer.contract_keywords)
+        c2c = np.array([bool(value) for value in is_corp_to_corp], dtype=bool)
+        return np.where(c2c, 1.0, np.minimum(1.0, mentions / 3))
+
+    def _location(self, corpus: _Corpus) -> np.ndarray:
+        preferred = corpus.contains_any(self.scorer.preferred_locations)
+        us = corpus.contains_any(self.scorer.us_location_indicators)
+        return np.select([preferred, us], [1.0, 0.8], default=0.5)
+
+    def _recency(self, posted_dates: Sequence[Optional[datetime]], now: datetime) -> np.ndarray:
+        if isinstance(posted_dates, np.ndarray) and posted_dates.dtype.kind == 'M':
+            missing = np.isnat(posted_dates)
+            # Floor division matches timedelta.days, including for future dates
+            delta = np.datetime64(now, 'us') - posted_dates.astype('datetime64[us]')
+            days_old = np.where(missing, 0, delta // np.timedelta64(1, 'D'))
+        else:
+            # Converting datetime objects to datetime64 costs more than this
+            missing = np.array([posted is None for posted in posted_dates], dtype=bool)
+            days_old = np.array(
+                [(now - posted).days if posted is not None else 0 for posted in posted_dates],
+                dtype=np.int64
+            )
+        return np.select(
+            [missing, days_old == 0, days_old <= 3, days_old <= 7, days_old <= 14],
+            [0.5, 1.0, 0.8, 0.6, 0.4],
+            default=0.2
+        )
+    
+    def _salary(self, salary_min: Sequence[Optional[float]]) -> np.ndarray:
+        if isinstance(salary_min, np.ndarray):
+            salary = salary_min.astype(np.float64)
+        else:
+            salary = np.array([np.nan if value is None else value for value in salary_min], dtype=np.float64)
+        missing = np.isnan(salary) | (salary == 0)
+        return np.select(
+            [missing, salary >= 100000, salary >= 80000, salary >= 60000],
+            [0.5, 1.0, 0.8, 0.6],
+            default=0.4
+        )
@@ -1,12 +1,27 @@
 import hashlib
+import json
+import sys
+import time
+import zlib
+from array import array
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional
+from sqlalchemy import or_, update
 from sqlalchemy.orm import Session
 from app.models import Job, get_db
+from app.utils.near_duplicates import near_duplicate_index
+from app.services.job_rollups import job_rollups
+from app.utils.batch_scoring import BatchRelevanceScorer
+from app.utils.keyword_matcher import get_matcher
+from app.config import settings
+
+# sys.getsizeof of a 16-byte bytes object
+SIGNATURE_OBJECT_BYTES = sys.getsizeof(bytes(16))
 
 class JobDuplicateDetector:
     def __init__(self):
         self.similarity_threshold = 0.8
+        self.last_run_stats = {}
     
     def is_duplicate(self, db: Session, job_data: Dict) -> bool:
         """
@@ -26,18 +41,40 @@ class JobDuplicateDetector:
         """
         Check for exact matches
         """
-        existing_job = db.query(Job).filter(
-            Job.title == job_data['title'],
-            Job.company == job_data['company'],
-            Job.location == job_data['location'],
-            Job.source_url == job_data['source_url']
-        ).first()
+        fingerprint = Job.compute_fingerprint(
+            job_data['title'], job_data['company'], job_data['location'], job_data['source_url']
+        )
+        existing_job = db.query(Job.id).filter(Job.fingerprint == fingerprint).first()
         
         return existing_job is not None
     
     def _similar_job_exists(self, db: Session, job_data: Dict) -> bool:
         """
-        Check for similar jobs using fuzzy matching
+        Check for similar jobs using fuzzy matching.
+        
+        The MinHash/LSH index narrows the search to jobs sharing an LSH band
+        with job_data; only those candidates are scored exactly.
+        """
+        candidate_ids = near_duplicate_index.candidate_ids(db, job_data)
+        if not candidate_ids:
+            return False
+        
+        recent_date = datetime.utcnow() - timedelta(days=7)
+        candidates = db.query(Job).filter(
+            Job.id.in_(candidate_ids),
+            Job.company == job_data['company'],
+            Job.posted_date >= recent_date
+        ).all()
+        
+        return any(
+            self._calculate_similarity(job_data, job) > self.similarity_threshold
+            for job in candidates
+        )
+    
+    def _similar_job_exists_scan(self, db: Session, job_data: Dict) -> bool:
+        """
+        Check for similar jobs by scoring every recent job from the same
+        company. Reference implementation for the LSH path.
         """
         # Get jobs from same company posted in last 7 days
         recent_date = datetime.utcnow() - timedelta(days=7)
@@ -90,34 +127,62 @@ class JobDuplicateDetector:
         
         return len(intersection) / len(union)
     
-    def remove_duplicates(self, db: Session) -> int:
+    def remove_duplicates(self, db: Session, chunk_size: int = None) -> int:
         """
-        Remove duplicate jobs from database
+        Remove duplicate jobs from database, keeping the most recent posting.
+        
+        Streams only the signature columns in chunks and keeps a set of
+        16-byte digests, then deletes the losers in bulk batches. Run stats
+        are stored in last_run_stats.
         """
-        # Get all jobs ordered by date
-        jobs = db.query(Job).order_by(Job.posted_date.desc()).all()
+        chunk_size = chunk_size or settings.DEDUP_CHUNK_SIZE
+        start = time.perf_counter()
+        
+        # Stream signature columns ordered by date, newest first
+        rows = db.query(Job.id, Job.title, Job.company, Job.location).order_by(
+            Job.posted_date.desc()
+        ).execution_options(yield_per=chunk_size)
         
         seen_jobs = set()
-        duplicates_removed = 0
+        duplicate_ids = array('q')
+        rows_scanned = 0
         
-        for job in jobs:
+        for job in rows:
+            rows_scanned += 1
             job_signature = self._create_job_signature(job)
             
             if job_signature in seen_jobs:
-                db.delete(job)
-                duplicates_removed += 1
+                duplicate_ids.append(job.id)
             else:
                 seen_jobs.add(job_signature)
         
-        db.commit()
+        # Delete losers after the scan so the open cursor never sees its own deletes
+        for i in range(0, len(duplicate_ids), chunk_size):
+            batch = duplicate_ids[i:i + chunk_size].tolist()
+            near_duplicate_index.remove_jobs(db, batch)
+            job_rollups.remove_jobs(db, Job.id.in_(batch))
+            db.query(Job).filter(Job.id.in_(batch)).delete(synchronize_session=False)
+            db.commit()
+        
+        elapsed = time.perf_counter() - start
+        duplicates_removed = len(duplicate_ids)
+        self.last_run_stats = {
+            'rows_scanned': rows_scanned,
+            'duplicates_removed': duplicates_removed,
+            'seconds': round(elapsed, 3),
+            'rows_per_second': round(rows_scanned / elapsed) if elapsed else 0,
+            'signature_set_bytes': sys.getsizeof(seen_jobs) + len(seen_jobs) * SIGNATURE_OBJECT_BYTES
+        }
         return duplicates_removed
     
-    def _create_job_signature(self, job: Job) -> str:
+    def _create_job_signature(self, job: Job) -> bytes:
         """
-        Create a unique signature for a job
+        Create a compact (16-byte) unique signature for a job
         """
-        signature_text = f"{job.title.lower().strip()}{job.company.lower().strip()}{job.location.lower().strip()}"
-        return hashlib.md5(signature_text.encode()).hexdigest()
+        # Streamed rows carry raw columns, any of which may be NULL
+        title, company, location = (value or '' for value in (job.title, job.company, job.location))
+        signature_text = f"{title.lower().strip()}{company.lower().strip()}{location.lower().strip()}"
+        return hashlib.md5(signature_text.encode()).digest()
 
 class JobRelevanceScorer:
     def __init__(self):
@@ -140,8 +205,36 @@ class JobRelevanceScorer:
             'contract', 'contractor', 'consulting', 'freelance', 'temporary',
             'corp to corp', 'c2c', '1099', 'w2', 'independent contractor'
         ]
+        
+        self.preferred_locations = ['remote', 'anywhere', 'usa']
+        self.us_location_indicators = ['ny', 'ca', 'tx', 'fl', 'il', 'pa', 'oh', 'ga', 'nc', 'mi']
+        
+        self.weights = {
+            'skill_match': 0.4,
+            'contract_type': 0.25,
+            'location_preference': 0.15,
+            'recency': 0.1,
+            'salary_range': 0.1
+        }
+        
+        # Job age in days at which _score_recency moves to the next bucket
+        self.recency_boundaries_days = [0, 1, 4, 8, 15]
+        
+        self.last_run_stats = {}
+    
+    @property
+    def config_version(self) -> int:
+        """
+        Version of the scoring configuration; changes whenever any input
+        other than the clock would change a stored score
+        """
+        config = [
+            self.tech_skills[:10], self.contract_keywords, self.preferred_locations,
+            self.us_location_indicators, sorted(self.weights.items()), self.recency_boundaries_days
+        ]
+        return zlib.crc32(json.dumps(config).encode())
     
-    def score_job_relevance(self, job: Job, user_skills: List[str] = None) -> float:
+    def score_job_relevance(self, job: Job, user_skills: List[str] = None, now: datetime = None) -> float:
         """
         Score job relevance based on multiple factors
         """
@@ -152,32 +245,39 @@ class JobRelevanceScorer:
             'skill_match': self._score_skill_match(job, user_skills),
             'contract_type': self._score_contract_type(job),
             'location_preference': self._score_location(job),
-            'recency': self._score_recency(job),
+            'recency': self._score_recency(job, now),
             'salary_range': self._score_salary(job)
         }
         
         # Weighted average
-        weights = {
-            'skill_match': 0.4,
-            'contract_type': 0.25,
-            'location_preference': 0.15,
-            'recency': 0.1,
-            'salary_range': 0.1
-        }
-        
-        total_score = sum(scores[key] * weights[key] for key in scores)
+        total_score = sum(scores[key] * self.weights[key] for key in scores)
         return min(1.0, total_score)
     
+    def score_batch(self, jobs: List, user_skills: List[str] = None, now: datetime = None) -> Dict:
+        """
+        Score many jobs at once with vectorized NumPy operations; see
+        BatchRelevanceScorer.score for the column-based API
+        """
+        return BatchRelevanceScorer(self).score(
+            [job.title for job in jobs],
+            [job.description for job in jobs],
+            [job.requirements for job in jobs],
+            [job.location for job in jobs],
+            [job.posted_date for job in jobs],
+            [job.salary_min for job in jobs],
+            [job.is_corp_to_corp for job in jobs],
+            user_skills=user_skills,
+            now=now
+        )
+    
     def _score_skill_match(self, job: Job, user_skills: List[str]) -> float:
         """
         Score based on skill match
         """
-        job_text = f"{job.title} {job.description} {job.requirements}".lower()
+        job_text = f"{job.title} {job.description} {job.requirements}"
+        hits = get_matcher({'skill': user_skills}).find(job_text).get('skill', set())
         
-        matched_skills = 0
-        for skill in user_skills:
-            if skill.lower() in job_text:
-                matched_skills += 1
+        matched_skills = sum(1 for skill in user_skills if skill.lower() in hits)
         
         return matched_skills / len(user_skills)
     
@@ -188,8 +288,9 @@ class JobRelevanceScorer:
         if job.is_corp_to_corp:
             return 1.0
         
-        job_text = f"{job.title} {job.description}".lower()
-        contract_mentions = sum(1 for keyword in self.contract_keywords if keyword in job_text)
+        job_text = f"{job.title} {job.description}"
+        hits = get_matcher({'contract': self.contract_keywords}).find(job_text).get('contract', set())
+        contract_mentions = sum(1 for keyword in self.contract_keywords if keyword in hits)
         
         return min(1.0, contract_mentions / 3)
     
@@ -200,24 +301,23 @@ class JobRelevanceScorer:
         location_text = job.location.lower()
         
         # Preferred locations
-        if any(loc in location_text for loc in ['remote', 'anywhere', 'usa']):
+        if any(loc in location_text for loc in self.preferred_locations):
             return 1.0
         
         # US states/cities
-        us_indicators = ['ny', 'ca', 'tx', 'fl', 'il', 'pa', 'oh', 'ga', 'nc', 'mi']
-        if any(state in location_text for state in us_indicators):
+        if any(state in location_text for state in self.us_location_indicators):
             return 0.8
         
         return 0.5
     
-    def _score_recency(self, job: Job) -> float:
+    def _score_recency(self, job: Job, now: datetime = None) -> float:
         """
         Score based on how recent the job posting is
         """
         if not job.posted_date:
             return 0.5
         
-        days_old = (datetime.utcnow() - job.posted_date).days
+        days_old = ((now or datetime.utcnow()) - job.posted_date).days
         
         if days_old == 0:
             return 1.0
@@ -247,21 +347,80 @@ class JobRelevanceScorer:
         else:
             return 0.4
     
-    def update_all_job_scores(self, db: Session) -> int:
+    def _score_expires_at(self, posted_date: Optional[datetime], now: datetime) -> Optional[datetime]:
         """
-        Update relevance scores for all jobs
+        When the job's recency bucket next changes, or None if it never will
         """
-        jobs = db.query(Job).all()
-        updated_count = 0
+        if not posted_date:
+            return None
+        for days in self.recency_boundaries_days:
+            boundary = posted_date + timedelta(days=days)
+            if boundary > now:
+                return boundary
+        return None
+    
+    def update_job_scores(self, db: Session, force: bool = False, batch_size: int = None) -> int:
+        """
+        Re-score only jobs whose score can have changed: never scored, scored
+        under an older config version, or past their next recency boundary.
+        Changes are written with bulk UPDATEs, one transaction per batch.
+        """
+        batch_size = batch_size or settings.RESCORE_BATCH_SIZE
+        now = datetime.utcnow()
+        version = self.config_version
+        
+        needs_rescore = or_(
+            Job.score_version.is_(None),
+            Job.score_version != version,
+            Job.score_expires_at <= now
+        )
         
-        for job in jobs:
-            new_score = self.score_job_relevance(job)
-            if abs(job.relevance_score - new_score) > 0.1:  # Only update if significant change
-                job.relevance_score = new_score
-                updated_count += 1
+        rows_checked = 0
+        updated_count = 0
+        last_id = 0
+        
+        while True:
+            query = db.query(
+                Job.id, Job.title, Job.description, Job.requirements, Job.location,
+                Job.posted_date, Job.salary_min, Job.is_corp_to_corp, Job.relevance_score
+            ).filter(Job.id > last_id)
+            if not force:
+                query = query.filter(needs_rescore)
+            jobs = query.order_by(Job.id).limit(batch_size).all()
+            if not jobs:
+                break
+            
+            new_scores = self.score_batch(jobs, now=now)['total']
+            
+            updates = []
+            relevance_changes = {}
+            for job, new_score in zip(jobs, new_scores.tolist()):
+                values = {
+                    'id': job.id,
+                    'score_version': version,
+                    'scored_at': now,
+                    'score_expires_at': self._score_expires_at(job.posted_date, now)
+                }
+                if abs((job.relevance_score or 0.0) - new_score) > 0.1:  # Only update if significant change
+                    values['relevance_score'] = new_score
+                    relevance_changes[job.id] = new_score - (job.relevance_score or 0.0)
+                    updated_count += 1
+                updates.append(values)
+            
+            db.execute(update(Job), updates)
+            job_rollups.update_relevance(db, relevance_changes)
+            db.commit()
+            rows_checked += len(jobs)
+            last_id = jobs[-1].id
         
-        db.commit()
+        self.last_run_stats = {'rows_checked': rows_checked, 'scores_changed': updated_count}
         return updated_count
+    
+    def update_all_job_scores(self, db: Session) -> int:
+        """
+        Update relevance scores for all jobs
+        """
+        return self.update_job_scores(db, force=True)
 
 # Create singleton instances
 duplicate_detector = JobDuplicateDetector()
@@ -0,0 +1,77 @@
+from functools import lru_cache
+from typing import Dict, Iterable, Set, Tuple
+
+try:
+    import ahocorasick
+except ImportError:  # pragma: no cover - exercised only without pyahocorasick
+    ahocorasick = None
+
+MATCHER_CACHE_SIZE = 64
+
+class KeywordMatcher:
+    def __init__(self, vocabulary: Dict[str, Iterable[str]], use_automaton: bool = True):
+        """
+        Compile a {category: keywords} vocabulary for case-insensitive
+        substring matching.
+
+        With pyahocorasick installed the keywords are compiled into one
+        Aho–Corasick automaton and every text is scanned once for all of
+        them. Without it each keyword is checked with a C-level substring
+        search, which gives the same results.
+        """
+        categories: Dict[str, Set[str]] = {}
+        for category, keywords in vocabulary.items():
+            for keyword in keywords:
+                categories.setdefault(keyword.lower(), set()).add(category)
+        self.categories = {keyword: tuple(found) for keyword, found in categories.items()}
+
+        self.automaton = None
+        if use_automaton and ahocorasick is not None and self.categories:
+            self.automaton = ahocorasick.Automaton()
+            for keyword, categories in self.categories.items():
+                self.automaton.add_word(keyword, (keyword, categories))
+            self.automaton.make_automaton()
+
+    def find(self, text: str) -> Dict[str, Set[str]]:
+        """
+        Return {category: matched keywords} for every keyword occurring in text
+        """
+        hits: Dict[str, Set[str]] = {}
+        if not text:
+            return hits
+        text = text.lower()
+
+        if self.automaton is not None:
+            matches = {value for _, value in self.automaton.iter(text)}
+        else:
+            matches = {
+                (keyword, categories) for keyword, categories in self.categories.items()
+                if keyword in text
+            }
+
+        for keyword, categories in matches:
+            for category in categories:
+                hits.setdefault(category, set()).add(keyword)
+        return hits
+
+    def matches_any(self, text: str, category: str = None) -> bool:
+        """
+        Check whether text contains any keyword (of category, if given)
+        """
+        hits = self.find(text)
+        return bool(hits.get(category) if category else hits)
+
+def _vocabulary_key(vocabulary: Dict[str, Iterable[str]]) -> Tuple:
+    return tuple(sorted((category, tuple(keywords)) for category, keywords in vocabulary.items()))
+
+@lru_cache(maxsize=MATCHER_CACHE_SIZE)
+def _cached_matcher(key: Tuple) -> KeywordMatcher:
+    return KeywordMatcher({category: keywords for category, keywords in key})
+
+def get_matcher(vocabulary: Dict[str, Iterable[str]]) -> KeywordMatcher:
+    """
+    Get the compiled matcher for a vocabulary. Matchers are cached by the
+    vocabulary's contents, so a change to e.g. settings.CORP_TO_CORP_KEYWORDS
+    builds a new one on next use and unchanged lists are never recompiled.
+    """
+    return _cached_matcher(_vocabulary_key(vocabulary))
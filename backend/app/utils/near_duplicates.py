@@ -0,0 +1,120 @@
+import hashlib
+import zlib
+from typing import Dict, Iterable, List, Optional, Set
+import numpy as np
+from sqlalchemy.orm import Session
+from app.models import Job, JobLSHBucket
+from app.config import settings
+
+MERSENNE_PRIME = (1 << 31) - 1
+REBUILD_CHUNK_SIZE = 1000
+
+class MinHashLSH:
+    def __init__(self, num_perm: int = None, bands: int = None, seed: int = 42):
+        self.num_perm = num_perm or settings.NEAR_DUPLICATE_NUM_PERM
+        self.bands = bands or settings.NEAR_DUPLICATE_BANDS
+        if self.num_perm % self.bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.rows = self.num_perm // self.bands
+
+        # Universal hash functions h(x) = (a * x + b) mod p. With a, b < 2^31
+        # and x < 2^32 the product stays below 2^63, so uint64 never overflows.
+        rng = np.random.RandomState(seed)
+        self.a = rng.randint(1, MERSENNE_PRIME, size=(self.num_perm, 1)).astype(np.uint64)
+        self.b = rng.randint(0, MERSENNE_PRIME, size=(self.num_perm, 1)).astype(np.uint64)
+
+    def shingles(self, title: Optional[str], location: Optional[str], description: Optional[str]) -> Set[str]:
+        """
+        Word shingles over the same fields JobDuplicateDetector compares
+        """
+        shingles = set()
+        for prefix, text in (('t', title), ('l', location), ('d', (description or "")[:200])):
+            shingles.update(f"{prefix}:{word}" for word in (text or "").lower().split())
+        return shingles
+
+    def signature(self, shingles: Iterable[str]) -> Optional[np.ndarray]:
+        """
+        MinHash signature of a shingle set, or None for an empty set
+        """
+        hashes = np.fromiter((zlib.crc32(s.encode()) for s in shingles), dtype=np.uint64)
+        if not hashes.size:
+            return None
+        return ((self.a * hashes[np.newaxis, :] + self.b) % MERSENNE_PRIME).min(axis=1)
+
+    def bucket_keys(self, signature: np.ndarray) -> List[int]:
+        """
+        One signed 64-bit bucket key per band; the band number is part of the
+        key so equal slices in different bands never collide
+        """
+        keys = []
+        for band in range(self.bands):
+            band_slice = signature[band * self.rows:(band + 1) * self.rows]
+            digest = hashlib.blake2b(band.to_bytes(2, 'little') + band_slice.tobytes(), digest_size=8).digest()
+            keys.append(int.from_bytes(digest, 'little', signed=True))
+        return keys
+
+    def job_bucket_keys(self, title: Optional[str], location: Optional[str], description: Optional[str]) -> List[int]:
+        signature = self.signature(self.shingles(title, location, description))
+        return self.bucket_keys(signature) if signature is not None else []
+
+class NearDuplicateIndex:
+    def __init__(self):
+        self.lsh = MinHashLSH()
+
+    def add_jobs(self, db: Session, jobs: Iterable) -> int:
+        """
+        Index jobs (anything with id, title, location and description
+        attributes or keys). The caller commits.
+        """
+        rows = []
+        for job in jobs:
+            get = job.get if isinstance(job, dict) else lambda key: getattr(job, key)
+            for bucket in self.lsh.job_bucket_keys(get('title'), get('location'), get('description')):
+                rows.append({'job_id': get('id'), 'bucket': bucket})
+
+        if rows:
+            db.bulk_insert_mappings(JobLSHBucket, rows)
+        return len(rows)
+
+    def remove_jobs(self, db: Session, job_ids: List[int]):
+        """
+        Drop index entries for deleted jobs. The caller commits.
+        """
+        if job_ids:
+            db.query(JobLSHBucket).filter(JobLSHBucket.job_id.in_(job_ids)).delete(synchronize_session=False)
+
+    def candidate_ids(self, db: Session, job_data: Dict) -> Set[int]:
+        """
+        Ids of indexed jobs sharing at least one LSH band with job_data
+        """
+        keys = self.lsh.job_bucket_keys(job_data.get('title'), job_data.get('location'), job_data.get('description'))
+        if not keys:
+            return set()
+        return {
+            job_id for (job_id,) in
+            db.query(JobLSHBucket.job_id).filter(JobLSHBucket.bucket.in_(keys)).distinct()
+        }
+
+    def rebuild(self, db: Session) -> int:
+        """
+        Rebuild the whole index from the jobs table in id chunks
+        """
+        db.query(JobLSHBucket).delete(synchronize_session=False)
+        indexed = 0
+        last_id = 0
+
+        while True:
+            jobs = db.query(Job.id, Job.title, Job.location, Job.description).filter(
+                Job.id > last_id
+            ).order_by(Job.id).limit(REBUILD_CHUNK_SIZE).all()
+            if not jobs:
+                break
+            self.add_jobs(db, jobs)
+            indexed += len(jobs)
+            last_id = jobs[-1].id
+
+        db.commit()
+        return indexed
+
+# Create singleton instance
+near_duplicate_index = NearDuplicateIndex()
@@ -0,0 +1,72 @@
+"""
+Keyset (cursor) pagination.
+
+A page is read with WHERE (k1, k2, ...) < (last row's keys) ORDER BY
+k1 DESC, k2 DESC, ... LIMIT n, so with a matching index every page costs
+the same however deep it is. The last row's keys travel to the client as an
+opaque, URL-safe continuation token.
+"""
+import base64
+import json
+from datetime import datetime
+from typing import Any, List, Optional, Sequence, Tuple
+from sqlalchemy import desc, tuple_
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import Query
+
+class InvalidCursor(ValueError):
+    pass
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {'dt': value.isoformat()}
+    return value
+
+def _decode_value(value: Any) -> Any:
+    if isinstance(value, dict) and 'dt' in value:
+        return datetime.fromisoformat(value['dt'])
+    return value
+
+def encode_cursor(values: Sequence[Any], kind: str) -> str:
+    """
+    Token for the row with these sort key values; kind ties it to one ordering
+    """
+    payload = json.dumps({'k': kind, 'v': [_encode_value(value) for value in values]}, separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+def decode_cursor(token: str, kind: str, size: int) -> List[Any]:
+    """
+    Sort key values from a token; raises InvalidCursor if it is malformed or
+    was issued for another ordering
+    """
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(token + '=' * (-len(token) % 4)))
+        values = [_decode_value(value) for value in payload['v']]
+        matches = payload['k'] == kind and len(values) == size
+    except (ValueError, TypeError, KeyError) as e:
+        raise InvalidCursor(f"Malformed cursor: {e}") from e
+    if not matches:
+        raise InvalidCursor("Cursor does not belong to this query")
+    return values
+
+def keyset_page(query: Query, keys: Sequence, kind: str, limit: int, cursor: Optional[str] = None) -> Tuple[List, Optional[str]]:
+    """
+    One page of query in descending order of keys (column expressions,
+    unique together), starting after cursor. Rows may be ORM objects or
+    tuples whose trailing items are the key values, as added with
+    query.add_columns(*keys). Returns (rows, next cursor or None).
+    """
+    if cursor:
+        query = query.filter(tuple_(*keys) < tuple_(*decode_cursor(cursor, kind, len(keys))))
+
+    rows = query.order_by(*(desc(key) for key in keys)).limit(limit + 1).all()
+    if len(rows) <= limit:
+        return rows, None
+
+    rows = rows[:limit]
+    return rows, encode_cursor(_key_values(rows[-1], keys), kind)
+
+def _key_values(row, keys: Sequence) -> List[Any]:
+    if isinstance(row, Row):
+        return list(row[-len(keys):])
+    return [getattr(row, key.key) for key in keys]
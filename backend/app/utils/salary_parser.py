@@ -0,0 +1,165 @@
+import re
+from typing import Iterator, List, NamedTuple, Optional
+
+# Paid periods per year, assuming 40 hours/week and 52 weeks/year
+PERIODS_PER_YEAR = {
+    'hour': 2080,
+    'day': 260,
+    'week': 52,
+    'month': 12,
+    'year': 1
+}
+
+PERIOD_ALIASES = {
+    'hour': 'hour', 'hr': 'hour', 'h': 'hour', 'hourly': 'hour',
+    'day': 'day', 'daily': 'day',
+    'week': 'week', 'wk': 'week', 'weekly': 'week',
+    'month': 'month', 'mo': 'month', 'monthly': 'month',
+    'year': 'year', 'yr': 'year', 'annum': 'year', 'annually': 'year', 'yearly': 'year', 'annual': 'year'
+}
+
+# Plausible annualized bounds; anything outside is not a salary
+MIN_ANNUAL = 10000
+MAX_ANNUAL = 1000000
+
+# Without a stated period, amounts below this are taken as hourly rates
+HOURLY_CEILING = 500
+
+# How far around a match to look for a C2C/W2/1099 qualifier
+QUALIFIER_WINDOW = 40
+
+_SEPARATOR = r'\s*(?:-|–|—|to)\s*'
+_NUMBER = r'\d[\d,]*(?:\.\d+)?'
+_THOUSANDS = r'\s?(?:k|thousand)\b'
+
+def _amount(name: str) -> str:
+    return (
+        rf'(?P<{name}_cur>\$|usd\s?)?\s?'
+        rf'(?P<{name}>\d{{1,3}}(?:,\d{{3}})+(?:\.\d+)?|\d+(?:\.\d+)?)'
+        rf'\s?(?P<{name}_k>k\b|thousand\b)?'
+    )
+
+# Cheap checks before the full match: a match starts at "$", "usd" or a
+# digit that is not inside a word or number, and is either in dollars or
+# a range with a k/thousand suffix. Bare numbers ("3-5 years", "401k")
+# fail here instead of in Python.
+_GATE = (
+    r'(?=[$\du])(?:(?=\$|usd)|(?<![\w.,]))'
+    rf'(?=\$|usd|{_NUMBER}(?:{_THOUSANDS})?{_SEPARATOR}(?:\$|usd\s?)?{_NUMBER}{_THOUSANDS}'
+    rf'|{_NUMBER}{_THOUSANDS}{_SEPARATOR}\d|{_NUMBER}{_SEPARATOR}(?:\$|usd))'
+)
+
+_PERIOD_WORDS = '|'.join(sorted(PERIOD_ALIASES, key=len, reverse=True))
+
+def _period(name: str) -> str:
+    return rf'(?:\s*(?:/|per\b|an\b|a\b)?\s*(?P<{name}>{_PERIOD_WORDS})\b)'
+
+# "$85/hr - $95/hr" states the period on both bounds; "between $50 and
+# $60" only reads as a range after "between", so "and" separates nothing
+# else. The leading lookahead fails every other position on one character.
+SALARY_PATTERN = re.compile(
+    r'(?=[$\dub])(?:\b(?P<between>between)\s+)?'
+    + _GATE
+    + _amount('low')
+    + r'(?:' + _period('low_period') + r'?(?:' + _SEPARATOR + r'|(?(between)\s*and\s+|(?!)))' + _amount('high') + r')?'
+    + _period('period') + r'?',
+    re.IGNORECASE
+)
+
+QUALIFIER_PATTERN = re.compile(r'\b(c2c|corp[\s-]*to[\s-]*corp|w-?2|1099)\b', re.IGNORECASE)
+
+class SalaryInfo(NamedTuple):
+    min_amount: float  # as stated, in the posting's period
+    max_amount: float
+    period: str  # hour, day, week, month or year
+    annual_min: float
+    annual_max: float
+    rate_type: Optional[str]  # c2c, w2, 1099 or None
+    text: str  # the matched text
+
+def _to_float(number: str, k: Optional[str]) -> float:
+    value = float(number.replace(',', ''))
+    return value * 1000 if k else value
+
+def _rate_type(text: str, start: int, end: int) -> Optional[str]:
+    """
+    The C2C/W2/1099 qualifier nearest the match, on either side
+    """
+    candidates = []
+    after = QUALIFIER_PATTERN.search(text, end, end + QUALIFIER_WINDOW)
+    if after:
+        candidates.append((after.start() - end, after.group(1)))
+    before = list(QUALIFIER_PATTERN.finditer(text, max(0, start - QUALIFIER_WINDOW), start))
+    if before:
+        candidates.append((start - before[-1].end(), before[-1].group(1)))
+    if not candidates:
+        return None
+
+    found = min(candidates)[1].lower()
+    if found.startswith('corp'):
+        return 'c2c'
+    return found.replace('-', '')
+
+def _from_match(text: str, match: re.Match) -> Optional[SalaryInfo]:
+    low_k, high_k = match.group('low_k'), match.group('high_k')
+    has_currency = bool(match.group('low_cur') or match.group('high_cur'))
+    period = match.group('period') or match.group('low_period')
+
+    # Bare numbers ("3-5 years", "401k") are not salaries
+    if not has_currency and not (high_k or (low_k and match.group('high'))):
+        return None
+
+    low = _to_float(match.group('low'), low_k)
+    if match.group('high'):
+        high = _to_float(match.group('high'), high_k)
+        # "80-100k": the suffix on the upper bound applies to both
+        if high_k and not low_k and low < 1000:
+            low *= 1000
+    else:
+        high = low
+        # A lone "$500" is more likely a bonus or fee than pay
+        if not period and not low_k and low < MIN_ANNUAL:
+            return None
+
+    if period:
+        period = PERIOD_ALIASES[period.lower()]
+    else:
+        period = 'hour' if high < HOURLY_CEILING else 'year'
+
+    if low > high:
+        low, high = high, low
+
+    per_year = PERIODS_PER_YEAR[period]
+    annual_min, annual_max = low * per_year, high * per_year
+    if annual_min < MIN_ANNUAL or annual_max > MAX_ANNUAL:
+        return None
+
+    return SalaryInfo(
+        min_amount=low,
+        max_amount=high,
+        period=period,
+        annual_min=annual_min,
+        annual_max=annual_max,
+        rate_type=_rate_type(text, match.start(), match.end()),
+        text=match.group(0).strip()
+    )
+
+def iter_salaries(text: Optional[str]) -> Iterator[SalaryInfo]:
+    """
+    Every salary or rate mentioned in text, in order
+    """
+    if not text:
+        return
+    for match in SALARY_PATTERN.finditer(text):
+        info = _from_match(text, match)
+        if info is not None:
+            yield info
+
+def parse_salaries(text: Optional[str]) -> List[SalaryInfo]:
+    return list(iter_salaries(text))
+
+def parse_salary(text: Optional[str]) -> Optional[SalaryInfo]:
+    """
+    The first salary or rate mentioned in text, or None
+    """
+    return next(iter_salaries(text), None)
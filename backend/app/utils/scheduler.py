@@ -4,6 +4,10 @@ from datetime import datetime
 from app.services.job_service import job_service
 from app.services.notification_service import notification_service
 from app.utils.job_utils import duplicate_detector, relevance_scorer
+from app.scrapers.http_cache import http_cache
+from app.services.query_planner import query_planner
+from app.services.job_export import job_exporter
+from app.services.job_rollups import job_rollups
 from app.models import get_db
 from app.config import settings
 import logging
@@ -67,6 +71,24 @@ class JobScheduler:
                 replace_existing=True
             )
             
+            # Schedule stats rollup consistency checks
+            self.scheduler.add_job(
+                func=self.check_rollups_task,
+                trigger=IntervalTrigger(days=1),
+                id='check_rollups',
+                name='Check job stats rollups',
+                replace_existing=True
+            )
+            
+            # Schedule Parquet snapshots for offline analytics
+            self.scheduler.add_job(
+                func=self.snapshot_jobs_task,
+                trigger=IntervalTrigger(days=1),
+                id='snapshot_jobs',
+                name='Write daily Parquet job snapshots',
+                replace_existing=True
+            )
+            
             self.scheduler.start()
             self.is_running = True
             logger.info("Job scheduler started")
@@ -87,35 +109,21 @@ class JobScheduler:
         try:
             logger.info("Starting scheduled job scraping...")
             
-            # Scrape jobs with different search terms
-            search_terms = [
-                "software developer",
-                "software engineer",
-                "python developer",
-                "java developer",
-                "full stack developer",
-                "data scientist",
-                "devops engineer",
-                "cloud engineer"
-            ]
-            
-            total_results = {
-                'total_scraped': 0,
-                'new_jobs': 0,
-                'duplicates_filtered': 0,
-                'corp_to_corp_jobs': 0
-            }
-            
-            for term in search_terms:
-                try:
-                    results = job_service.scrape_and_store_jobs(term)
-                    for key in total_results:
-                        total_results[key] += results.get(key, 0)
-                    
-                    logger.info(f"Scraped {results.get('new_jobs', 0)} new jobs for '{term}'")
-                    
-                except Exception as e:
-                    logger.error(f"Error scraping jobs for '{term}': {e}")
+            # Only terms due this cycle; low-yield, overlapping ones run less often
+            search_terms = query_planner.plan(settings.SCRAPING_SEARCH_TERMS)
+            logger.info(f"Scraping {len(search_terms)} of {len(settings.SCRAPING_SEARCH_TERMS)} search terms: {search_terms}")
+            
+            # All terms are scraped from all sources in one concurrent pass
+            total_results = job_service.scrape_and_store_many(search_terms)
+            
+            for source, seconds in total_results.get('source_timings', {}).items():
+                logger.info(f"Scraped '{source}' in {seconds:.1f}s")
+            
+            for term, stats in total_results.get('term_stats', {}).items():
+                logger.info(
+                    f"Term '{term}': {stats['results']} results, {stats['unique']} unique, "
+                    f"overlap {stats['overlap']:.0%}, next in {stats.get('interval_cycles', 1)} cycle(s)"
+                )
             
             logger.info(f"Job scraping completed. Total new jobs: {total_results['new_jobs']}")
             
@@ -146,7 +154,12 @@ class JobScheduler:
             db = next(get_db())
             try:
                 removed_count = duplicate_detector.remove_duplicates(db)
-                logger.info(f"Removed {removed_count} duplicate jobs")
+                stats = duplicate_detector.last_run_stats
+                logger.info(
+                    f"Removed {removed_count} duplicate jobs "
+                    f"({stats['rows_scanned']} rows at {stats['rows_per_second']} rows/s, "
+                    f"signature set {stats['signature_set_bytes'] // 1024} KB)"
+                )
             finally:
                 db.close()
             
@@ -162,8 +175,9 @@ class JobScheduler:
             
             db = next(get_db())
             try:
-                updated_count = relevance_scorer.update_all_job_scores(db)
-                logger.info(f"Updated relevance scores for {updated_count} jobs")
+                updated_count = relevance_scorer.update_job_scores(db)
+                stats = relevance_scorer.last_run_stats
+                logger.info(f"Updated relevance scores for {updated_count} of {stats['rows_checked']} re-scored jobs")
             finally:
                 db.close()
             
@@ -184,9 +198,47 @@ class JobScheduler:
             finally:
                 db.close()
             
+            pruned_count = http_cache.prune()
+            logger.info(f"Pruned {pruned_count} expired HTTP cache entries")
+            
         except Exception as e:
             logger.error(f"Error in cleanup_old_jobs_task: {e}")
     
+    def check_rollups_task(self):
+        """
+        Scheduled task to recount the stats rollups and rebuild them if they drifted
+        """
+        try:
+            db = next(get_db())
+            try:
+                result = job_rollups.check(db)
+                if not result['consistent']:
+                    logger.warning(f"Job rollups drifted, rebuilding: {result}")
+                    job_rollups.rebuild(db)
+            finally:
+                db.close()
+            
+        except Exception as e:
+            logger.error(f"Error in check_rollups_task: {e}")
+    
+    def snapshot_jobs_task(self):
+        """
+        Scheduled task to write Parquet snapshots of the days not yet saved
+        """
+        if not settings.EXPORT_SNAPSHOT_DIR:
+            return
+        if not job_exporter.columnar_available:
+            logger.warning("Skipping job snapshots: pyarrow is not installed")
+            return
+        
+        try:
+            logger.info("Writing job snapshots...")
+            written = job_exporter.write_pending_snapshots()
+            logger.info(f"Wrote {len(written)} job snapshot partitions")
+            
+        except Exception as e:
+            logger.error(f"Error in snapshot_jobs_task: {e}")
+    
     def get_job_status(self):
         """
         Get current status of scheduled jobs
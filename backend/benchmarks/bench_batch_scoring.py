@@ -0,0 +1,72 @@
+"""
+Benchmark vectorized batch relevance scoring against the scalar path.
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_batch_scoring --sizes 10000 100000 1000000
+"""
+import argparse
+import random
+import time
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from app.utils.job_utils import JobRelevanceScorer
+
+WORDS = (
+    "python java javascript react sql aws docker kubernetes contract consulting c2c w2 "
+    "senior developer engineer team client remote onsite build design support data"
+).split() + [f"word{i}" for i in range(500)]
+LOCATIONS = ["Remote", "Dallas, TX", "New York, NY", "Chicago, IL", "Toronto", "Anywhere", "Austin"]
+
+def make_jobs(rng: random.Random, count: int, now: datetime) -> list:
+    return [
+        SimpleNamespace(
+            title=f"{rng.choice(WORDS)} {rng.choice(WORDS)}",
+            description=" ".join(rng.choices(WORDS, k=60)),
+            requirements=" ".join(rng.choices(WORDS, k=10)),
+            location=rng.choice(LOCATIONS),
+            posted_date=now - timedelta(hours=rng.randint(0, 720)),
+            salary_min=rng.choice([None, 50000.0, 70000.0, 90000.0, 120000.0]),
+            is_corp_to_corp=rng.random() < 0.3,
+        )
+        for _ in range(count)
+    ]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 100000, 1000000])
+    parser.add_argument('--chunk', type=int, default=50000, help="rows generated and scored per batch call")
+    parser.add_argument('--scalar-limit', type=int, default=100000, help="skip the scalar path above this size")
+    args = parser.parse_args()
+
+    rng = random.Random(11)
+    scorer = JobRelevanceScorer()
+    now = datetime.utcnow()
+
+    print(f"{'rows':>10} {'batch rows/s':>14} {'scalar rows/s':>14} {'speedup':>8}")
+    for size in args.sizes:
+        batch_seconds = scalar_seconds = 0.0
+        run_scalar = size <= args.scalar_limit
+
+        for offset in range(0, size, args.chunk):
+            jobs = make_jobs(rng, min(args.chunk, size - offset), now)
+
+            start = time.perf_counter()
+            totals = scorer.score_batch(jobs, now=now)['total']
+            batch_seconds += time.perf_counter() - start
+
+            if run_scalar:
+                start = time.perf_counter()
+                scalar = [scorer.score_job_relevance(job, now=now) for job in jobs]
+                scalar_seconds += time.perf_counter() - start
+                assert totals.tolist() == scalar, "batch and scalar scores differ"
+
+        batch_rate = size / batch_seconds
+        if run_scalar:
+            scalar_rate = size / scalar_seconds
+            print(f"{size:>10} {batch_rate:>14,.0f} {scalar_rate:>14,.0f} {batch_rate / scalar_rate:>7.1f}x")
+        else:
+            print(f"{size:>10} {batch_rate:>14,.0f} {'-':>14} {'-':>8}")
+
+if __name__ == "__main__":
+    main()
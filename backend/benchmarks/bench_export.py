@@ -0,0 +1,138 @@
+"""
+Benchmark /api/export/jobs memory and latency: streaming vs. building it all in memory.
+
+Builds a throwaway SQLite database per row count and exports it with the old
+all-rows-then-serialize JSON code and with JobExporter in each format,
+reporting peak Python heap (tracemalloc), time to first byte, total time and
+the time pandas takes to load the result. Run from the backend directory:
+
+    python -m benchmarks.bench_export --rows 10000 100000 500000
+"""
+import argparse
+import io
+import json
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from app.models import Base, Job
+from app.models.schemas import JobExportRequest
+from app.services.job_export import JobExporter
+
+try:
+    import pandas as pd
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - depends on installed extras
+    pd = pa = pq = None
+
+FORMATS = ('json', 'ndjson', 'csv', 'arrow', 'parquet')
+
+INSERT_CHUNK = 10000
+
+def build_database(path: Path, rows: int):
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(bind=engine)
+    now = datetime.utcnow()
+    with engine.begin() as conn:
+        for start in range(0, rows, INSERT_CHUNK):
+            conn.execute(Job.__table__.insert(), [
+                {
+                    'title': f"Job {i}",
+                    'company': "Acme",
+                    'location': "Remote",
+                    'description': "python contract remote " * 40,
+                    'source': 'indeed',
+                    'source_url': f"https://example.com/jobs/{i}",
+                    'posted_date': now,
+                    'relevance_score': 0.5,
+                    'fingerprint': f"{i:032x}"
+                }
+                for i in range(start, min(start + INSERT_CHUNK, rows))
+            ])
+    return engine
+
+def legacy_export(session_factory):
+    """
+    The export this replaced: every row, then one dict list, then one response
+    """
+    db = session_factory()
+    try:
+        jobs = db.query(Job).all()
+        job_data = []
+        for job in jobs:
+            job_data.append({
+                "id": job.id, "title": job.title, "company": job.company, "location": job.location,
+                "description": job.description, "job_type": job.job_type, "source": job.source,
+                "posted_date": job.posted_date.isoformat(), "salary_min": job.salary_min,
+                "salary_max": job.salary_max, "is_corp_to_corp": job.is_corp_to_corp,
+                "relevance_score": job.relevance_score, "is_applied": job.is_applied,
+                "is_favorited": job.is_favorited, "source_url": job.source_url
+            })
+        # What JSONResponse does with the returned dict
+        yield json.dumps({"data": job_data, "format": "json"}).encode()
+    finally:
+        db.close()
+
+def measure(chunks) -> tuple:
+    tracemalloc.start()
+    start = time.perf_counter()
+    first_byte = None
+    total = 0
+    for chunk in chunks:
+        if first_byte is None:
+            first_byte = time.perf_counter() - start
+        total += len(chunk)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak / 2 ** 20, first_byte, elapsed, total / 2 ** 20
+
+def load_dataframe(format: str, data: bytes):
+    """
+    What an analyst's pandas session does with the download
+    """
+    if format in ('legacy', 'json'):
+        return pd.DataFrame(json.loads(data)['data'])
+    if format == 'ndjson':
+        return pd.read_json(io.BytesIO(data), lines=True)
+    if format == 'csv':
+        return pd.read_csv(io.BytesIO(data))
+    if format == 'arrow':
+        return pa.ipc.open_stream(data).read_all().to_pandas()
+    return pq.read_table(io.BytesIO(data), use_threads=False).to_pandas()
+
+def timed_load(format: str, data: bytes) -> float:
+    start = time.perf_counter()
+    load_dataframe(format, data)
+    return time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--rows', type=int, nargs='+', default=[10000, 100000])
+    parser.add_argument('--formats', nargs='+', choices=FORMATS, default=list(FORMATS))
+    args = parser.parse_args()
+    formats = [format for format in args.formats if pa is not None or format not in ('arrow', 'parquet')]
+
+    print(f"{'rows':>9} {'path':>7} {'peak MiB':>9} {'first byte s':>13} {'total s':>8} {'output MiB':>11} {'pandas s':>9}")
+    with tempfile.TemporaryDirectory() as directory:
+        for rows in args.rows:
+            engine = build_database(Path(directory) / f"jobs_{rows}.db", rows)
+            session_factory = sessionmaker(bind=engine)
+            exporter = JobExporter(session_factory)
+            try:
+                paths = {'legacy': lambda: legacy_export(session_factory)}
+                for format in formats:
+                    paths[format] = lambda format=format: exporter.stream(JobExportRequest(format=format))
+                for label, chunks in paths.items():
+                    peak, first_byte, elapsed, size = measure(chunks())
+                    load = f"{timed_load(label, b''.join(chunks())):>9.2f}" if pd is not None else f"{'-':>9}"
+                    print(f"{rows:>9,} {label:>7} {peak:>9.1f} {first_byte:>13.3f} {elapsed:>8.2f} {size:>11.1f} {load}")
+            finally:
+                engine.dispose()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+"""
+Benchmark listing/detail page extraction over the saved fixture pages.
+
+Compares the old path (BeautifulSoup html.parser, one find() per field and
+a fresh parse in clean_text for every field) with single-pass extraction
+on each installed parser backend. Run from the backend directory:
+
+    python -m benchmarks.bench_html_parsing --repeat 200
+"""
+import argparse
+import time
+import warnings
+from pathlib import Path
+from bs4 import BeautifulSoup, MarkupResemblesLocatorWarning
+from app.scrapers.html_parser import available_backends, extract_items, parse_html
+from app.scrapers.job_scrapers import DICE_CARD, INDEED_CARD, INDEED_DESCRIPTION
+
+FIXTURES = Path(__file__).parent.parent / 'tests' / 'fixtures'
+
+# The legacy path re-parses short plain strings, which bs4 warns about
+warnings.filterwarnings('ignore', category=MarkupResemblesLocatorWarning)
+
+def legacy_clean_text(text: str) -> str:
+    return ' '.join(BeautifulSoup(text, 'html.parser').get_text().split())
+
+def legacy_indeed_listing(content: bytes) -> list:
+    cards = []
+    for card in BeautifulSoup(content, 'html.parser').find_all('div', class_='job_seen_beacon'):
+        title_elem = card.find('h2', class_='jobTitle')
+        company_elem = card.find('span', class_='companyName')
+        location_elem = card.find('div', class_='companyLocation')
+        date_elem = card.find('span', class_='date')
+        link_elem = title_elem.find('a')
+        cards.append({
+            'title': legacy_clean_text(title_elem.get_text()),
+            'company': legacy_clean_text(company_elem.get_text()) if company_elem else None,
+            'location': legacy_clean_text(location_elem.get_text()) if location_elem else None,
+            'posted': date_elem.get_text() if date_elem else None,
+            'href': link_elem['href'] if link_elem else None
+        })
+    return cards
+
+def legacy_dice_listing(content: bytes) -> list:
+    cards = []
+    for card in BeautifulSoup(content, 'html.parser').find_all('div', class_='card-body'):
+        title_elem = card.find('h5', class_='card-title-link')
+        company_elem = card.find('div', class_='card-company')
+        location_elem = card.find('div', class_='card-location')
+        desc_elem = card.find('div', class_='card-description')
+        cards.append({
+            'title': legacy_clean_text(title_elem.get_text()),
+            'company': legacy_clean_text(company_elem.get_text()) if company_elem else None,
+            'location': legacy_clean_text(location_elem.get_text()) if location_elem else None,
+            'description': legacy_clean_text(desc_elem.get_text()) if desc_elem else None
+        })
+    return cards
+
+def legacy_detail(content: bytes) -> str:
+    desc_elem = BeautifulSoup(content, 'html.parser').find('div', class_='jobsearch-jobDescriptionText')
+    return legacy_clean_text(desc_elem.get_text())
+
+def extractors(backend: str):
+    return {
+        'indeed_listing.html': lambda content: extract_items(content, INDEED_CARD, backend),
+        'dice_listing.html': lambda content: extract_items(content, DICE_CARD, backend),
+        'indeed_detail.html': lambda content: parse_html(content, backend).select_one(INDEED_DESCRIPTION).text()
+    }
+
+LEGACY = {
+    'indeed_listing.html': legacy_indeed_listing,
+    'dice_listing.html': legacy_dice_listing,
+    'indeed_detail.html': legacy_detail
+}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--repeat', type=int, default=200, help="times each fixture page is parsed")
+    args = parser.parse_args()
+
+    pages = {name: (FIXTURES / name).read_bytes() for name in LEGACY}
+    paths = [('legacy bs4', LEGACY)] + [(backend, extractors(backend)) for backend in available_backends()]
+
+    print(f"{'path':>12} " + " ".join(f"{name:>20}" for name in pages) + f" {'speedup':>8}")
+    baseline = None
+    for label, functions in paths:
+        rates, total = [], 0.0
+        for name, content in pages.items():
+            start = time.perf_counter()
+            for _ in range(args.repeat):
+                functions[name](content)
+            seconds = time.perf_counter() - start
+            total += seconds
+            rates.append(f"{args.repeat / seconds:>14,.0f} pg/s")
+        baseline = baseline or total
+        print(f"{label:>12} " + " ".join(f"{rate:>20}" for rate in rates) + f" {baseline / total:>7.1f}x")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+"""
+Benchmark the MinHash/LSH near-duplicate lookup against the word-overlap scan.
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_near_duplicates --jobs 5000 --probes 200
+"""
+import argparse
+import random
+import time
+from datetime import datetime, timedelta
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from app.models import Base, Job
+from app.services.ingestion import JobIngestionPipeline
+from app.utils.job_utils import JobDuplicateDetector
+
+COMMON_WORDS = (
+    "python java react aws azure docker kubernetes terraform sql spark kafka airflow "
+    "senior lead contract remote hybrid onsite healthcare banking retail insurance "
+    "design build migrate support platform pipeline service api cloud data team client"
+).split()
+RARE_WORDS = [f"term{i}" for i in range(3000)]
+WORDS = COMMON_WORDS + RARE_WORDS
+TITLES = ["Python Developer", "Java Engineer", "Data Engineer", "DevOps Engineer", "Cloud Architect"]
+LOCATIONS = ["Dallas, TX", "Remote", "New York, NY", "Chicago, IL"]
+
+def make_job(rng: random.Random, i: int, company: str) -> dict:
+    # A few common words plus a long tail of rarer ones, like real postings
+    words = [rng.choice(COMMON_WORDS) for _ in range(10)] + [rng.choice(RARE_WORDS) for _ in range(30)]
+    rng.shuffle(words)
+    description = " ".join(words)
+    job = {
+        'title': f"{rng.choice(['Senior', 'Lead', ''])} {rng.choice(TITLES)}".strip(),
+        'company': company,
+        'location': rng.choice(LOCATIONS),
+        'description': description,
+        'source': 'dice',
+        'source_url': f"https://example.com/jobs/{i}",
+        'posted_date': datetime.utcnow() - timedelta(hours=rng.randint(0, 100)),
+    }
+    job['fingerprint'] = Job.compute_fingerprint(job['title'], job['company'], job['location'], job['source_url'])
+    return job
+
+def make_probe(rng: random.Random, job: dict) -> dict:
+    # A repost: same job with a couple of words changed
+    words = job['description'].split()
+    for _ in range(2):
+        words[rng.randrange(len(words))] = rng.choice(WORDS)
+    return dict(job, description=" ".join(words), source_url=job['source_url'] + "?repost")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--jobs', type=int, default=5000, help="jobs posted by the big staffing company")
+    parser.add_argument('--probes', type=int, default=200)
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    engine = create_engine('sqlite://')
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+
+    jobs = [make_job(rng, i, "Big Staffing Inc") for i in range(args.jobs)]
+    with JobIngestionPipeline(db, batch_size=500) as pipeline:
+        for job in jobs:
+            pipeline.add(job)
+
+    probes = [make_probe(rng, rng.choice(jobs)) for _ in range(args.probes // 2)]
+    probes += [make_job(rng, args.jobs + i, "Big Staffing Inc") for i in range(args.probes - len(probes))]
+
+    detector = JobDuplicateDetector()
+    timings = {}
+    answers = {}
+    for name, method in (('scan', detector._similar_job_exists_scan), ('lsh', detector._similar_job_exists)):
+        start = time.perf_counter()
+        answers[name] = [method(db, probe) for probe in probes]
+        timings[name] = time.perf_counter() - start
+
+    agreement = sum(a == b for a, b in zip(answers['scan'], answers['lsh'])) / len(probes)
+    scan_hits = sum(answers['scan'])
+    recall = sum(a and b for a, b in zip(answers['scan'], answers['lsh'])) / scan_hits if scan_hits else 1.0
+
+    print(f"jobs={args.jobs} probes={len(probes)}")
+    for name in ('scan', 'lsh'):
+        print(f"{name:>5}: {timings[name] / len(probes) * 1000:8.2f} ms/probe")
+    print(f"speedup: {timings['scan'] / timings['lsh']:.1f}x  agreement: {agreement:.1%}  recall: {recall:.1%}")
+
+if __name__ == "__main__":
+    main()
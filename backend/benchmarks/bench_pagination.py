@@ -0,0 +1,82 @@
+"""
+Benchmark deep-page latency of GET /api/jobs: OFFSET vs. keyset cursors.
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_pagination --rows 300000 --pages 1 100 1000 5000
+"""
+import argparse
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from sqlalchemy import create_engine, desc
+from sqlalchemy.orm import sessionmaker
+from app.models import Base, Job
+from app.services.job_service import RANK_KEYS, JobService
+from app.utils.pagination import encode_cursor
+
+INSERT_CHUNK = 10000
+
+def build_database(path: Path, rows: int, rng: random.Random):
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(bind=engine)
+    now = datetime.utcnow()
+    with engine.begin() as conn:
+        for start in range(0, rows, INSERT_CHUNK):
+            conn.execute(Job.__table__.insert(), [
+                {
+                    'title': f"Job {i}",
+                    'company': "Acme",
+                    'location': "Remote",
+                    'description': "x" * 500,
+                    'source': 'indeed',
+                    'source_url': f"https://example.com/jobs/{i}",
+                    'posted_date': now - timedelta(hours=rng.randint(0, 72)),
+                    'relevance_score': round(rng.random(), 2),
+                    'fingerprint': f"{i:032x}"
+                }
+                for i in range(start, min(start + INSERT_CHUNK, rows))
+            ])
+    return engine
+
+def timed(function, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        function()
+    return (time.perf_counter() - start) / repeat * 1000
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--rows', type=int, default=300000)
+    parser.add_argument('--page-size', type=int, default=50)
+    parser.add_argument('--pages', type=int, nargs='+', default=[1, 100, 1000, 5000])
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    service = JobService()
+    with tempfile.TemporaryDirectory() as directory:
+        engine = build_database(Path(directory) / "jobs.db", args.rows, random.Random(1))
+        db = sessionmaker(bind=engine)()
+        ordered = db.query(Job).order_by(*(desc(key) for key in RANK_KEYS))
+        print(f"{'page':>6} {'offset ms':>10} {'keyset ms':>10}")
+        try:
+            for page in args.pages:
+                skip = (page - 1) * args.page_size
+                if skip >= args.rows:
+                    continue
+                # The cursor a client holding page - 1 would send
+                cursor = None
+                if skip:
+                    last = db.query(*RANK_KEYS).order_by(*(desc(key) for key in RANK_KEYS)).offset(skip - 1).first()
+                    cursor = encode_cursor(list(last), 'relevance')
+                offset_ms = timed(lambda: ordered.offset(skip).limit(args.page_size).all(), args.repeat)
+                keyset_ms = timed(lambda: service.list_jobs_page(db, args.page_size, cursor), args.repeat)
+                print(f"{page:>6} {offset_ms:>10.2f} {keyset_ms:>10.2f}")
+        finally:
+            db.close()
+            engine.dispose()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,94 @@
+"""
+Benchmark salary extraction throughput and accuracy on generated descriptions.
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_salary_parser --count 100000
+"""
+import argparse
+import random
+import re
+import time
+from app.utils.salary_parser import parse_salary
+
+FILLER = (
+    "We are looking for an experienced engineer to join a client team building cloud services "
+    "with Python, Java, AWS and Kubernetes. 3-5 years experience required, 401k and benefits. "
+).split()
+
+# (phrase template, function giving the expected annual range, bounds for lo);
+# None is a description with no salary
+SALARY_TEMPLATES = [
+    ("Pay: ${lo:,} - ${hi:,} per year", lambda lo, hi: (lo, hi), (70000, 160000)),
+    ("Salary {lo}-{hi}k DOE", lambda lo, hi: (lo * 1000, hi * 1000), (70, 160)),
+    ("Rate ${lo}/hr on C2C", lambda lo, hi: (lo * 2080, lo * 2080), (40, 120)),
+    ("${lo}-{hi}/hr W2 only", lambda lo, hi: (lo * 2080, hi * 2080), (40, 120)),
+    ("${lo}/day contract", lambda lo, hi: (lo * 260, lo * 260), (300, 900)),
+    (None, None, None),
+]
+
+def make_corpus(rng: random.Random, count: int) -> list:
+    corpus = []
+    for _ in range(count):
+        template, to_annual, bounds = rng.choice(SALARY_TEMPLATES)
+        words = rng.choices(FILLER, k=rng.randint(40, 120))
+        if template is None:
+            corpus.append((" ".join(words), (None, None)))
+            continue
+        lo = rng.randint(bounds[0], bounds[1])
+        hi = lo + rng.randint(1, max(1, bounds[0] // 4))
+        phrase = template.format(lo=lo, hi=hi)
+        words.insert(rng.randrange(len(words)), phrase)
+        expected = to_annual(lo, hi)
+        corpus.append((" ".join(words), (float(expected[0]), float(expected[1]))))
+    return corpus
+
+def legacy_extract(text: str) -> tuple:
+    """
+    The extractor this module replaced, kept for comparison
+    """
+    patterns = [
+        r'\$(\d{1,3}(?:,\d{3})*(?:\.\d{2})?)\s*-\s*\$(\d{1,3}(?:,\d{3})*(?:\.\d{2})?)',
+        r'(\d{1,3}(?:,\d{3})*)\s*-\s*(\d{1,3}(?:,\d{3})*)\s*(?:k|thousand)',
+        r'\$(\d{1,3}(?:,\d{3})*)\s*per\s*hour',
+    ]
+    for pattern in patterns:
+        match = re.search(pattern, text, re.IGNORECASE)
+        if match:
+            try:
+                if "hour" in pattern:
+                    annual_salary = float(match.group(1).replace(',', '')) * 40 * 52
+                    return (annual_salary, annual_salary)
+                min_salary = float(match.group(1).replace(',', ''))
+                max_salary = float(match.group(2).replace(',', ''))
+                if 'k' in text.lower() or 'thousand' in text.lower():
+                    min_salary *= 1000
+                    max_salary *= 1000
+                return (min_salary, max_salary)
+            except (ValueError, IndexError):
+                continue
+    return (None, None)
+
+def parser_extract(text: str) -> tuple:
+    salary = parse_salary(text)
+    return (salary.annual_min, salary.annual_max) if salary else (None, None)
+
+def run(name: str, extract, corpus: list):
+    start = time.perf_counter()
+    results = [extract(text) for text, _ in corpus]
+    seconds = time.perf_counter() - start
+    correct = sum(1 for result, (_, expected) in zip(results, corpus) if result == expected)
+    print(f"{name:>8} {len(corpus) / seconds:>14,.0f} {correct / len(corpus):>10.1%}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--count', type=int, default=100000)
+    args = parser.parse_args()
+
+    corpus = make_corpus(random.Random(7), args.count)
+    print(f"{'':>8} {'descriptions/s':>14} {'accuracy':>10}")
+    run('legacy', legacy_extract, corpus)
+    run('parser', parser_extract, corpus)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+"""
+Replay recorded Indeed/Dice pages through the scrapers and report throughput.
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_scraper_replay --rounds 20
+    python -m benchmarks.bench_scraper_replay --save-baseline replay_baseline.json
+    python -m benchmarks.bench_scraper_replay --baseline replay_baseline.json
+
+With --baseline, exits non-zero if jobs/s drops more than --tolerance below
+the baseline or field accuracy drops at all.
+"""
+import argparse
+import json
+import sys
+from pathlib import Path
+from benchmarks.replay import SCRAPERS, run_replay
+
+COLUMNS = ['pages', 'jobs', 'pages_per_second', 'jobs_per_second', 'network_seconds', 'parse_seconds', 'field_accuracy']
+
+def regressions(results: dict, baseline: dict, tolerance: float) -> list:
+    problems = []
+    for source, metrics in results.items():
+        expected = baseline.get(source)
+        if not expected:
+            continue
+        if metrics['jobs_per_second'] < expected['jobs_per_second'] * (1 - tolerance):
+            problems.append(f"{source}: {metrics['jobs_per_second']} jobs/s vs baseline {expected['jobs_per_second']}")
+        if metrics['field_accuracy'] < expected['field_accuracy']:
+            problems.append(f"{source}: field accuracy {metrics['field_accuracy']} vs baseline {expected['field_accuracy']}")
+    return problems
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--sources', nargs='+', choices=list(SCRAPERS), default=list(SCRAPERS))
+    parser.add_argument('--rounds', type=int, default=20)
+    parser.add_argument('--latency', type=float, default=0.0, help="seconds the stand-in server sleeps per request")
+    parser.add_argument('--baseline', type=Path, help="compare against a saved baseline")
+    parser.add_argument('--save-baseline', type=Path, help="write these results as the baseline")
+    parser.add_argument('--tolerance', type=float, default=0.25, help="allowed jobs/s drop vs baseline")
+    args = parser.parse_args()
+
+    results = run_replay(args.sources, args.rounds, args.latency)
+
+    print(f"{'source':>8} " + " ".join(f"{column:>16}" for column in COLUMNS))
+    for source, metrics in results.items():
+        print(f"{source:>8} " + " ".join(f"{metrics[column]:>16}" for column in COLUMNS))
+
+    if args.save_baseline:
+        args.save_baseline.write_text(json.dumps(results, indent=2))
+
+    if args.baseline:
+        problems = regressions(results, json.loads(args.baseline.read_text()), args.tolerance)
+        for problem in problems:
+            print(f"REGRESSION {problem}")
+        if problems:
+            sys.exit(1)
+
+if __name__ == '__main__':
+    main()
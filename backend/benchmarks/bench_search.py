@@ -0,0 +1,113 @@
+"""
+Benchmark keyword search latency: the full-text index vs. LIKE scans.
+
+Builds a throwaway SQLite database per row count, then times
+JobService.search_jobs with the FTS5 index against the old single-phrase
+ILIKE filter over the same queries. Run from the backend directory:
+
+    python -m benchmarks.bench_search --rows 100000 1000000
+"""
+import argparse
+import random
+import statistics
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from sqlalchemy import create_engine, desc, or_
+from sqlalchemy.orm import sessionmaker
+from app.models import Base, Job
+from app.models.schemas import JobSearchRequest
+from app.models.search_index import create_search_index
+from app.services.job_service import JobService
+
+TITLES = ["Python Developer", "Java Engineer", "DevOps Engineer", "Data Scientist", "Full Stack Developer",
+          "Cloud Architect", "QA Analyst", "Golang Developer", "React Developer", "Security Engineer"]
+SKILLS = ("python java aws azure gcp kubernetes docker terraform react angular node django flask spring sql "
+          "postgres kafka spark airflow microservices rest graphql linux ci cd agile scrum contract remote "
+          "client team build design deploy maintain services platform data pipeline senior lead").split()
+# Zipf-weighted filler so common words are common and skills are selective
+FILLER = [f"word{i}" for i in range(5000)]
+FILLER_WEIGHTS = [1 / (rank + 1) for rank in range(len(FILLER))]
+QUERIES = ["python", "kubernetes terraform", "senior java spring", "react node remote", "data pipeline airflow spark"]
+
+INSERT_CHUNK = 10000
+
+def build_database(path: Path, rows: int, rng: random.Random):
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(bind=engine)
+    now = datetime.utcnow()
+    with engine.begin() as conn:
+        for start in range(0, rows, INSERT_CHUNK):
+            conn.execute(Job.__table__.insert(), [
+                {
+                    'title': rng.choice(TITLES),
+                    'company': f"Company {i % 5000}",
+                    'location': "Remote",
+                    'description': " ".join(
+                        rng.choices(FILLER, FILLER_WEIGHTS, k=rng.randint(80, 200)) + rng.choices(SKILLS, k=rng.randint(2, 6))
+                    ),
+                    'requirements': " ".join(rng.choices(SKILLS, k=3)),
+                    'source': 'indeed',
+                    'source_url': f"https://example.com/jobs/{i}",
+                    'posted_date': now,
+                    'relevance_score': rng.random(),
+                    'fingerprint': f"{i:032x}"
+                }
+                for i in range(start, min(start + INSERT_CHUNK, rows))
+            ])
+    start = time.perf_counter()
+    create_search_index(engine)
+    return engine, time.perf_counter() - start
+
+def legacy_search(db, keywords: str):
+    """
+    The LIKE query this index replaced, kept for comparison
+    """
+    return db.query(Job).filter(
+        or_(
+            Job.title.ilike(f'%{keywords}%'),
+            Job.description.ilike(f'%{keywords}%'),
+            Job.requirements.ilike(f'%{keywords}%')
+        )
+    ).order_by(desc(Job.relevance_score), desc(Job.posted_date)).limit(100).all()
+
+def percentiles(samples: list) -> tuple:
+    ordered = sorted(samples)
+    return statistics.median(ordered), ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+
+def time_queries(search, repeat: int) -> tuple:
+    samples = []
+    for _ in range(repeat):
+        for keywords in QUERIES:
+            start = time.perf_counter()
+            search(keywords)
+            samples.append((time.perf_counter() - start) * 1000)
+    return percentiles(samples)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--rows', type=int, nargs='+', default=[100000])
+    parser.add_argument('--repeat', type=int, default=20, help="times each query is run")
+    args = parser.parse_args()
+
+    service = JobService()
+    print(f"{'rows':>9} {'index build s':>14} {'path':>6} {'p50 ms':>9} {'p99 ms':>9}")
+    with tempfile.TemporaryDirectory() as directory:
+        for rows in args.rows:
+            engine, build_seconds = build_database(Path(directory) / f"jobs_{rows}.db", rows, random.Random(rows))
+            db = sessionmaker(bind=engine)()
+            try:
+                paths = {
+                    'like': lambda keywords: legacy_search(db, keywords),
+                    'fts': lambda keywords: service.search_jobs(db, JobSearchRequest(keywords=keywords))
+                }
+                for label, search in paths.items():
+                    p50, p99 = time_queries(search, args.repeat)
+                    print(f"{rows:>9,} {build_seconds:>14.1f} {label:>6} {p50:>9.1f} {p99:>9.1f}")
+            finally:
+                db.close()
+                engine.dispose()
+
+if __name__ == '__main__':
+    main()
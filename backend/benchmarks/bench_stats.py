@@ -0,0 +1,112 @@
+"""
+Benchmark /api/jobs/stats and /api/analytics/*: rollup reads vs. full-table aggregates.
+
+Builds a throwaway SQLite database per row count, counts it into the
+rollups, then times the dashboard's three calls (stats, trending, salary)
+against the GROUP BY scans they replaced. Run from the backend directory:
+
+    python -m benchmarks.bench_stats --rows 100000 1000000
+"""
+import argparse
+import random
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from sqlalchemy import case, create_engine, desc, func
+from sqlalchemy.orm import sessionmaker
+from app.models import Base, Job, JobRollup
+from app.services.job_rollups import job_rollups
+from app.services.job_service import JobService
+
+INSERT_CHUNK = 10000
+
+def build_database(path: Path, rows: int, rng: random.Random):
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(bind=engine)
+    now = datetime.utcnow()
+    with engine.begin() as conn:
+        for start in range(0, rows, INSERT_CHUNK):
+            conn.execute(Job.__table__.insert(), [
+                {
+                    'title': f"Title {int(rng.paretovariate(1.2)) % 2000}",
+                    'company': f"Company {int(rng.paretovariate(1.1)) % 5000}",
+                    'location': f"City {rng.randrange(300)}",
+                    'description': "x" * 200,
+                    'job_type': rng.choice(["contract", "full-time", "part-time"]),
+                    'source': rng.choice(["indeed", "dice", "linkedin"]),
+                    'source_url': f"https://example.com/jobs/{i}",
+                    'posted_date': now - timedelta(minutes=rng.randrange(30 * 24 * 60)),
+                    'is_corp_to_corp': rng.random() < 0.3,
+                    'relevance_score': rng.random(),
+                    'salary_min': rng.choice([None, rng.randrange(40000, 160000)]),
+                    'salary_max': rng.randrange(80000, 200000),
+                    'fingerprint': f"{i:032x}"
+                }
+                for i in range(start, min(start + INSERT_CHUNK, rows))
+            ])
+    db = sessionmaker(bind=engine)()
+    start = time.perf_counter()
+    job_rollups.rebuild(db)
+    db.close()
+    return engine, time.perf_counter() - start
+
+def legacy_dashboard(db):
+    """
+    The aggregate queries the rollups replaced, as the dashboard issued them
+    """
+    now = datetime.utcnow()
+    db.query(Job).count()
+    db.query(Job).filter(Job.is_corp_to_corp == True).count()
+    db.query(Job).filter(Job.posted_date >= now - timedelta(hours=24)).count()
+    db.query(func.avg(Job.relevance_score)).scalar()
+    for column in (Job.company, Job.location):
+        db.query(column, func.count(Job.id).label('n')).group_by(column).order_by(desc('n')).limit(10).all()
+
+    week_ago = now - timedelta(days=7)
+    for column in (Job.title, Job.company):
+        db.query(column, func.count(Job.id)).filter(Job.posted_date >= week_ago).group_by(column).order_by(func.count(Job.id).desc()).limit(10).all()
+
+    db.query(Job.job_type, func.avg(Job.salary_min), func.avg(Job.salary_max)).filter(Job.salary_min.isnot(None)).group_by(Job.job_type).all()
+    db.query(func.count(Job.id)).filter(Job.salary_min.isnot(None)).group_by(
+        case((Job.salary_min < 60000, 'Under $60k'), (Job.salary_min < 80000, '$60k-$80k'),
+             (Job.salary_min < 100000, '$80k-$100k'), (Job.salary_min < 120000, '$100k-$120k'), else_='$120k+')
+    ).all()
+
+def rollup_dashboard(service: JobService, db):
+    service.get_job_stats(db)
+    service.get_trending(db)
+    service.get_salary_analytics(db)
+
+def time_calls(call, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        call()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--rows', type=int, nargs='+', default=[100000])
+    parser.add_argument('--repeat', type=int, default=10)
+    args = parser.parse_args()
+
+    service = JobService()
+    print(f"{'rows':>9} {'buckets':>8} {'rebuild s':>10} {'scan ms':>9} {'rollup ms':>10}")
+    with tempfile.TemporaryDirectory() as directory:
+        for rows in args.rows:
+            engine, rebuild_seconds = build_database(Path(directory) / f"jobs_{rows}.db", rows, random.Random(rows))
+            db = sessionmaker(bind=engine)()
+            try:
+                buckets = db.query(JobRollup).count()
+                scan_ms = time_calls(lambda: legacy_dashboard(db), args.repeat)
+                rollup_ms = time_calls(lambda: rollup_dashboard(service, db), args.repeat)
+                print(f"{rows:>9,} {buckets:>8,} {rebuild_seconds:>10.1f} {scan_ms:>9.1f} {rollup_ms:>10.1f}")
+            finally:
+                db.close()
+                engine.dispose()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,202 @@
+"""
+Offline replay harness for the scrapers.
+
+ReplayServer serves the recorded listing and detail pages in
+tests/fixtures from a local HTTP server, one path prefix per source.
+run_replay points IndeedScraper/DiceScraper at it and reports throughput,
+time spent fetching vs parsing, and field accuracy against
+expected_fields.json.
+"""
+import json
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List
+from urllib.parse import parse_qs, urlsplit
+from app.config import settings
+from app.scrapers import job_scrapers
+from app.scrapers.http_cache import HTTPCache
+from app.scrapers.http_client import AsyncFetcher
+from app.scrapers.job_scrapers import DiceScraper, IndeedScraper
+
+FIXTURES = Path(__file__).parent.parent / 'tests' / 'fixtures'
+
+# Listing pages past the first are served empty, ending pagination
+FIRST_PAGE = {'start': '0', 'page': '1'}
+
+# Path prefix under each source's base_url -> fixture page
+ROUTES = {
+    'indeed': {'/jobs': 'indeed_listing.html', '/viewjob': 'indeed_detail.html'},
+    'dice': {'/jobs': 'dice_listing.html'}
+}
+
+SCRAPERS = {'indeed': IndeedScraper, 'dice': DiceScraper}
+
+class ReplayServer:
+    def __init__(self, fixtures: Path = FIXTURES, latency: float = 0.0):
+        """
+        Serve fixture pages at http://127.0.0.1:<port>/<source>/...,
+        sleeping latency seconds per request to stand in for the network
+        """
+        self.pages = {
+            source: {prefix: (fixtures / name).read_bytes() for prefix, name in routes.items()}
+            for source, routes in ROUTES.items()
+        }
+        self.latency = latency
+        self.requests = 0
+        self._lock = threading.Lock()
+        self._server = None
+
+    def base_url(self, source: str) -> str:
+        return f"http://127.0.0.1:{self._server.server_address[1]}/{source}"
+
+    @property
+    def host(self) -> str:
+        return f"127.0.0.1:{self._server.server_address[1]}"
+
+    def _handler(self):
+        replay = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                url = urlsplit(self.path)
+                source, _, path = url.path.lstrip('/').partition('/')
+                page = next(
+                    (body for prefix, body in replay.pages.get(source, {}).items() if f"/{path}".startswith(prefix)),
+                    None
+                )
+                query = parse_qs(url.query)
+                if any(query.get(name, [first])[0] != first for name, first in FIRST_PAGE.items()):
+                    page = b"<html><body></body></html>"
+                with replay._lock:
+                    replay.requests += 1
+                if replay.latency:
+                    time.sleep(replay.latency)
+
+                self.send_response(200 if page is not None else 404)
+                self.send_header('Content-Type', 'text/html; charset=utf-8')
+                self.send_header('Content-Length', str(len(page or b"")))
+                self.end_headers()
+                self.wfile.write(page or b"")
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+    def __enter__(self):
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), self._handler())
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._server.shutdown()
+        self._server.server_close()
+
+@contextmanager
+def instrumented(timings: Dict[str, float]):
+    """
+    Time every fetch and every page parse made by the scrapers.
+
+    Fetches overlap, so network_seconds is summed per request and can
+    exceed wall time; parsing is synchronous CPU work.
+    """
+    original_get = AsyncFetcher.get
+    original_parse = job_scrapers.parse_html
+    original_extract = job_scrapers.extract_items
+
+    async def timed_get(fetcher, url):
+        start = time.perf_counter()
+        try:
+            return await original_get(fetcher, url)
+        finally:
+            timings['network_seconds'] += time.perf_counter() - start
+
+    def timed(function):
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                timings['parse_seconds'] += time.perf_counter() - start
+        return wrapper
+
+    AsyncFetcher.get = timed_get
+    job_scrapers.parse_html = timed(original_parse)
+    job_scrapers.extract_items = timed(original_extract)
+    try:
+        yield timings
+    finally:
+        AsyncFetcher.get = original_get
+        job_scrapers.parse_html = original_parse
+        job_scrapers.extract_items = original_extract
+
+def field_accuracy(source: str, jobs: List[Dict], base_url: str) -> float:
+    """
+    Fraction of expected listing fields (and descriptions) scraped exactly
+    """
+    expected = json.loads((FIXTURES / 'expected_fields.json').read_text())
+    cards = expected[f'{source}_listing']
+    checked = correct = 0
+
+    for job, card in zip(jobs, cards):
+        wanted = dict(card)
+        wanted['source_url'] = base_url + wanted.pop('href')
+        if source == 'indeed':
+            wanted['description'] = expected['indeed_detail']
+        for field, value in wanted.items():
+            checked += 1
+            correct += job.get(field) == value
+
+    checked += abs(len(cards) - len(jobs)) * len(cards[0])
+    return correct / checked if checked else 0.0
+
+def run_replay(sources: List[str] = None, rounds: int = 1, latency: float = 0.0) -> Dict[str, Dict]:
+    """
+    Scrape each source rounds times from the replay server and return
+    per-source metrics
+    """
+    sources = sources or list(SCRAPERS)
+    results = {}
+
+    with ReplayServer(latency=latency) as server:
+        saved_limits = settings.SCRAPER_HOST_RATE_LIMITS
+        # The stand-in server should not be throttled like a real site
+        settings.SCRAPER_HOST_RATE_LIMITS = {**saved_limits, server.host: 1000000.0}
+        try:
+            for source in sources:
+                scraper = SCRAPERS[source]()
+                scraper.base_url = server.base_url(source)
+                # Measure real fetches, not the on-disk page cache
+                scraper.cache = HTTPCache(None)
+                timings = {'network_seconds': 0.0, 'parse_seconds': 0.0}
+                requests_before = server.requests
+                jobs_scraped = 0
+                accuracy = 1.0
+
+                with instrumented(timings):
+                    start = time.perf_counter()
+                    for _ in range(rounds):
+                        jobs = scraper.scrape_jobs("python developer")
+                        jobs_scraped += len(jobs)
+                        accuracy = min(accuracy, field_accuracy(source, jobs, scraper.base_url))
+                    seconds = time.perf_counter() - start
+
+                pages = server.requests - requests_before
+                results[source] = {
+                    'rounds': rounds,
+                    'pages': pages,
+                    'jobs': jobs_scraped,
+                    'seconds': round(seconds, 4),
+                    'pages_per_second': round(pages / seconds, 1),
+                    'jobs_per_second': round(jobs_scraped / seconds, 1),
+                    'network_seconds': round(timings['network_seconds'], 4),
+                    'parse_seconds': round(timings['parse_seconds'], 4),
+                    'field_accuracy': round(accuracy, 4)
+                }
+        finally:
+            settings.SCRAPER_HOST_RATE_LIMITS = saved_limits
+
+    return results
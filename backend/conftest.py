@@ -3,6 +3,7 @@ Test configuration for the AI Agent Recruiter backend
 """
 import os
 import sys
+from datetime import datetime, timedelta
 from pathlib import Path
 
 # Add the app directory to the Python path
@@ -12,4 +13,51 @@ sys.path.insert(0, str(Path(__file__).parent / 'app'))
 os.environ['DATABASE_URL'] = 'sqlite:///./test_jobs.db'
 os.environ['OPENAI_API_KEY'] = 'test_key'
 os.environ['EMAIL_USERNAME'] = 'test@example.com'
-os.environ['EMAIL_PASSWORD'] = 'test_password'
\ No newline at end of file
+os.environ['EMAIL_PASSWORD'] = 'test_password'
+os.environ['SCRAPER_HTTP_CACHE_PATH'] = ''  # tests opt in with their own HTTPCache
+
+import pytest
+
+@pytest.fixture
+def db_session():
+    """In-memory database session with all tables created"""
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+    from sqlalchemy.pool import StaticPool
+    from app.models import Base
+
+    engine = create_engine(
+        'sqlite://',
+        connect_args={'check_same_thread': False},
+        poolclass=StaticPool
+    )
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+    try:
+        yield session
+    finally:
+        session.close()
+        engine.dispose()
+
+def make_job_row(i, hours_old=0, **overrides):
+    """
+    Job column values for the i-th test posting, posted hours_old hours
+    ago; overrides replace any column and the fingerprint follows them
+    """
+    from app.models import Job
+
+    row = {
+        'title': f"Python Developer {i}",
+        'company': "Acme",
+        'location': "Remote",
+        'description': "Corp to corp python role",
+        'requirements': "",
+        'source': "indeed",
+        'source_url': f"https://example.com/jobs/{i}",
+        'posted_date': datetime.utcnow() - timedelta(hours=hours_old),
+        'job_type': 'contract',
+        'is_corp_to_corp': i % 2 == 0
+    }
+    row.update(overrides)
+    row['fingerprint'] = Job.compute_fingerprint(row['title'], row['company'], row['location'], row['source_url'])
+    return row
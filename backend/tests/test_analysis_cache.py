@@ -0,0 +1,86 @@
+"""
+Tests for the content-addressed LLM analysis cache
+"""
+import json
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+import pytest
+from sqlalchemy.orm import sessionmaker
+from app.config import settings
+from app.models import AnalysisCacheEntry
+from app.services import ai_analysis
+from app.services.ai_analysis import AIAnalysisService
+from app.services.analysis_cache import AnalysisCache
+
+ANALYSIS = {"relevance_score": 0.9, "is_corp_to_corp": True, "key_skills": ["python"]}
+
+class FakeCompletions:
+    def __init__(self):
+        self.calls = 0
+
+    def create(self, **kwargs):
+        self.calls += 1
+        message = SimpleNamespace(content=json.dumps(ANALYSIS))
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+@pytest.fixture
+def cache(db_session):
+    return AnalysisCache(session_factory=sessionmaker(bind=db_session.get_bind()))
+
+@pytest.fixture
+def service(cache, monkeypatch):
+    monkeypatch.setattr(ai_analysis, 'analysis_cache', cache)
+    service = AIAnalysisService()
+    completions = FakeCompletions()
+    service.client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+    return service, completions
+
+def test_key_ignores_case_and_whitespace_but_not_prompt_version(cache):
+    key = cache.make_key("Python Dev", "C2C  role\n", "", 1, "gpt-3.5-turbo")
+
+    assert key == cache.make_key("python dev", " c2c role", None, 1, "gpt-3.5-turbo")
+    assert key != cache.make_key("python dev", "c2c role", "", 2, "gpt-3.5-turbo")
+    assert key != cache.make_key("python dev", "c2c role", "", 1, "gpt-4")
+
+def test_repost_skips_the_api_call(service, cache):
+    service, completions = service
+
+    first = service.analyze_job_description("Python Dev", "C2C role", "")
+    second = service.analyze_job_description("PYTHON DEV", "C2C   role", "")
+
+    assert first == second == ANALYSIS
+    assert completions.calls == 1
+    assert cache.get_stats()['hits'] == 1
+    assert cache.get_stats()['misses'] == 1
+
+def test_bypass_always_calls_the_api(service, cache, monkeypatch):
+    service, completions = service
+
+    service.analyze_job_description("Python Dev", "C2C role", "", use_cache=False)
+    monkeypatch.setattr(settings, 'ANALYSIS_CACHE_ENABLED', False)
+    service.analyze_job_description("Python Dev", "C2C role", "")
+
+    assert completions.calls == 2
+    assert cache.get_stats()['bypassed'] == 2
+    assert cache.get_stats()['writes'] == 0
+
+def test_expired_entries_are_misses(cache, db_session):
+    cache.put("old", ANALYSIS, "gpt-3.5-turbo", 1)
+    entry = db_session.get(AnalysisCacheEntry, "old")
+    entry.created_at = datetime.utcnow() - timedelta(days=settings.ANALYSIS_CACHE_TTL_DAYS + 1)
+    db_session.commit()
+
+    assert cache.get("old") is None
+    assert db_session.query(AnalysisCacheEntry).count() == 0
+
+def test_evict_drops_least_recently_used(cache, db_session, monkeypatch):
+    monkeypatch.setattr(settings, 'ANALYSIS_CACHE_MAX_ENTRIES', 2)
+    for key in ("a", "b", "c"):
+        cache.put(key, ANALYSIS, "gpt-3.5-turbo", 1)
+    db_session.query(AnalysisCacheEntry).filter_by(key="a").update(
+        {'last_used_at': datetime.utcnow() + timedelta(minutes=1)}
+    )
+    db_session.commit()
+
+    assert cache.evict() == 1
+    assert {key for (key,) in db_session.query(AnalysisCacheEntry.key)} == {"a", "c"}
@@ -0,0 +1,151 @@
+"""
+Tests for the concurrent LLM analysis stage, against a local fake OpenAI server
+"""
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+from sqlalchemy.orm import sessionmaker
+from app.config import settings
+from app.services import analysis_stage as analysis_stage_module
+from app.services.analysis_cache import AnalysisCache
+from app.services.analysis_stage import AnalysisStage
+
+REQUEST_DELAY = 0.2
+lock = threading.Lock()
+
+class FakeOpenAIHandler(BaseHTTPRequestHandler):
+    requests = []
+    fail_first = 0
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        prompt = body['messages'][-1]['content']
+        titles = re.findall(r'Title: (.*)', prompt)
+
+        cls = type(self)
+        with lock:
+            cls.requests.append(titles)
+            fail = cls.fail_first > 0
+            cls.fail_first -= 1
+
+        time.sleep(REQUEST_DELAY)
+        if fail:
+            self.respond(500, {'error': {'message': 'overloaded'}})
+            return
+
+        analyses = [{'relevance_score': 0.9, 'summary': title} for title in titles]
+        content = json.dumps({'analyses': analyses} if 'Posting 1:' in prompt else analyses[0])
+        self.respond(200, {
+            'id': 'chatcmpl-test', 'object': 'chat.completion', 'created': 0, 'model': body['model'],
+            'choices': [{'index': 0, 'finish_reason': 'stop', 'message': {'role': 'assistant', 'content': content}}]
+        })
+
+    def respond(self, status, payload):
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+@pytest.fixture
+def fake_openai(monkeypatch):
+    monkeypatch.setattr(settings, 'ANALYSIS_CACHE_ENABLED', False)
+    FakeOpenAIHandler.requests = []
+    FakeOpenAIHandler.fail_first = 0
+    server = ThreadingHTTPServer(('127.0.0.1', 0), FakeOpenAIHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/v1"
+    server.shutdown()
+
+def make_jobs(count, description="Corp to corp Python role"):
+    return [{'title': f"Python Developer {i}", 'description': description, 'requirements': ""} for i in range(count)]
+
+def test_requests_run_concurrently(fake_openai):
+    stage = AnalysisStage(api_key="test", base_url=fake_openai, max_in_flight=10, pack_size=1)
+    jobs = make_jobs(20)
+
+    start = time.perf_counter()
+    analyses = stage.analyze(jobs)
+    elapsed = time.perf_counter() - start
+
+    assert [analysis['summary'] for analysis in analyses] == [job['title'] for job in jobs]
+    assert stage.last_run_stats['requests'] == 20
+    # Sequential calls would take 20 * REQUEST_DELAY
+    assert elapsed < 20 * REQUEST_DELAY / 2
+
+def test_short_postings_are_packed(fake_openai):
+    stage = AnalysisStage(api_key="test", base_url=fake_openai, pack_size=4, pack_max_chars=100)
+    jobs = make_jobs(6) + make_jobs(1, description="x" * 200)
+
+    analyses = stage.analyze(jobs)
+
+    assert [analysis['summary'] for analysis in analyses] == [job['title'] for job in jobs]
+    assert sorted(len(titles) for titles in FakeOpenAIHandler.requests) == [1, 2, 4]
+    assert stage.last_run_stats['packed_requests'] == 2
+
+def test_failed_requests_are_retried(fake_openai):
+    FakeOpenAIHandler.fail_first = 2
+    stage = AnalysisStage(api_key="test", base_url=fake_openai, pack_size=1, max_retries=3, retry_base_delay=0.01)
+
+    analyses = stage.analyze(make_jobs(2))
+
+    assert all(analysis['relevance_score'] == 0.9 for analysis in analyses)
+    assert stage.last_run_stats['retries'] == 2
+    assert stage.last_run_stats['fallbacks'] == 0
+
+def test_timeouts_fall_back_to_local_analysis(fake_openai):
+    stage = AnalysisStage(api_key="test", base_url=fake_openai, pack_size=1, max_retries=0, timeout=REQUEST_DELAY / 4)
+
+    analyses = stage.analyze(make_jobs(1))
+
+    assert analyses[0]['is_corp_to_corp']
+    assert analyses[0]['summary'].startswith("This is a")
+    assert stage.last_run_stats['fallbacks'] == 1
+
+def test_cached_jobs_skip_the_server(fake_openai, db_session, monkeypatch):
+    monkeypatch.setattr(settings, 'ANALYSIS_CACHE_ENABLED', True)
+    monkeypatch.setattr(
+        analysis_stage_module, 'analysis_cache',
+        AnalysisCache(session_factory=sessionmaker(bind=db_session.get_bind()))
+    )
+    stage = AnalysisStage(api_key="test", base_url=fake_openai, pack_size=1)
+
+    stage.analyze(make_jobs(3))
+    stage.analyze(make_jobs(3))
+
+    assert len(FakeOpenAIHandler.requests) == 3
+    assert stage.last_run_stats['cache_hits'] == 3
+
+def test_tiered_mode_only_escalates_uncertain_jobs(fake_openai):
+    stage = AnalysisStage(api_key="test", base_url=fake_openai, pack_size=1, tiered=True, audit_sample_rate=0.0)
+    jobs = [
+        {'title': "Office Manager", 'description': "Front desk duties", 'requirements': ""},
+        {'title': "Python Developer", 'description': "C2C contract", 'requirements': ""},
+    ]
+
+    analyses = stage.analyze(jobs)
+
+    assert analyses[0]['relevance_score'] == 0.0
+    assert analyses[1]['summary'] == "Python Developer"
+    assert FakeOpenAIHandler.requests == [["Python Developer"]]
+    assert stage.last_run_stats['local_only'] == 1
+    assert stage.last_run_stats['escalated'] == 1
+
+def test_audit_sample_measures_disagreement(fake_openai):
+    stage = AnalysisStage(api_key="test", base_url=fake_openai, pack_size=1, tiered=True, audit_sample_rate=1.0)
+    jobs = [{'title': "Office Manager", 'description': "Front desk duties", 'requirements': ""}]
+
+    analyses = stage.analyze(jobs)
+
+    # The fake LLM scores 0.9 where the local tier scored 0.0
+    assert analyses[0]['relevance_score'] == 0.9
+    assert stage.get_tier_stats()['audited'] == 1
+    assert stage.get_tier_stats()['audit_disagreement_rate'] == 1.0
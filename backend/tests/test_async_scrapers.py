@@ -0,0 +1,138 @@
+"""
+Tests for the async scraper fetch layer
+"""
+import asyncio
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+from app.config import settings
+from app.scrapers.http_client import HostConnectionSlots, SharedFetches, run_sync
+from app.scrapers.job_scrapers import IndeedScraper
+
+DETAIL_DELAY = 0.2
+CARD_COUNT = 5
+
+LISTING_HTML = "<html><body>" + "".join(
+    f"""
+    <div class="job_seen_beacon">
+      <h2 class="jobTitle"><a href="/viewjob?jk={i}">Python Developer {i}</a></h2>
+      <span class="companyName">Acme {i}</span>
+      <div class="companyLocation">Remote</div>
+      <span class="date">Just posted</span>
+    </div>
+    """
+    for i in range(CARD_COUNT)
+) + "</body></html>"
+
+class FakeIndeedHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.startswith('/jobs'):
+            body = LISTING_HTML
+        else:
+            time.sleep(DETAIL_DELAY)
+            jk = self.path.rsplit('=', 1)[-1]
+            body = f'<div class="jobsearch-jobDescriptionText"><p>Corp to corp  role {jk}</p></div>'
+        payload = body.encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+@pytest.fixture
+def fake_indeed(monkeypatch):
+    monkeypatch.setattr(settings, 'SCRAPER_RATE_LIMIT_PER_SECOND', 1000.0)
+    monkeypatch.setattr(settings, 'SCRAPER_RATE_LIMIT_BURST', 100)
+    monkeypatch.setattr(settings, 'SCRAPER_MAX_CONNECTIONS_PER_HOST', CARD_COUNT)
+    server = ThreadingHTTPServer(('127.0.0.1', 0), FakeIndeedHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+
+def test_indeed_detail_pages_are_fetched_in_parallel(fake_indeed):
+    scraper = IndeedScraper()
+    scraper.base_url = fake_indeed
+
+    start = time.perf_counter()
+    jobs = scraper.scrape_jobs("python developer")
+    elapsed = time.perf_counter() - start
+
+    assert len(jobs) == CARD_COUNT
+    assert elapsed < CARD_COUNT * DETAIL_DELAY
+    assert jobs[0]['title'] == 'Python Developer 0'
+    assert jobs[3]['description'] == 'Corp to corp role 3'
+
+def test_shared_fetches_run_each_url_once_across_threads():
+    shared = SharedFetches()
+    calls = []
+
+    async def produce():
+        calls.append(1)
+        await asyncio.sleep(0.1)
+        return "description"
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(run_sync(shared.run("http://example.com/job/1", produce))))
+        for _ in range(4)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == ["description"] * 4
+    assert len(calls) == 1
+    assert shared.hits == 3
+
+def test_host_slots_cap_concurrency_across_threads_and_loops():
+    slots = HostConnectionSlots()
+    active, peak = [0], [0]
+    lock = threading.Lock()
+
+    async def request():
+        async with slots.slot("example.com", 2):
+            with lock:
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+            await asyncio.sleep(0.02)
+            with lock:
+                active[0] -= 1
+
+    async def fetcher_run():
+        await asyncio.gather(*(request() for _ in range(5)))
+
+    # Two scraping tasks for one source, each on its own thread and event loop
+    threads = [threading.Thread(target=lambda: run_sync(fetcher_run())) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert peak[0] == 2
+    assert slots._in_use["example.com"] == 0
+
+def test_host_slot_handed_to_a_cancelled_waiter_is_released():
+    slots = HostConnectionSlots()
+
+    async def scenario():
+        await slots.acquire("example.com", 1)
+        waiter = asyncio.ensure_future(slots.acquire("example.com", 1))
+        await asyncio.sleep(0)
+
+        # The slot reaches the waiter, which is cancelled before it resumes
+        slots.release("example.com")
+        await asyncio.sleep(0)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+
+        await asyncio.wait_for(slots.acquire("example.com", 1), timeout=1)
+
+    run_sync(scenario())
+    assert slots._in_use["example.com"] == 1
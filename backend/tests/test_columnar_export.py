@@ -0,0 +1,95 @@
+"""
+Tests for Arrow/Parquet exports and daily Parquet snapshots
+"""
+import io
+from datetime import date, datetime, timedelta
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from sqlalchemy.orm import sessionmaker
+from app.config import settings
+from app.main import app
+from app.models import Job
+from app.models.schemas import JobExportRequest
+from app.services.job_export import JobExporter, job_exporter
+
+pa = pytest.importorskip("pyarrow")
+pq = pytest.importorskip("pyarrow.parquet")
+
+DAY = date(2024, 3, 10)
+
+@pytest.fixture
+def exporter(db_session, monkeypatch):
+    for i in range(30):
+        db_session.add(Job(
+            title=f"Developer {i}", company="Acme", location="Remote", description="python " * 50,
+            source="dice" if i % 3 else "indeed", source_url=f"https://example.com/{i}",
+            relevance_score=i / 30, salary_min=None if i % 2 else 100000.0, posted_date=datetime(2024, 3, 9),
+            scraped_date=datetime.combine(DAY, datetime.min.time()) + timedelta(hours=i - 5)
+        ))
+    db_session.commit()
+    session_factory = sessionmaker(bind=db_session.get_bind())
+    monkeypatch.setattr(job_exporter, 'session_factory', session_factory)
+    monkeypatch.setattr(settings, 'EXPORT_ARROW_BATCH_ROWS', 8)
+    return JobExporter(session_factory)
+
+def read_parquet(source):
+    # use_threads=False: pyarrow's reader threads can abort interpreter exit here
+    return pq.read_table(source, use_threads=False)
+
+def test_arrow_stream_has_typed_selected_columns_in_batches(exporter):
+    data = b"".join(exporter.stream(JobExportRequest(format='arrow', columns="title,salary_min,posted_date")))
+
+    reader = pa.ipc.open_stream(data)
+    batches = list(reader)
+    assert reader.schema.names == ['id', 'title', 'salary_min', 'posted_date']
+    assert reader.schema.field('posted_date').type == pa.timestamp('us')
+    assert [batch.num_rows for batch in batches] == [8, 8, 8, 6]
+    assert pa.Table.from_batches(batches).column('salary_min').null_count == 15
+
+def test_parquet_export_applies_filters_as_sql(exporter):
+    data = b"".join(exporter.stream(JobExportRequest(format='parquet', source="indeed", min_relevance_score=0.5)))
+
+    table = read_parquet(io.BytesIO(data))
+    assert table.num_rows == 5
+    assert set(table.column('source').to_pylist()) == {"indeed"}
+    assert 'description' in table.schema.names
+
+def test_snapshot_partitions_hold_one_scrape_day(exporter, tmp_path):
+    path = exporter.write_snapshot(DAY, str(tmp_path))
+
+    assert path == tmp_path / "scrape_day=2024-03-10" / "jobs.parquet"
+    table = read_parquet(path)
+    assert table.num_rows == 24
+    assert 'ai_analysis' in table.schema.names
+    assert not list(path.parent.glob("*.tmp"))
+
+def test_snapshot_day_query_seeks_the_scraped_date_index(exporter, db_session):
+    start = datetime.combine(DAY, datetime.min.time())
+    statement = db_session.query(Job.id).filter(
+        Job.scraped_date >= start, Job.scraped_date < start + timedelta(days=1)
+    ).order_by(Job.id).statement
+    compiled = statement.compile(dialect=db_session.get_bind().dialect, compile_kwargs={'literal_binds': True})
+    plan = " ".join(str(row) for row in db_session.execute(text(f"EXPLAIN QUERY PLAN {compiled}")))
+
+    assert 'ix_jobs_scraped_date' in plan
+
+def test_pending_snapshots_skip_written_days_and_today(exporter, tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, 'EXPORT_SNAPSHOT_BACKFILL_DAYS', 3)
+    exporter.write_snapshot(DAY - timedelta(days=1), str(tmp_path))
+
+    written = exporter.write_pending_snapshots(today=DAY + timedelta(days=1), directory=str(tmp_path))
+
+    assert [path.parent.name for path in written] == ["scrape_day=2024-03-08", "scrape_day=2024-03-10"]
+    dataset = read_parquet(tmp_path)
+    assert dataset.num_rows == 29  # the last job was scraped the next day
+
+def test_endpoint_rejects_unknown_columns(exporter):
+    client = TestClient(app)
+
+    ok = client.get("/api/export/jobs", params={'format': 'parquet', 'columns': "title"})
+    bad = client.get("/api/export/jobs", params={'format': 'arrow', 'columns': "title,fingerprint"})
+
+    assert ok.headers['content-type'] == 'application/vnd.apache.parquet'
+    assert read_parquet(io.BytesIO(ok.content)).num_rows == 30
+    assert bad.status_code == 400
@@ -0,0 +1,57 @@
+"""
+Tests for the pluggable HTML parser and field extraction, over saved fixture pages
+"""
+import json
+from pathlib import Path
+import pytest
+from app.scrapers.html_parser import Selector, available_backends, extract_items, parse_html
+from app.scrapers.job_scrapers import DICE_CARD, INDEED_CARD, INDEED_DESCRIPTION, DiceScraper, IndeedScraper
+
+FIXTURES = Path(__file__).parent / 'fixtures'
+EXPECTED = json.loads((FIXTURES / 'expected_fields.json').read_text())
+
+def fixture(name: str) -> bytes:
+    return (FIXTURES / name).read_bytes()
+
+@pytest.mark.parametrize('backend', available_backends())
+def test_listing_fields_match_fixtures(backend):
+    for page, spec in (('indeed_listing', INDEED_CARD), ('dice_listing', DICE_CARD)):
+        cards = extract_items(fixture(f'{page}.html'), spec, backend)
+        expected = EXPECTED[page]
+
+        assert len(cards) == len(expected)
+        for card, fields in zip(cards, expected):
+            assert {key: card[key] for key in fields} == fields
+
+@pytest.mark.parametrize('backend', available_backends())
+def test_detail_description_matches_fixture(backend):
+    description = parse_html(fixture('indeed_detail.html'), backend).select_one(INDEED_DESCRIPTION)
+
+    assert description.text() == EXPECTED['indeed_detail']
+
+@pytest.mark.parametrize('backend', available_backends())
+def test_select_searches_descendants_only(backend):
+    root = parse_html('<div class="a"><div class="a">inner</div></div>', backend)
+    outer = root.select_one(Selector('div.a'))
+
+    assert [node.text() for node in outer.select(Selector('div.a'))] == ["inner"]
+
+def test_clean_text_skips_parsing_plain_text(monkeypatch):
+    from app.scrapers import job_scrapers
+    scraper = IndeedScraper()
+    monkeypatch.setattr(job_scrapers, 'parse_html', lambda text: pytest.fail("plain text was parsed"))
+
+    assert scraper.clean_text("  Senior\n Python   Developer ") == "Senior Python Developer"
+
+def test_clean_text_strips_markup():
+    assert IndeedScraper().clean_text("<p>Corp to <b>Corp</b> &amp; W2</p>") == "Corp to Corp & W2"
+
+def test_scrapers_build_jobs_from_card_fields():
+    indeed = IndeedScraper()
+    jobs = [indeed._extract_job_data(card) for card in extract_items(fixture('indeed_listing.html'), INDEED_CARD)]
+    assert jobs[0]['source_url'] == indeed.base_url + EXPECTED['indeed_listing'][0]['href']
+    assert all(job['posted_date'] is not None for job in jobs)
+
+    dice = DiceScraper()
+    jobs = [dice._extract_dice_job_data(card) for card in extract_items(fixture('dice_listing.html'), DICE_CARD)]
+    assert jobs[0]['description'] == EXPECTED['dice_listing'][0]['description']
@@ -0,0 +1,136 @@
+"""
+Tests for conditional GETs and the scraped description cache
+"""
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+from app.config import settings
+from app.models import Job
+from app.scrapers.http_cache import HTTPCache
+from app.scrapers.http_client import AsyncFetcher, run_sync
+from app.scrapers.job_scrapers import IndeedScraper
+
+CARD_COUNT = 3
+
+LISTING_HTML = "<html><body>" + "".join(
+    f"""
+    <div class="job_seen_beacon">
+      <h2 class="jobTitle"><a href="/viewjob?jk={i}">Python Developer {i}</a></h2>
+      <span class="companyName">Acme {i}</span>
+      <div class="companyLocation">Remote</div>
+    </div>
+    """
+    for i in range(CARD_COUNT)
+) + "</body></html>"
+
+class ETagHandler(BaseHTTPRequestHandler):
+    requests = []
+
+    def do_GET(self):
+        if self.path.startswith('/jobs'):
+            body = LISTING_HTML
+        else:
+            jk = self.path.rsplit('=', 1)[-1]
+            body = f'<div class="jobsearch-jobDescriptionText"><p>C2C role {jk}</p></div>'
+        etag = f'"{hash(body) & 0xffffffff:x}"'
+        not_modified = self.headers.get('If-None-Match') == etag
+        ETagHandler.requests.append((self.path, 304 if not_modified else 200))
+
+        if not_modified:
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.end_headers()
+            return
+        payload = body.encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html')
+        self.send_header('Content-Length', str(len(payload)))
+        self.send_header('ETag', etag)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+@pytest.fixture
+def etag_server(monkeypatch):
+    monkeypatch.setattr(settings, 'SCRAPER_RATE_LIMIT_PER_SECOND', 1000.0)
+    monkeypatch.setattr(settings, 'SCRAPER_RATE_LIMIT_BURST', 100)
+    ETagHandler.requests = []
+    server = ThreadingHTTPServer(('127.0.0.1', 0), ETagHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+@pytest.fixture
+def cache(tmp_path):
+    return HTTPCache(str(tmp_path / 'http_cache.db'))
+
+def test_second_fetch_is_conditional_and_served_from_cache(etag_server, cache):
+    async def fetch_twice():
+        async with AsyncFetcher(cache=cache) as fetcher:
+            return await fetcher.get(f"{etag_server}/jobs"), await fetcher.get(f"{etag_server}/jobs")
+
+    first, second = run_sync(fetch_twice())
+
+    assert first == second == LISTING_HTML.encode()
+    assert [status for _, status in ETagHandler.requests] == [200, 304]
+    stats = cache.get_stats()
+    assert stats['conditional_requests'] == 1
+    assert stats['not_modified'] == 1
+    assert stats['bytes_saved'] == len(first)
+
+def test_fresh_descriptions_skip_detail_fetches(etag_server, cache):
+    scraper = IndeedScraper()
+    scraper.base_url = etag_server
+    scraper.cache = cache
+
+    first = scraper.scrape_jobs("python developer")
+    ETagHandler.requests = []
+    second = scraper.scrape_jobs("python developer")
+
+    assert [job['description'] for job in second] == [job['description'] for job in first]
+    assert first[0]['description'] == "C2C role 0"
+    # Only the listing page is requested again, and it is revalidated
+    assert len(ETagHandler.requests) == 1
+    assert ETagHandler.requests[0][1] == 304
+    assert cache.get_stats()['description_hits'] == CARD_COUNT
+
+def test_expired_descriptions_are_refetched(etag_server, tmp_path):
+    cache = HTTPCache(str(tmp_path / 'http_cache.db'), description_ttl_hours=0)
+    scraper = IndeedScraper()
+    scraper.base_url = etag_server
+    scraper.cache = cache
+
+    scraper.scrape_jobs("python developer")
+    ETagHandler.requests = []
+    scraper.scrape_jobs("python developer")
+
+    assert sum(1 for path, _ in ETagHandler.requests if path.startswith('/viewjob')) == CARD_COUNT
+
+def test_known_jobs_skip_detail_fetches(etag_server, cache):
+    scraper = IndeedScraper()
+    scraper.base_url = etag_server
+    scraper.cache = cache
+    known = Job.compute_fingerprint("Python Developer 1", "Acme 1", "Remote", f"{etag_server}/viewjob?jk=1")
+    scraper.known_fingerprints = lambda fingerprints: {known} & set(fingerprints)
+
+    jobs = scraper.scrape_jobs("python developer")
+
+    detail_paths = [path for path, _ in ETagHandler.requests if path.startswith('/viewjob')]
+    # The stored posting is dropped before its detail page is fetched
+    assert len(jobs) == CARD_COUNT - 1
+    assert '/viewjob?jk=1' not in detail_paths
+    assert len(detail_paths) == CARD_COUNT - 1
+    assert cache.get_stats()['detail_fetches_skipped_known'] == 1
+
+def test_disabled_cache_stores_nothing():
+    cache = HTTPCache(None)
+
+    cache.store("http://example.com", {'ETag': '"x"'}, b"body")
+    cache.set_description("http://example.com", "text")
+
+    assert cache.lookup("http://example.com") is None
+    assert cache.get_description("http://example.com") is None
+    assert cache.get_stats()['enabled'] is False
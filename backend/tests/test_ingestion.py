@@ -0,0 +1,104 @@
+"""
+Tests for batched job ingestion
+"""
+from datetime import datetime
+from app.models import Job
+from app.services import job_service as job_service_module
+from app.services.ingestion import JobIngestionPipeline
+from app.services.job_service import JobService
+from conftest import make_job_row as make_row
+
+def test_pipeline_writes_in_batches(db_session):
+    with JobIngestionPipeline(db_session, batch_size=4) as pipeline:
+        for i in range(10):
+            pipeline.add(make_row(i))
+
+    assert db_session.query(Job).count() == 10
+    assert pipeline.stats['batches'] == 3
+    assert pipeline.stats['new_jobs'] == 10
+    assert pipeline.stats['corp_to_corp_jobs'] == 5
+
+def test_failed_batch_falls_back_to_single_rows(db_session):
+    with JobIngestionPipeline(db_session, batch_size=5) as pipeline:
+        for i in range(5):
+            pipeline.add(make_row(i, posted_date="not a date" if i == 2 else datetime.utcnow()))
+
+    assert db_session.query(Job).count() == 4
+    assert pipeline.stats['new_jobs'] == 4
+    assert pipeline.stats['failed_jobs'] == 1
+
+def test_scrape_and_store_counters(db_session, monkeypatch):
+    service = JobService()
+    db_session.add(Job(**make_row(0)))
+    db_session.commit()
+
+    scraped = [make_row(0), make_row(1), make_row(1), make_row(2)]
+    for job_data in scraped:
+        del job_data['fingerprint']
+    monkeypatch.setattr(service.engine, 'run', lambda terms, location: (scraped, {}))
+    monkeypatch.setattr(job_service_module, 'get_db', lambda: iter([db_session]))
+    monkeypatch.setattr(
+        job_service_module.analysis_stage, 'analyze',
+        lambda jobs: [{'is_corp_to_corp': True, 'relevance_score': 0.5} for _ in jobs]
+    )
+
+    results = service.scrape_and_store_jobs("python developer")
+
+    assert results['total_scraped'] == 4
+    assert results['duplicates_filtered'] == 2
+    assert results['new_jobs'] == 2
+    assert results['corp_to_corp_jobs'] == 2
+    assert db_session.query(Job).filter(Job.fingerprint == make_row(2)['fingerprint']).count() == 1
+
+def test_scrape_and_store_counts_postings_skipped_while_paginating(db_session, monkeypatch):
+    service = JobService()
+
+    def run(terms, location):
+        service.engine.last_run_stats = {'known_skipped': 3}
+        return [make_row(5)], {}
+    monkeypatch.setattr(service.engine, 'run', run)
+    monkeypatch.setattr(job_service_module, 'get_db', lambda: iter([db_session]))
+    monkeypatch.setattr(
+        job_service_module.analysis_stage, 'analyze',
+        lambda jobs: [{'is_corp_to_corp': False, 'relevance_score': 0.5} for _ in jobs]
+    )
+
+    results = service.scrape_and_store_jobs("python developer")
+
+    assert results['total_scraped'] == 4
+    assert results['duplicates_filtered'] == 3
+    assert results['new_jobs'] == 1
+
+def test_fingerprint_backfill_on_existing_table(tmp_path):
+    from sqlalchemy import create_engine, inspect, text
+    from app.models import Base
+    from app.models.migrations import upgrade_schema
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'old.db'}")
+    with engine.begin() as conn:
+        conn.execute(text(
+            'CREATE TABLE jobs (id INTEGER PRIMARY KEY, title VARCHAR, company VARCHAR, '
+            'location VARCHAR, source_url VARCHAR)'
+        ))
+        conn.execute(
+            text('INSERT INTO jobs (title, company, location, source_url) VALUES (:t, :c, :l, :u)'),
+            [
+                {'t': 'Dev', 'c': 'Acme', 'l': 'Remote', 'u': 'https://example.com/1'},
+                {'t': 'Dev', 'c': 'Acme', 'l': 'Remote', 'u': 'https://example.com/1'},
+                {'t': 'QA', 'c': 'Acme', 'l': 'Remote', 'u': 'https://example.com/2'},
+            ]
+        )
+
+    # Same sequence as create_tables(): new tables first, then upgrades
+    Base.metadata.create_all(bind=engine)
+    upgrade_schema(engine)
+
+    with engine.connect() as conn:
+        fingerprints = [row[0] for row in conn.execute(text('SELECT fingerprint FROM jobs ORDER BY id'))]
+    indexes = {index['name']: index for index in inspect(engine).get_indexes('jobs')}
+
+    assert fingerprints[0] == Job.compute_fingerprint('Dev', 'Acme', 'Remote', 'https://example.com/1')
+    assert fingerprints[1] is None
+    assert fingerprints[2] is not None
+    assert indexes['ix_jobs_fingerprint']['unique']
+    assert 'ix_jobs_scraped_date' in indexes
@@ -0,0 +1,72 @@
+"""
+Tests for streaming job exports
+"""
+import csv
+import gzip
+import io
+import json
+from datetime import datetime
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import sessionmaker
+from app.config import settings
+from app.main import app
+from app.models import Job
+from app.models.schemas import JobExportRequest
+from app.models.search_index import create_search_index
+from app.services.job_export import JobExporter, job_exporter
+
+@pytest.fixture
+def exporter(db_session, monkeypatch):
+    create_search_index(db_session.get_bind())
+    for i in range(30):
+        db_session.add(Job(
+            title=f"Developer {i}", company="Acme, Inc.", location="Remote",
+            description="python contract" if i % 2 else "java contract", source="dice" if i % 3 else "indeed",
+            source_url=f"https://example.com/{i}", relevance_score=0.5, posted_date=datetime(2024, 1, 1)
+        ))
+    db_session.commit()
+    session_factory = sessionmaker(bind=db_session.get_bind())
+    monkeypatch.setattr(job_exporter, 'session_factory', session_factory)
+    return JobExporter(session_factory)
+
+def export(exporter, **params) -> bytes:
+    return b"".join(exporter.stream(JobExportRequest(**params)))
+
+def test_ndjson_has_one_record_per_job(exporter):
+    records = [json.loads(line) for line in export(exporter, format='ndjson').decode().splitlines()]
+
+    assert len(records) == 30
+    assert records[0]['posted_date'] == "2024-01-01T00:00:00"
+    assert records[0]['description'] == "java contract"
+
+def test_json_keeps_its_envelope_and_is_valid_even_when_empty(exporter):
+    document = json.loads(export(exporter))
+    assert document['format'] == "json"
+    assert len(document['data']) == 30
+    assert json.loads(export(exporter, source="linkedin")) == {"data": [], "format": "json"}
+
+def test_csv_is_quoted_and_gzip_round_trips(exporter):
+    rows = list(csv.reader(io.StringIO(gzip.decompress(export(exporter, format='csv', gzip=True)).decode())))
+
+    assert rows[0][:3] == ['ID', 'Title', 'Company']
+    assert len(rows) == 31
+    assert rows[1][2] == "Acme, Inc."
+
+def test_output_is_streamed_in_chunks(exporter, monkeypatch):
+    monkeypatch.setattr(settings, 'EXPORT_BATCH_SIZE', 4)
+    monkeypatch.setattr(settings, 'EXPORT_CHUNK_BYTES', 512)
+
+    chunks = list(exporter.stream(JobExportRequest(format='ndjson')))
+
+    assert len(chunks) > 5
+    assert sum(len(chunk.splitlines()) for chunk in chunks) == 30
+
+def test_endpoint_applies_search_filters(exporter):
+    response = TestClient(app).get("/api/export/jobs", params={'format': 'ndjson', 'keywords': "python", 'source': "dice"})
+
+    records = [json.loads(line) for line in response.text.splitlines()]
+    assert response.headers['content-type'].startswith('application/x-ndjson')
+    assert 'jobs.ndjson' in response.headers['content-disposition']
+    assert len(records) == 10
+    assert all(record['source'] == "dice" and "python" in record['description'] for record in records)
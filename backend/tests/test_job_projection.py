@@ -0,0 +1,76 @@
+"""
+Tests for column projection of job listings and searches
+"""
+from datetime import datetime
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from app.main import app
+from app.models import Job, get_db
+from app.models.search_index import create_search_index
+from app.services.job_service import DESCRIPTION_PREVIEW_CHARS
+
+@pytest.fixture
+def client(db_session):
+    create_search_index(db_session.get_bind())
+    for i in range(12):
+        db_session.add(Job(
+            title=f"Developer {i}", company="Acme", location="Remote",
+            description="python contract " * 100, requirements="Python", ai_analysis='{"summary": "ok"}',
+            source="indeed", source_url=f"https://example.com/{i}", relevance_score=i / 12,
+            posted_date=datetime.utcnow()
+        ))
+    db_session.commit()
+    app.dependency_overrides[get_db] = lambda: db_session
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+
+@pytest.fixture
+def statements(db_session):
+    executed = []
+    def record(conn, cursor, statement, parameters, context, executemany):
+        executed.append(statement)
+    engine = db_session.get_bind()
+    event.listen(engine, "before_cursor_execute", record)
+    yield executed
+    event.remove(engine, "before_cursor_execute", record)
+
+def test_listing_leaves_out_full_text_columns(client, statements):
+    jobs = client.get("/api/jobs", params={'limit': 5}).json()
+
+    assert len(jobs) == 5
+    assert 'description' not in jobs[0] and 'ai_analysis' not in jobs[0]
+    assert len(jobs[0]['description_preview']) == DESCRIPTION_PREVIEW_CHARS
+    select = next(statement for statement in statements if 'FROM jobs' in statement)
+    assert 'jobs.description AS' not in select
+    assert 'jobs.ai_analysis' not in select
+
+def test_fields_selects_only_requested_columns_and_keeps_paging(client):
+    first = client.get("/api/jobs", params={'limit': 10, 'fields': "title, company"})
+    second = client.get("/api/jobs", params={'limit': 10, 'fields': "title,company", 'cursor': first.headers['X-Next-Cursor']})
+    legacy = client.get("/api/jobs", params={'skip': 10, 'fields': "title"})
+
+    assert set(first.json()[0]) == {'id', 'title', 'company'}
+    assert len(first.json()) + len(second.json()) == 12
+    assert [job['id'] for job in legacy.json()] == [job['id'] for job in second.json()]
+
+def test_search_projection_keeps_score_and_snippet(client):
+    jobs = client.post("/api/jobs/search", params={'fields': "title"}, json={'keywords': "python", 'limit': 3}).json()
+
+    assert len(jobs) == 3
+    assert set(jobs[0]) == {'id', 'title', 'search_score', 'snippet'}
+    assert "<mark>python</mark>" in jobs[0]['snippet']
+
+def test_unknown_field_is_rejected(client):
+    response = client.get("/api/jobs", params={'fields': "title,fingerprint"})
+
+    assert response.status_code == 400
+    assert 'fingerprint' in response.json()['detail']
+
+def test_detail_endpoint_has_full_text(client):
+    job_id = client.get("/api/jobs", params={'limit': 1}).json()[0]['id']
+
+    job = client.get(f"/api/jobs/{job_id}").json()
+
+    assert job['description'].startswith("python contract")
+    assert job['ai_analysis']
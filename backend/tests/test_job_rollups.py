@@ -0,0 +1,120 @@
+"""
+Tests for the incrementally maintained job stats rollups
+"""
+from datetime import datetime, timedelta
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import desc, func
+from app.main import app
+from app.models import Job, JobRollup, get_db
+from app.services.ingestion import JobIngestionPipeline
+from app.services.job_rollups import job_rollups
+from app.services.job_service import JobService
+from app.utils.job_utils import JobDuplicateDetector, JobRelevanceScorer
+from conftest import make_job_row
+
+NOW = datetime.utcnow()
+
+def make_row(i, **overrides):
+    # Repeating values so every dimension has several buckets
+    values = {
+        'title': ["Python Developer", "Java Engineer", "Data Analyst"][i % 3],
+        'company': ["Acme", "Globex", "Initech"][i % 3],
+        'location': ["Remote", "Austin, TX"][i % 2],
+        'description': f"Contract role {i}",
+        'source': ["indeed", "dice"][i % 2],
+        'posted_date': NOW - timedelta(hours=i * 7),
+        'job_type': ["contract", "full-time", None][i % 3],
+        'is_corp_to_corp': i % 4 == 0,
+        'relevance_score': (i % 10) / 10,
+        'salary_min': None if i % 5 == 0 else 50000.0 + i * 2000,
+        'salary_max': None if i % 3 == 0 else 90000.0 + i * 2000
+    }
+    values.update(overrides)
+    return make_job_row(i, **values)
+
+@pytest.fixture
+def ingested(db_session):
+    with JobIngestionPipeline(db_session, batch_size=7) as pipeline:
+        for i in range(40):
+            pipeline.add(make_row(i))
+    return db_session
+
+def scanned_stats(db):
+    """
+    The full-scan queries the rollups replaced
+    """
+    return {
+        'total_jobs': db.query(Job).count(),
+        'corp_to_corp_jobs': db.query(Job).filter(Job.is_corp_to_corp == True).count(),
+        'jobs_last_24h': db.query(Job).filter(Job.posted_date >= NOW - timedelta(hours=24)).count(),
+        'avg_relevance_score': round(db.query(func.avg(Job.relevance_score)).scalar() or 0.0, 2),
+        'top_companies': [
+            {'company': company, 'count': count} for company, count in db.query(Job.company, func.count(Job.id).label('n'))
+            .group_by(Job.company).order_by(desc('n'), Job.company).limit(10)
+        ]
+    }
+
+def test_stats_from_rollups_match_full_scans(ingested):
+    stats = JobService().get_job_stats(ingested).model_dump()
+
+    expected = scanned_stats(ingested)
+    for key, value in expected.items():
+        assert stats[key] == value, key
+    assert job_rollups.check(ingested)['consistent']
+
+def test_deletes_and_rescoring_keep_rollups_consistent(ingested):
+    JobService().delete_old_jobs(ingested, days_old=5)
+    assert job_rollups.check(ingested)['consistent']
+    assert not ingested.query(JobRollup).filter(JobRollup.job_count <= 0).count()
+
+    removed = JobDuplicateDetector().remove_duplicates(ingested)
+    assert removed > 0
+    assert job_rollups.check(ingested)['consistent']
+
+    JobRelevanceScorer().update_job_scores(ingested, force=True)
+    assert job_rollups.check(ingested)['consistent']
+    assert JobService().get_job_stats(ingested).avg_relevance_score == scanned_stats(ingested)['avg_relevance_score']
+
+def test_last_24h_is_exact_inside_the_boundary_hour(db_session):
+    since = NOW.replace(minute=30) - timedelta(hours=24)
+    with JobIngestionPipeline(db_session) as pipeline:
+        for i, posted_date in enumerate([since - timedelta(minutes=1), since, since + timedelta(minutes=20), NOW]):
+            pipeline.add(make_row(i, posted_date=posted_date))
+
+    assert job_rollups.count_since(db_session, since) == 3
+
+def test_salary_and_trending_analytics(ingested):
+    app.dependency_overrides[get_db] = lambda: ingested
+    try:
+        client = TestClient(app)
+        salary = client.get("/api/analytics/salary")
+        trending = client.get("/api/analytics/trending").json()
+    finally:
+        app.dependency_overrides.clear()
+
+    assert salary.status_code == 200
+    by_type = {row['job_type']: row for row in salary.json()['salary_by_type']}
+    avg_min, avg_max = ingested.query(func.avg(Job.salary_min), func.avg(Job.salary_max)).filter(
+        Job.job_type == 'contract', Job.salary_min.isnot(None)
+    ).one()
+    assert by_type['contract']['avg_min'] == pytest.approx(avg_min)
+    assert by_type['contract']['avg_max'] == pytest.approx(avg_max)
+    assert None in by_type
+    distribution = salary.json()['salary_distribution']
+    assert [row['range'] for row in distribution][0] == 'Under $60k'
+    assert sum(row['count'] for row in distribution) == ingested.query(Job).filter(Job.salary_min.isnot(None)).count()
+    assert trending['trending_titles'][0]['count'] >= trending['trending_titles'][-1]['count']
+
+def test_check_finds_drift_and_rebuild_repairs_it(ingested):
+    ingested.add(Job(title="Go Developer", company="Initech", location="Remote", source="dice",
+                     source_url="https://example.com/go", posted_date=NOW))
+    ingested.commit()
+
+    result = job_rollups.check(ingested)
+    assert not result['consistent']
+    assert result['missing'] > 0 and result['mismatched'] > 0
+
+    job_rollups.rebuild(ingested)
+    assert job_rollups.check(ingested)['consistent']
+    assert JobService().get_job_stats(ingested).total_jobs == 41
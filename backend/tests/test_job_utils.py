@@ -0,0 +1,118 @@
+"""
+Tests for duplicate cleanup and relevance scoring utilities
+"""
+from datetime import datetime, timedelta
+from app.models import Job, JobLSHBucket
+from app.utils.job_utils import JobDuplicateDetector
+from app.utils.near_duplicates import near_duplicate_index
+from conftest import make_job_row
+
+def make_job(i, title="Python Developer", **overrides):
+    return Job(**make_job_row(i, title=title, description="Corp to corp python contract", source="dice", **overrides))
+
+def test_remove_duplicates_keeps_newest_and_batches_deletes(db_session):
+    db_session.add_all([
+        make_job(1, hours_old=5),
+        make_job(2, hours_old=1),
+        make_job(3, title=" PYTHON developer ", hours_old=3),
+        make_job(4, title="Java Developer", hours_old=2),
+    ])
+    db_session.commit()
+    near_duplicate_index.rebuild(db_session)
+
+    detector = JobDuplicateDetector()
+    removed = detector.remove_duplicates(db_session, chunk_size=1)
+
+    remaining = {job.source_url for job in db_session.query(Job)}
+    assert removed == 2
+    assert remaining == {"https://example.com/jobs/2", "https://example.com/jobs/4"}
+    assert db_session.query(JobLSHBucket.job_id).distinct().count() == 2
+
+    stats = detector.last_run_stats
+    assert stats['rows_scanned'] == 4
+    assert stats['duplicates_removed'] == 2
+    assert stats['signature_set_bytes'] > 0
+    assert stats['rows_per_second'] > 0
+
+def test_remove_duplicates_treats_null_columns_as_empty(db_session):
+    db_session.add_all([
+        make_job(1, company=None, hours_old=2),
+        make_job(2, company=None, hours_old=1),
+        make_job(3, location=None),
+    ])
+    db_session.commit()
+
+    removed = JobDuplicateDetector().remove_duplicates(db_session)
+
+    assert removed == 1
+    assert {job.source_url for job in db_session.query(Job)} == {"https://example.com/jobs/2", "https://example.com/jobs/3"}
+
+def test_incremental_rescoring_only_touches_stale_rows(db_session, monkeypatch):
+    from app.utils.job_utils import JobRelevanceScorer
+
+    db_session.add_all([make_job(i, hours_old=i * 30, relevance_score=0.0) for i in range(5)])
+    db_session.commit()
+    scorer = JobRelevanceScorer()
+
+    # First run scores everything and stamps version/expiry
+    scorer.update_job_scores(db_session, batch_size=2)
+    assert scorer.last_run_stats['rows_checked'] == 5
+    assert db_session.query(Job).filter(Job.score_version == scorer.config_version).count() == 5
+
+    # Nothing is stale right after scoring
+    scorer.update_job_scores(db_session)
+    assert scorer.last_run_stats['rows_checked'] == 0
+
+    # Crossing a recency boundary re-scores just that row
+    job = db_session.query(Job).order_by(Job.id).first()
+    assert job.score_expires_at == job.posted_date + timedelta(days=1)
+    job.score_expires_at = datetime.utcnow() - timedelta(seconds=1)
+    db_session.commit()
+    scorer.update_job_scores(db_session)
+    assert scorer.last_run_stats['rows_checked'] == 1
+
+    # A config change re-scores everything
+    scorer.weights['recency'] = 0.2
+    scorer.update_job_scores(db_session)
+    assert scorer.last_run_stats['rows_checked'] == 5
+
+def test_incremental_rescoring_matches_full_rescore(db_session):
+    from app.utils.job_utils import JobRelevanceScorer
+
+    db_session.add_all([make_job(i, hours_old=i * 50, relevance_score=0.0, salary_min=90000.0) for i in range(4)])
+    db_session.commit()
+    scorer = JobRelevanceScorer()
+
+    scorer.update_job_scores(db_session)
+    for job in db_session.query(Job):
+        assert job.relevance_score == scorer.score_job_relevance(job)
+
+def test_batch_scores_match_scalar_path():
+    import random
+    from types import SimpleNamespace
+    from app.utils.job_utils import JobRelevanceScorer
+
+    rng = random.Random(3)
+    words = "python java react sql c2c w2 contract consulting remote docker aws ai the team".split()
+    locations = ["Remote", "Dallas, TX", "Toronto", "anywhere", "", "Miami, FL", "Berlin"]
+    now = datetime(2026, 1, 15, 12, 0, 0)
+    jobs = [
+        SimpleNamespace(
+            title=" ".join(rng.choice(words) for _ in range(2)).title(),
+            description=" ".join(rng.choice(words) for _ in range(rng.randint(0, 30))),
+            requirements=rng.choice([None, "", "SQL and Python"]),
+            location=rng.choice(locations),
+            posted_date=rng.choice([None, now - timedelta(hours=rng.randint(-30, 500))]),
+            salary_min=rng.choice([None, 0.0, 55000.0, 60000.0, 85000.0, 150000.0]),
+            is_corp_to_corp=rng.choice([None, True, False]),
+        )
+        for _ in range(500)
+    ]
+    scorer = JobRelevanceScorer()
+
+    batch = scorer.score_batch(jobs, now=now)
+
+    for i, job in enumerate(jobs):
+        assert batch['total'][i] == scorer.score_job_relevance(job, now=now)
+        assert batch['recency'][i] == scorer._score_recency(job, now)
+        assert batch['salary_range'][i] == scorer._score_salary(job)
@@ -0,0 +1,129 @@
+"""
+Tests for keyset (cursor) pagination of job listings and searches
+"""
+from datetime import datetime, timedelta
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import desc, text, tuple_
+from app.main import app
+from app.models import Job, get_db
+from app.models.schemas import JobSearchRequest
+from app.models.search_index import create_search_index
+from app.services.job_service import RANK_KEYS, JobService
+from app.utils.pagination import InvalidCursor, encode_cursor
+
+NOW = datetime.utcnow()
+
+@pytest.fixture
+def jobs_db(db_session):
+    create_search_index(db_session.get_bind())
+    # Few distinct scores and dates, so ordering depends on the id tie-break
+    for i in range(57):
+        db_session.add(Job(
+            title=f"Developer {i}", company="Acme", location="Remote",
+            description="python contract" if i % 3 else "java contract", source="indeed",
+            source_url=f"https://example.com/{i}", relevance_score=(i % 4) / 4,
+            posted_date=NOW - timedelta(hours=i % 2)
+        ))
+    db_session.commit()
+    return db_session
+
+def walk(fetch_page):
+    ids, cursor, pages = [], None, 0
+    while True:
+        jobs, cursor = fetch_page(cursor)
+        ids.extend(job.id for job in jobs)
+        pages += 1
+        if cursor is None:
+            return ids, pages
+
+def test_listing_pages_cover_every_job_once_in_order(jobs_db):
+    service = JobService()
+    expected = [job.id for job in jobs_db.query(Job).order_by(*(desc(key) for key in RANK_KEYS))]
+
+    ids, pages = walk(lambda cursor: service.list_jobs_page(jobs_db, 10, cursor))
+
+    assert ids == expected
+    assert pages == 6
+
+def test_search_pages_match_the_unpaged_ranking(jobs_db):
+    service = JobService()
+    unpaged = [job.id for job in service.search_jobs(jobs_db, JobSearchRequest(keywords="python", limit=500))]
+
+    ids, _ = walk(lambda cursor: service.search_jobs_page(jobs_db, JobSearchRequest(keywords="python", limit=7, cursor=cursor)))
+
+    assert ids == unpaged
+    assert len(ids) == 38
+
+def test_cursor_from_another_query_is_rejected(jobs_db):
+    service = JobService()
+    _, cursor = service.search_jobs_page(jobs_db, JobSearchRequest(keywords="python", limit=5))
+
+    with pytest.raises(InvalidCursor):
+        service.search_jobs_page(jobs_db, JobSearchRequest(keywords="java", limit=5, cursor=cursor))
+    with pytest.raises(InvalidCursor):
+        service.list_jobs_page(jobs_db, 5, "not-a-cursor")
+    with pytest.raises(InvalidCursor):
+        service.list_jobs_page(jobs_db, 5, encode_cursor([1.0], 'relevance'))
+
+def test_cursor_query_seeks_the_composite_index(jobs_db):
+    statement = jobs_db.query(Job.id).filter(
+        tuple_(*RANK_KEYS) < tuple_(0.5, NOW, 10)
+    ).order_by(*(desc(key) for key in RANK_KEYS)).limit(10).statement
+    compiled = statement.compile(dialect=jobs_db.get_bind().dialect, compile_kwargs={'literal_binds': True})
+    plan = " ".join(str(row) for row in jobs_db.execute(text(f"EXPLAIN QUERY PLAN {compiled}")))
+
+    assert 'ix_jobs_rank_order' in plan
+
+def test_endpoints_return_next_cursor_header(jobs_db):
+    app.dependency_overrides[get_db] = lambda: jobs_db
+    try:
+        client = TestClient(app)
+        first = client.get("/api/jobs", params={'limit': 50})
+        second = client.get("/api/jobs", params={'limit': 50, 'cursor': first.headers['X-Next-Cursor']})
+        search = client.post("/api/jobs/search", json={'keywords': "python", 'limit': 30})
+        bad = client.get("/api/jobs", params={'cursor': "garbage"})
+    finally:
+        app.dependency_overrides.clear()
+
+    assert len(first.json()) == 50
+    assert len(second.json()) == 7
+    assert 'X-Next-Cursor' not in second.headers
+    assert 'X-Next-Cursor' in search.headers
+    assert search.json()[0]['snippet']
+    assert bad.status_code == 400
+
+def test_rank_order_normalization_runs_once(tmp_path):
+    from sqlalchemy import create_engine
+    from app.models import Base
+    from app.models.migrations import upgrade_schema
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'old.db'}")
+    with engine.begin() as conn:
+        conn.execute(text(
+            'CREATE TABLE jobs (id INTEGER PRIMARY KEY, title VARCHAR, company VARCHAR, location VARCHAR, '
+            'source_url VARCHAR, relevance_score FLOAT, posted_date DATETIME, scraped_date DATETIME)'
+        ))
+        conn.execute(text(
+            "INSERT INTO jobs (title, company, location, source_url, scraped_date) "
+            "VALUES ('Dev', 'Acme', 'Remote', 'https://example.com/1', '2024-01-02 03:04:05')"
+        ))
+    Base.metadata.create_all(bind=engine)
+    upgrade_schema(engine)
+
+    with engine.begin() as conn:
+        assert conn.execute(text('SELECT relevance_score, posted_date FROM jobs')).one() == (0.0, '2024-01-02 03:04:05')
+        conn.execute(text("UPDATE jobs SET posted_date = NULL"))
+
+    # Later startups leave rows alone
+    upgrade_schema(engine)
+    with engine.connect() as conn:
+        assert conn.execute(text('SELECT posted_date FROM jobs')).scalar() is None
+
+def test_null_model_score_is_stored_as_zero():
+    row = JobService()._build_job_row(
+        {'title': "Dev", 'company': "Acme", 'location': "Remote", 'description': "", 'source': "indeed",
+         'source_url': "https://example.com/1", 'posted_date': NOW, 'fingerprint': "f"},
+        {'relevance_score': None}, None, None
+    )
+    assert row['relevance_score'] == 0.0
@@ -0,0 +1,63 @@
+"""
+Tests for the shared multi-keyword matcher
+"""
+import pytest
+from app.config import settings
+from app.scrapers.job_scrapers import IndeedScraper
+from app.services.ai_analysis import ai_service
+from app.utils.keyword_matcher import KeywordMatcher, get_matcher
+
+VOCABULARY = {
+    'tech': ["java", "javascript", "ci/cd", "Python"],
+    'remote': ["remote", "work from home"],
+    'contract': ["contract", "java"]
+}
+
+TEXTS = [
+    "Senior JavaScript developer, REMOTE, contract to hire",
+    "Python engineer; CI/CD and work from home",
+    "nothing relevant here",
+    ""
+]
+
+def substring_hits(text):
+    expected = {}
+    for category, keywords in VOCABULARY.items():
+        found = {keyword.lower() for keyword in keywords if keyword.lower() in text.lower()}
+        if found:
+            expected[category] = found
+    return expected
+
+@pytest.mark.parametrize('use_automaton', [True, False])
+def test_find_matches_substring_semantics(use_automaton):
+    matcher = KeywordMatcher(VOCABULARY, use_automaton=use_automaton)
+
+    for text in TEXTS:
+        assert matcher.find(text) == substring_hits(text)
+
+def test_overlapping_keywords_share_categories():
+    hits = KeywordMatcher(VOCABULARY).find("javascript")
+
+    assert hits == {'tech': {'java', 'javascript'}, 'contract': {'java'}}
+
+def test_get_matcher_rebuilds_when_settings_change(monkeypatch):
+    first = get_matcher({'corp_to_corp': settings.CORP_TO_CORP_KEYWORDS})
+    assert get_matcher({'corp_to_corp': settings.CORP_TO_CORP_KEYWORDS}) is first
+
+    monkeypatch.setattr(settings, 'CORP_TO_CORP_KEYWORDS', ["b2b only"])
+    scraper = IndeedScraper()
+
+    assert get_matcher({'corp_to_corp': settings.CORP_TO_CORP_KEYWORDS}) is not first
+    assert scraper.is_corp_to_corp("B2B only engagement")
+    assert not scraper.is_corp_to_corp("Corp to Corp welcome")
+
+def test_fallback_analysis_uses_keyword_lists():
+    analysis = ai_service._fallback_analysis(
+        "Lead Python Developer", "Remote role, C2C accepted. Docker and AWS, start ASAP."
+    )
+
+    assert analysis['is_corp_to_corp']
+    assert analysis['key_skills'] == ["python", "aws", "docker"]
+    assert analysis['experience_level'] == "senior"
+    assert analysis['remote_friendly']
+    assert analysis['urgency_level'] == "high"
@@ -0,0 +1,60 @@
+"""
+Tests for the MinHash/LSH near-duplicate index
+"""
+from app.models import Job, JobLSHBucket
+from app.services.ingestion import JobIngestionPipeline
+from app.utils.job_utils import JobDuplicateDetector
+from app.utils.near_duplicates import MinHashLSH, near_duplicate_index
+from conftest import make_job_row
+
+DESCRIPTION = (
+    "We need a senior python developer with aws docker and kubernetes experience "
+    "for a six month corp to corp contract with a large healthcare client"
+)
+
+def make_row(i, title="Senior Python Developer", company="Acme Staffing", description=DESCRIPTION):
+    return make_job_row(i, title=title, company=company, location="Dallas, TX", description=description, source="dice")
+
+def test_signature_agreement_tracks_jaccard():
+    lsh = MinHashLSH(num_perm=128, bands=32)
+    a = lsh.shingles("python developer", "remote", DESCRIPTION)
+    b = lsh.shingles("python developer", "remote", DESCRIPTION.replace("healthcare", "banking"))
+    c = lsh.shingles("nurse practitioner", "boston", "clinical role in a busy hospital")
+
+    sig_a, sig_b, sig_c = lsh.signature(a), lsh.signature(b), lsh.signature(c)
+    true_jaccard = len(a & b) / len(a | b)
+
+    assert abs((sig_a == sig_b).mean() - true_jaccard) < 0.15
+    assert (sig_a == sig_c).mean() < 0.1
+    assert lsh.signature(set()) is None
+
+def test_pipeline_indexes_jobs_and_detector_uses_index(db_session):
+    with JobIngestionPipeline(db_session) as pipeline:
+        pipeline.add(make_row(1))
+        pipeline.add(make_row(2, title="Registered Nurse", company="Acme Staffing",
+                              description="night shift nursing role in a busy hospital"))
+
+    assert db_session.query(JobLSHBucket).count() == 2 * near_duplicate_index.lsh.bands
+
+    detector = JobDuplicateDetector()
+    repost = make_row(3, description=DESCRIPTION + " apply today")
+    other_company = make_row(4, company="Other Corp")
+    different = make_row(5, title="Java Architect", description="design payment systems in java and kafka")
+
+    for job_data in (repost, other_company, different):
+        assert detector._similar_job_exists(db_session, job_data) == detector._similar_job_exists_scan(db_session, job_data)
+    assert detector.is_duplicate(db_session, repost)
+    assert not detector.is_duplicate(db_session, other_company)
+    assert not detector.is_duplicate(db_session, different)
+
+def test_rebuild_and_remove(db_session):
+    db_session.add_all([Job(**make_row(i)) for i in range(3)])
+    db_session.commit()
+
+    assert near_duplicate_index.rebuild(db_session) == 3
+    job_id = db_session.query(Job.id).first()[0]
+    near_duplicate_index.remove_jobs(db_session, [job_id])
+    db_session.commit()
+
+    assert db_session.query(JobLSHBucket).filter(JobLSHBucket.job_id == job_id).count() == 0
+    assert db_session.query(JobLSHBucket).count() == 2 * near_duplicate_index.lsh.bands
@@ -0,0 +1,137 @@
+"""
+Tests for paginated scraping with persisted per-(source, query) cursors
+"""
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+import pytest
+from sqlalchemy.orm import sessionmaker
+from app.config import settings
+from app.scrapers.job_scrapers import DICE_PAGE_SIZE, DiceScraper
+from app.services.scrape_cursors import ScrapeCursorStore
+
+POSTINGS = 45
+
+def card(i: int) -> str:
+    return f"""
+    <div class="card-body">
+      <h5 class="card-title-link"><a href="/job-detail/{i}">Python Developer {i}</a></h5>
+      <div class="card-company">Acme {i}</div>
+      <div class="card-location">Remote</div>
+      <div class="card-description">C2C contract {i}</div>
+    </div>
+    """
+
+class PagedDiceHandler(BaseHTTPRequestHandler):
+    requested_pages = []
+    failing_pages = set()
+
+    def do_GET(self):
+        page = int(parse_qs(urlsplit(self.path).query)['page'][0])
+        PagedDiceHandler.requested_pages.append(page)
+        if page in PagedDiceHandler.failing_pages:
+            self.send_response(500)
+            self.end_headers()
+            return
+        start = (page - 1) * DICE_PAGE_SIZE
+        payload = ("<html><body>" + "".join(
+            card(i) for i in range(start, min(start + DICE_PAGE_SIZE, POSTINGS))
+        ) + "</body></html>").encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+@pytest.fixture
+def dice_server(monkeypatch):
+    monkeypatch.setattr(settings, 'SCRAPER_RATE_LIMIT_PER_SECOND', 1000.0)
+    monkeypatch.setattr(settings, 'SCRAPER_RATE_LIMIT_BURST', 100)
+    PagedDiceHandler.requested_pages = []
+    PagedDiceHandler.failing_pages = set()
+    server = ThreadingHTTPServer(('127.0.0.1', 0), PagedDiceHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+@pytest.fixture
+def scraper(dice_server, db_session):
+    scraper = DiceScraper()
+    scraper.base_url = dice_server
+    scraper.cursors = ScrapeCursorStore(sessionmaker(bind=db_session.get_bind()))
+    return scraper
+
+@pytest.fixture
+def dated_scraper(scraper):
+    # The fixture server lists postings newest first, as Indeed does with sort=date
+    scraper.sorted_by_date = True
+    return scraper
+
+def test_walks_pages_until_a_short_page(dated_scraper):
+    jobs = dated_scraper.scrape_jobs("python developer")
+
+    assert len(jobs) == POSTINGS
+    assert PagedDiceHandler.requested_pages == [1, 2, 3]
+    cursor = dated_scraper.cursors.list_cursors()[0]
+    assert cursor['status'] == 'complete'
+    assert cursor['resume_page'] is None
+    assert cursor['high_water_fingerprint'] == jobs[0]['fingerprint']
+
+def test_stops_at_stored_postings(dated_scraper):
+    stored = set()
+    dated_scraper.known_fingerprints = lambda fingerprints: stored & set(fingerprints)
+    stored.update(job['fingerprint'] for job in dated_scraper.scrape_jobs("python developer")[10:])
+    PagedDiceHandler.requested_pages = []
+
+    jobs = dated_scraper.scrape_jobs("python developer")
+
+    assert [job['title'] for job in jobs] == [f"Python Developer {i}" for i in range(10)]
+    assert PagedDiceHandler.requested_pages == [1]
+
+def test_relevance_ranked_source_walks_past_stored_postings(scraper):
+    stored = set()
+    scraper.known_fingerprints = lambda fingerprints: stored & set(fingerprints)
+    stored.update(job['fingerprint'] for job in scraper.scrape_jobs("python developer")[:5])
+    PagedDiceHandler.requested_pages = []
+
+    jobs = scraper.scrape_jobs("python developer")
+
+    assert len(jobs) == POSTINGS - 5
+    assert PagedDiceHandler.requested_pages == [1, 2, 3]
+    cursor = scraper.cursors.list_cursors()[0]
+    assert cursor['high_water_fingerprint'] is None
+    assert cursor['high_water_date'] is None
+
+def test_interrupted_run_resumes_from_its_cursor(dated_scraper):
+    stored = set()
+    dated_scraper.known_fingerprints = lambda fingerprints: stored & set(fingerprints)
+    PagedDiceHandler.failing_pages = {2}
+
+    first = dated_scraper.scrape_jobs("python developer")
+    stored.update(job['fingerprint'] for job in first)
+
+    cursor = dated_scraper.cursors.list_cursors()[0]
+    assert len(first) == DICE_PAGE_SIZE
+    assert cursor['status'] == 'interrupted'
+    assert cursor['resume_page'] == 1
+
+    PagedDiceHandler.failing_pages = set()
+    PagedDiceHandler.requested_pages = []
+    second = dated_scraper.scrape_jobs("python developer")
+
+    # Page 1 is all stored, so the run jumps to where the last one stopped
+    assert PagedDiceHandler.requested_pages == [1, 2, 3]
+    assert len(second) == POSTINGS - DICE_PAGE_SIZE
+    assert dated_scraper.cursors.list_cursors()[0]['status'] == 'complete'
+
+def test_max_pages_caps_a_run(scraper, monkeypatch):
+    monkeypatch.setattr(settings, 'SCRAPER_MAX_PAGES', 2)
+
+    jobs = scraper.scrape_jobs("python developer")
+
+    assert len(jobs) == 2 * DICE_PAGE_SIZE
+    assert PagedDiceHandler.requested_pages == [1, 2]
@@ -0,0 +1,57 @@
+"""
+Tests for the search-term query planner
+"""
+from datetime import datetime, timedelta
+import pytest
+from sqlalchemy.orm import sessionmaker
+from app.config import settings
+from app.services.query_planner import QueryPlanner
+
+NOW = datetime(2024, 1, 1, 12, 0)
+TERMS = ["software developer", "software engineer", "python developer"]
+
+@pytest.fixture
+def planner(db_session):
+    return QueryPlanner(sessionmaker(bind=db_session.get_bind()))
+
+def cycle(planner, now, engineer_unique=0):
+    shared = {f"shared-{i}" for i in range(10)}
+    return planner.record({
+        "software developer": shared | {f"dev-{i}" for i in range(5)},
+        "software engineer": shared | {f"eng-{i}" for i in range(engineer_unique)},
+        "python developer": {f"py-{i}" for i in range(3)}
+    }, now)
+
+def test_record_measures_unique_yield_and_overlap(planner):
+    stats = cycle(planner, NOW)
+
+    assert stats["software developer"] == {'results': 15, 'unique': 5, 'overlap': round(10 / 15, 4), 'interval_cycles': 1}
+    assert stats["software engineer"]['unique'] == 0
+    assert stats["software engineer"]['overlap'] == 1.0
+    assert planner.get_stats()['last_cycle_pairwise_overlap']["software developer | software engineer"] == round(10 / 15, 4)
+
+def test_low_yield_terms_back_off_and_recover(planner, monkeypatch):
+    monkeypatch.setattr(settings, 'SCRAPING_INTERVAL_HOURS', 1)
+    monkeypatch.setattr(settings, 'SCRAPING_TERM_MAX_INTERVAL_CYCLES', 4)
+    hour = timedelta(hours=1)
+
+    assert planner.plan(TERMS, NOW) == TERMS
+    cycle(planner, NOW)
+    assert planner.plan(TERMS, NOW + hour) == ["software developer", "python developer"]
+
+    # Intervals double up to the max while the term finds nothing new
+    intervals = []
+    now = NOW
+    for _ in range(3):
+        now += 4 * hour
+        intervals.append(cycle(planner, now)["software engineer"]['interval_cycles'])
+    assert intervals == [4, 4, 4]
+
+    now += 4 * hour
+    assert cycle(planner, now, engineer_unique=10)["software engineer"]['interval_cycles'] == 1
+    assert "software engineer" in planner.plan(TERMS, now + hour)
+
+def test_plan_is_never_empty(planner):
+    planner.record({term: set() for term in TERMS}, NOW)
+
+    assert len(planner.plan(TERMS, NOW + timedelta(minutes=30))) == 1
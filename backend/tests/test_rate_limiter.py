@@ -0,0 +1,89 @@
+"""
+Tests for the per-host token-bucket rate limiter
+"""
+import asyncio
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from app.config import settings
+from app.scrapers.http_client import AsyncFetcher
+from app.scrapers.rate_limiter import HostRateLimiter, TokenBucket, parse_retry_after, rate_limiter
+
+def test_bucket_allows_burst_then_spaces_requests():
+    bucket = TokenBucket(rate=10.0, capacity=2)
+    now = bucket.updated
+
+    assert bucket.reserve(now) == 0
+    assert bucket.reserve(now) == 0
+    assert abs(bucket.reserve(now) - 0.1) < 1e-9
+    assert abs(bucket.reserve(now) - 0.2) < 1e-9
+
+def test_penalize_halves_rate_and_blocks_host(monkeypatch):
+    monkeypatch.setattr(settings, 'SCRAPER_RATE_LIMIT_PER_SECOND', 4.0)
+    limiter = HostRateLimiter()
+
+    limiter.penalize('example.com', retry_after=5)
+    rates = limiter.get_rates()['example.com']
+
+    assert rates['rate_per_second'] == 2.0
+    assert rates['configured_rate_per_second'] == 4.0
+    assert 4.5 < rates['blocked_for_seconds'] <= 5
+    assert limiter.reserve('example.com') > 4.5
+
+    limiter.record_success('example.com')
+    assert limiter.get_rates()['example.com']['rate_per_second'] == 2.4
+
+def test_host_specific_rate(monkeypatch):
+    monkeypatch.setattr(settings, 'SCRAPER_HOST_RATE_LIMITS', {'www.dice.com': 0.5})
+    limiter = HostRateLimiter()
+
+    limiter.reserve('www.dice.com')
+    assert limiter.get_rates()['www.dice.com']['configured_rate_per_second'] == 0.5
+
+def test_parse_retry_after():
+    assert parse_retry_after('3') == 3.0
+    assert parse_retry_after(None) is None
+    assert parse_retry_after('garbage') is None
+    assert parse_retry_after('Wed, 21 Oct 2015 07:28:00 GMT') == 0.0
+
+class ThrottlingHandler(BaseHTTPRequestHandler):
+    calls = 0
+
+    def do_GET(self):
+        type(self).calls += 1
+        if type(self).calls == 1:
+            self.send_response(429)
+            self.send_header('Retry-After', '0.2')
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header('Content-Length', '2')
+        self.end_headers()
+        self.wfile.write(b'ok')
+
+    def log_message(self, *args):
+        pass
+
+def test_fetcher_retries_after_429(monkeypatch):
+    monkeypatch.setattr(settings, 'SCRAPER_RATE_LIMIT_PER_SECOND', 100.0)
+    server = ThreadingHTTPServer(('127.0.0.1', 0), ThrottlingHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/page"
+
+    async def fetch():
+        async with AsyncFetcher() as fetcher:
+            return await fetcher.get(url)
+
+    try:
+        start = time.perf_counter()
+        body = asyncio.run(fetch())
+        elapsed = time.perf_counter() - start
+    finally:
+        server.shutdown()
+
+    assert body == b'ok'
+    assert ThrottlingHandler.calls == 2
+    assert elapsed >= 0.2
+    host = url.split('/')[2]
+    assert rate_limiter.get_rates()[host]['rate_per_second'] < 100.0
@@ -0,0 +1,61 @@
+"""
+Accuracy tests for the salary parser
+"""
+import pytest
+from app.services.ai_analysis import ai_service
+from app.utils.salary_parser import parse_salary, parse_salaries
+
+# (text, (min_amount, max_amount, period, rate_type)) or None when no salary is stated
+CORPUS = [
+    ("Pay: $80,000 - $100,000 per year", (80000, 100000, 'year', None)),
+    ("Salary range 80-100k DOE", (80000, 100000, 'year', None)),
+    ("$120K–$150K annually plus equity", (120000, 150000, 'year', None)),
+    ("Compensation: 90 - 110 thousand", (90000, 110000, 'year', None)),
+    ("USD 110k a year + bonus", (110000, 110000, 'year', None)),
+    ("Salary $95,000", (95000, 95000, 'year', None)),
+    ("Rate $65/hr on C2C", (65, 65, 'hour', 'c2c')),
+    ("Corp-to-Corp rate: $70 - $80 per hour", (70, 80, 'hour', 'c2c')),
+    ("$60-70/hr W2 only", (60, 70, 'hour', 'w2')),
+    ("$75.50/hr (1099)", (75.5, 75.5, 'hour', '1099')),
+    ("$50 an hour, remote", (50, 50, 'hour', None)),
+    ("$70-$80 depending on experience", (70, 80, 'hour', None)),
+    ("$85/hr - $95/hr on C2C", (85, 95, 'hour', 'c2c')),
+    ("Paying between $50 and $60 per hour", (50, 60, 'hour', None)),
+    ("between $90k and $110k a year", (90000, 110000, 'year', None)),
+    ("$500/day contract", (500, 500, 'day', None)),
+    ("$2,400 per week", (2400, 2400, 'week', None)),
+    ("$8,500/month", (8500, 8500, 'month', None)),
+    ("3-5 years experience, 401k match", None),
+    ("$1,000 signing bonus", None),
+    ("Team of 10-12 engineers", None),
+    ("Kubernetes 1.28, Python 3.11", None),
+    ("", None),
+]
+
+@pytest.mark.parametrize('text,expected', CORPUS)
+def test_corpus(text, expected):
+    salary = parse_salary(text)
+    if expected is None:
+        assert salary is None
+    else:
+        assert (salary.min_amount, salary.max_amount, salary.period, salary.rate_type) == expected
+
+def test_annualizes_hourly_ranges():
+    salary = parse_salary("$60-70/hr")
+
+    assert (salary.annual_min, salary.annual_max) == (60 * 2080, 70 * 2080)
+
+def test_k_suffix_is_scoped_to_the_match():
+    # The old extractor multiplied by 1000 whenever 'k' appeared anywhere
+    salary = parse_salary("$90,000 - $120,000 with Kubernetes and a 401k")
+
+    assert (salary.min_amount, salary.max_amount) == (90000, 120000)
+
+def test_finds_every_rate_with_its_own_qualifier():
+    salaries = parse_salaries("W2 $60/hr, or C2C $70/hr")
+
+    assert [(s.min_amount, s.rate_type) for s in salaries] == [(60, 'w2'), (70, 'c2c')]
+
+def test_extract_salary_range_returns_annual_values():
+    assert ai_service.extract_salary_range("$60-70/hr on C2C") == (124800, 145600)
+    assert ai_service.extract_salary_range("No salary listed") == (None, None)
@@ -0,0 +1,22 @@
+"""
+Regression test: scrapers run against recorded pages from the replay server
+"""
+from benchmarks.bench_scraper_replay import regressions
+from benchmarks.replay import run_replay
+
+def test_replay_scrapes_every_fixture_field():
+    results = run_replay(rounds=1)
+
+    assert results['indeed']['pages'] == 21  # listing + one detail page per card
+    assert results['indeed']['jobs'] == 20
+    assert results['dice']['pages'] == 2  # a full page, then the empty page that ends the results
+    assert results['dice']['jobs'] == 20
+    for metrics in results.values():
+        assert metrics['field_accuracy'] == 1.0
+        assert metrics['parse_seconds'] > 0
+
+def test_regressions_flag_slowdowns_and_accuracy_drops():
+    baseline = {'indeed': {'jobs_per_second': 100.0, 'field_accuracy': 1.0}}
+
+    assert regressions({'indeed': {'jobs_per_second': 90.0, 'field_accuracy': 1.0}}, baseline, 0.25) == []
+    assert len(regressions({'indeed': {'jobs_per_second': 50.0, 'field_accuracy': 0.9}}, baseline, 0.25)) == 2
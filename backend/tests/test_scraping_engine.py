@@ -0,0 +1,92 @@
+"""
+Tests for the concurrent scraping engine
+"""
+import threading
+import time
+import socket
+from app.scrapers.job_scrapers import BaseScraper, DiceScraper
+from app.scrapers.scraping_engine import ScrapingEngine
+
+class SlowScraper(BaseScraper):
+    def __init__(self, name, delay):
+        super().__init__(name)
+        self.delay = delay
+        self.active = 0
+        self.max_active = 0
+        self.lock = threading.Lock()
+
+    def scrape_jobs(self, keywords="", location="USA"):
+        with self.lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        time.sleep(self.delay)
+        with self.lock:
+            self.active -= 1
+        return [{'title': f"{keywords} {self.name}", 'source': self.name}]
+
+class KnownSkippingScraper(BaseScraper):
+    def scrape_jobs(self, keywords="", location="USA"):
+        known = self._stored_fingerprints([f"{keywords}-old", f"{keywords}-new"])
+        return [{'title': f"{keywords}-new", 'source': self.name}] if f"{keywords}-new" not in known else []
+
+class FailingScraper(BaseScraper):
+    def scrape_jobs(self, keywords="", location="USA"):
+        raise RuntimeError("boom")
+
+def test_engine_runs_sources_concurrently_with_per_source_limit():
+    scrapers = {
+        'fast': SlowScraper('fast', 0.05),
+        'slow': SlowScraper('slow', 0.2),
+    }
+    engine = ScrapingEngine(scrapers, max_workers=8, per_source_concurrency=2)
+    terms = ['a', 'b', 'c', 'd']
+
+    start = time.perf_counter()
+    jobs, stats = engine.run(terms)
+    elapsed = time.perf_counter() - start
+
+    # 4 terms x 0.2s at 2 in flight is ~0.4s; sequential would be 1.0s
+    assert elapsed < 0.8
+    assert scrapers['slow'].max_active == 2
+    assert scrapers['fast'].max_active <= 2
+    assert len(jobs) == 8
+    assert [job['title'] for job in jobs[:2]] == ['a fast', 'a slow']
+    assert stats['slow']['tasks'] == 4
+    assert stats['slow']['seconds'] >= stats['fast']['seconds']
+
+def test_engine_isolates_failing_source():
+    scrapers = {
+        'ok': SlowScraper('ok', 0),
+        'broken': FailingScraper('broken'),
+    }
+    jobs, stats = ScrapingEngine(scrapers, max_workers=2).run(['x', 'y'])
+
+    assert len(jobs) == 2
+    assert stats['broken']['errors'] == 2
+    assert stats['ok']['errors'] == 0
+
+def test_engine_counts_stored_postings_scrapers_skipped():
+    scraper = KnownSkippingScraper('dice')
+    scraper.known_fingerprints = lambda fingerprints: {f for f in fingerprints if f.endswith('-old')}
+    engine = ScrapingEngine({'dice': scraper}, max_workers=2)
+
+    jobs, _ = engine.run(['a', 'b', 'c'])
+    assert len(jobs) == 3
+    assert engine.last_run_stats['known_skipped'] == 3
+
+    engine.run(['a'])
+    assert engine.last_run_stats['known_skipped'] == 1
+
+def test_engine_counts_failures_scrapers_catch_themselves():
+    # A port nothing listens on: the listing fetch fails inside paginate()
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        port = sock.getsockname()[1]
+    dice = DiceScraper()
+    dice.base_url = f"http://127.0.0.1:{port}"
+
+    jobs, stats = ScrapingEngine({'dice': dice, 'ok': SlowScraper('ok', 0)}, max_workers=2).run(['x', 'y'])
+
+    assert len(jobs) == 2
+    assert stats['dice']['errors'] == 2
+    assert stats['ok']['errors'] == 0
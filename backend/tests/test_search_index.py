@@ -0,0 +1,91 @@
+"""
+Tests for the full-text job search index
+"""
+from datetime import datetime
+import pytest
+from app.config import settings
+from app.models import Job
+from app.models.schemas import JobSearchRequest
+from app.models.search_index import build_match_query, create_search_index
+from app.services.job_service import JobService
+
+def add_job(db, title, description="", requirements="", relevance_score=0.5):
+    job = Job(
+        title=title, company="Acme", location="Remote", description=description,
+        requirements=requirements, source="indeed", source_url=f"https://example.com/{title}",
+        posted_date=datetime.utcnow(), relevance_score=relevance_score
+    )
+    db.add(job)
+    db.commit()
+    return job
+
+@pytest.fixture
+def indexed_db(db_session):
+    create_search_index(db_session.get_bind())
+    return db_session
+
+def search(db, keywords, **params):
+    return JobService().search_jobs(db, JobSearchRequest(keywords=keywords, **params))
+
+def test_multi_term_queries_match_terms_anywhere(indexed_db):
+    add_job(indexed_db, "Senior Python Engineer", "Build APIs on AWS")
+    add_job(indexed_db, "Java Developer", "Python scripting a plus, mostly Spring")
+    add_job(indexed_db, "Data Analyst", "SQL and Excel")
+
+    titles = {job.title for job in search(indexed_db, "aws python")}
+
+    assert titles == {"Senior Python Engineer"}
+    assert {job.title for job in search(indexed_db, "python")} == {"Senior Python Engineer", "Java Developer"}
+
+def test_title_matches_rank_first_and_snippets_are_highlighted(indexed_db):
+    add_job(indexed_db, "Kubernetes Administrator", "Run clusters", relevance_score=0.5)
+    add_job(indexed_db, "Backend Developer", "Some kubernetes exposure " + "filler " * 50, relevance_score=0.5)
+    for i in range(3):
+        add_job(indexed_db, f"Frontend Developer {i}", "React")
+
+    jobs = search(indexed_db, "kubernetes")
+
+    assert [job.title for job in jobs] == ["Kubernetes Administrator", "Backend Developer"]
+    assert jobs[0].search_score > jobs[1].search_score
+    assert "<mark>kubernetes</mark>" in jobs[1].snippet
+
+def test_relevance_score_is_blended_into_ranking(indexed_db, monkeypatch):
+    add_job(indexed_db, "Python Developer", "python", relevance_score=0.1)
+    add_job(indexed_db, "Python Developer II", "python", relevance_score=0.9)
+
+    monkeypatch.setattr(settings, 'SEARCH_TEXT_WEIGHT', 0.2)
+
+    assert search(indexed_db, "python")[0].title == "Python Developer II"
+
+def test_index_follows_updates_and_deletes(indexed_db):
+    job = add_job(indexed_db, "Platform Engineer", "Terraform")
+    job.description = "Ansible"
+    indexed_db.commit()
+
+    assert search(indexed_db, "terraform") == []
+    assert [found.id for found in search(indexed_db, "ansible")] == [job.id]
+
+    indexed_db.delete(job)
+    indexed_db.commit()
+    assert search(indexed_db, "ansible") == []
+
+def test_existing_rows_are_indexed_when_created(db_session):
+    add_job(db_session, "Golang Developer", "Microservices")
+
+    create_search_index(db_session.get_bind())
+
+    assert [job.title for job in search(db_session, "golang")] == ["Golang Developer"]
+
+def test_query_syntax_is_not_interpreted(indexed_db):
+    add_job(indexed_db, "C++ Developer", "Embedded")
+
+    assert build_match_query('c++ "NEAR(x') == '"c" "near" "x"'
+    assert [job.title for job in search(indexed_db, 'c++ " embedded*')] == ["C++ Developer"]
+
+def test_like_fallback_is_tokenized(indexed_db, monkeypatch):
+    add_job(indexed_db, "Senior Python Engineer", "Build APIs on AWS")
+    monkeypatch.setattr(settings, 'SEARCH_FULL_TEXT', False)
+
+    jobs = search(indexed_db, "aws python")
+
+    assert [job.title for job in jobs] == ["Senior Python Engineer"]
@@ -12,6 +12,7 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
 
 from app.models import Job, JobAlert, get_db, create_tables
 from app.services.ai_analysis import ai_service
+from app.services.job_rollups import job_rollups
 from datetime import datetime, timedelta
 import json
 
@@ -145,6 +146,9 @@ def create_sample_jobs():
         db.commit()
         print(f"\nSuccessfully created {len(sample_jobs)} sample jobs!")
         
+        # Jobs added outside the ingestion pipeline need the stats rollups recounted
+        job_rollups.rebuild(db)
+        
         # Show statistics
         total_jobs = db.query(Job).count()
         corp_jobs = db.query(Job).filter(Job.is_corp_to_corp == True).count()
@@ -26,11 +26,25 @@ import {
   AttachMoney
 } from '@mui/icons-material';
 import { formatDistanceToNow } from 'date-fns';
+import { jobService } from '../services/api';
 
 const JobCard = ({ job, onUpdate, onViewDetails }) => {
   const [isApplied, setIsApplied] = useState(job.is_applied);
   const [isFavorited, setIsFavorited] = useState(job.is_favorited);
   const [showDetails, setShowDetails] = useState(false);
+  // Listings leave out the full text; fetched when details are first opened
+  const [details, setDetails] = useState(null);
+
+  const handleViewDetails = async () => {
+    setShowDetails(true);
+    if (details) return;
+    try {
+      const response = await jobService.getJob(job.id);
+      setDetails(response.data);
+    } catch (error) {
+      console.error('Error loading job details:', error);
+    }
+  };
 
   const handleAppliedToggle = async () => {
     try {
@@ -159,14 +173,14 @@ const JobCard = ({ job, onUpdate, onViewDetails }) => {
           </Box>
           
           <Typography variant="body2" color="text.secondary" sx={{ mb: 2 }}>
-            {job.description.substring(0, 200)}...
+            {job.description_preview}...
           </Typography>
           
           <Box display="flex" gap={1} justifyContent="space-between" alignItems="center">
             <Button 
               variant="outlined" 
               size="small" 
-              onClick={() => setShowDetails(true)}
+              onClick={handleViewDetails}
             >
               View Details
             </Button>
@@ -221,27 +235,27 @@ const JobCard = ({ job, onUpdate, onViewDetails }) => {
             Job Description
           </Typography>
           <Typography variant="body2" paragraph>
-            {job.description}
+            {details ? details.description : `${job.description_preview}...`}
           </Typography>
           
-          {job.requirements && (
+          {details?.requirements && (
             <>
               <Typography variant="h6" gutterBottom>
                 Requirements
               </Typography>
               <Typography variant="body2" paragraph>
-                {job.requirements}
+                {details.requirements}
               </Typography>
             </>
           )}
           
-          {job.ai_analysis && (
+          {details?.ai_analysis && (
             <>
               <Typography variant="h6" gutterBottom>
                 AI Analysis
               </Typography>
               <Typography variant="body2" paragraph>
-                {JSON.parse(job.ai_analysis).summary}
+                {JSON.parse(details.ai_analysis).summary}
               </Typography>
             </>
           )}
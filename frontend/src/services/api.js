@@ -29,9 +29,13 @@ export const jobService = {
   getJobStats: () => 
     api.get('/jobs/stats'),
   
-  // Export jobs
+  // Export jobs; JSON keeps its { data, format } envelope, other formats
+  // (csv, ndjson, arrow, parquet) arrive as the file itself
   exportJobs: (format = 'json') => 
-    api.get(`/export/jobs?format=${format}`),
+    api.get('/export/jobs', {
+      params: { format },
+      responseType: format === 'json' ? 'json' : 'blob',
+    }),
   
   // Trigger job scraping
   triggerScraping: (keywords = 'software developer', location = 'USA') => 